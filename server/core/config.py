@@ -30,6 +30,124 @@ class Settings(BaseSettings):
         description="Gemini model to use for analysis & drafting"
     )
 
+    # === Model tier routing ===
+    MODEL_ROUTING_ENABLED: bool = Field(
+        default=True,
+        description="Send simple inputs to the fast tier, complex ones to the strong tier"
+    )
+    MODEL_TIERS: dict[str, str | None] = Field(
+        default={"fast": "gemini-2.5-flash-lite", "strong": None},
+        description="Tier name → Gemini model (missing / null → GEMINI_MODEL)"
+    )
+    MODEL_ROUTING_FAST_MAX_WORDS: int = Field(default=150)
+    MODEL_ROUTING_FAST_MAX_QUESTIONS: int = Field(default=1)
+    MODEL_ROUTING_FAST_MAX_DATES: int = Field(default=1)
+    MODEL_ROUTING_FAST_MAX_CLAUSES: int = Field(default=0)
+
+    # === Thread-aware analysis ===
+    THREAD_TRACKING_ENABLED: bool = Field(
+        default=True,
+        description="Analyze only the new part of replies to known threads"
+    )
+    THREAD_STORE_MAX_THREADS: int = Field(default=1000)
+
+    # === Long-input (chunked) analysis ===
+    ANALYSIS_CHUNK_THRESHOLD_CHARS: int = Field(
+        default=20000,
+        description="Emails longer than this (after cleaning) are analyzed in chunks"
+    )
+    ANALYSIS_CHUNK_SIZE_CHARS: int = Field(default=8000)
+    ANALYSIS_CHUNK_MAX_CONCURRENCY: int = Field(default=4)
+
+    # === Near-duplicate reuse (templated emails) ===
+    NEAR_DUP_ENABLED: bool = Field(default=True)
+    NEAR_DUP_MAX_HAMMING: int = Field(
+        default=3,
+        description="Max differing SimHash bits (of 64) to treat emails as near-duplicates"
+    )
+    NEAR_DUP_MAX_STORED_ANALYSES: int = Field(default=50000)
+
+    # === Drafter prompt-prefix caching ===
+    DRAFT_PROMPT_CACHE_ENABLED: bool = Field(default=True)
+    DRAFT_PROMPT_CACHE_BACKEND: str = Field(
+        default="gemini",
+        description="'gemini' (provider cached content) or 'local' (in-process stand-in)"
+    )
+    DRAFT_PROMPT_CACHE_TTL_SECONDS: int = Field(default=3600)
+    DRAFT_PROMPT_CACHE_REFRESH_MARGIN_SECONDS: int = Field(default=300)
+    DRAFT_PROMPT_CACHE_MAX_ENTRIES: int = Field(default=256)
+    DRAFT_PROMPT_CACHE_RETRY_SECONDS: int = Field(
+        default=30,
+        description="Backoff before retrying a prefix whose cache creation failed transiently"
+    )
+
+    # === Parallel per-question drafting ===
+    DRAFT_PARALLEL_ENABLED: bool = Field(
+        default=False,
+        description="Answer each question in its own concurrent call, then assemble"
+    )
+    DRAFT_PARALLEL_MIN_QUESTIONS: int = Field(default=2)
+    DRAFT_PARALLEL_MAX_CONCURRENCY: int = Field(default=6)
+
+    # === Speculative drafting ===
+    SPECULATIVE_DRAFT_ENABLED: bool = Field(
+        default=False,
+        description="Start drafting in the background as soon as /analyze completes"
+    )
+    SPECULATIVE_DRAFT_MAX_INFLIGHT: int = Field(default=4)
+    SPECULATIVE_DRAFT_MAX_READY: int = Field(default=100)
+
+    # === Workflow sessions ===
+    SESSION_TTL_SECONDS: int = Field(default=1800)
+    SESSION_MAX_SESSIONS: int = Field(default=1000)
+    SESSION_MAX_BYTES: int = Field(
+        default=50_000_000,
+        description="Approximate cap on text held by all sessions"
+    )
+
+    # === Request profiling (off unless one of these is set) ===
+    PROFILING_SAMPLE_RATE: float = Field(
+        default=0.0,
+        description="Fraction of requests to profile (0 disables sampling)"
+    )
+    PROFILING_ALLOW_HEADER: bool = Field(
+        default=False,
+        description="Profile requests that send PROFILING_HEADER"
+    )
+    PROFILING_HEADER: str = Field(default="X-Profile")
+    PROFILING_INTERVAL_MS: float = Field(default=5.0)
+
+    # === Contract registry ===
+    CONTRACT_REGISTRY_DB_PATH: str = Field(default="static/contracts/registry.sqlite3")
+    CONTRACT_REGISTRY_CACHE_SIZE: int = Field(
+        default=64,
+        description="Hot contracts kept parsed in memory (LRU)"
+    )
+    CONTRACT_REGISTRY_MMAP_BYTES: int = Field(default=64 * 1024 * 1024)
+
+    # === Deferred job queue (low-urgency bulk processing) ===
+    JOB_QUEUE_ENABLED: bool = Field(
+        default=False,
+        description="Run the batch worker that drains deferred jobs in this process (opt-in)"
+    )
+    JOB_QUEUE_DB_PATH: str = Field(default="static/jobs/jobs.sqlite3")
+    JOB_BATCH_BACKEND: str = Field(
+        default="gemini",
+        description="'gemini' (provider batch mode) or 'local' (in-process stand-in)"
+    )
+    JOB_BATCH_MAX_SIZE: int = Field(default=100)
+    JOB_BATCH_POLL_SECONDS: float = Field(default=30.0)
+    JOB_CLAIM_TIMEOUT_SECONDS: float = Field(
+        default=600.0,
+        description="Running jobs without a heartbeat for this long are re-queued"
+    )
+    JOB_OFF_PEAK_START_HOUR: int = Field(
+        default=22,
+        description="Off-peak window start (server local hour); equal to END means always"
+    )
+    JOB_OFF_PEAK_END_HOUR: int = Field(default=6)
+    JOB_WORKER_INTERVAL_SECONDS: float = Field(default=60.0)
+
     # === Audit Logs ===
     AUDIT_LOG_DIR: str = Field(default="static/audit_logs")
 
@@ -6,6 +6,9 @@ This graph defines a 2-step pipeline:
 2. draft_node    → Generate a draft legal reply using clauses + analysis
 
 The graph orchestrates the full workflow end-to-end without MCP.
+analyze_node opens a workflow session so draft_node reuses the parsed
+contract instead of rebuilding ContractStore (rebuilt from the state if
+the session has been evicted meanwhile).
 """
 
 from langgraph.graph import StateGraph, END
@@ -13,6 +16,8 @@ from typing import Dict, Any
 from modules.analyzer import analyze_email
 from modules.drafter import generate_draft_reply
 from modules.contract_store import ContractStore
+from modules.session_store import SessionNotFoundError
+from services.session_service import create_session, session_store
 
 
 # Graph State ----------------------------
@@ -21,19 +26,28 @@ class EmailState(Dict):
     contract_text: str | None
     analysis: Dict[str, Any] | None
     draft: str | None
+    session_id: str | None
 
 
 # Node 1: Analysis -----------------------
 def analyze_node(state: EmailState):
     analysis = analyze_email(state["email_text"])
+    session_id = create_session(state["email_text"], analysis, state.get("contract_text"))
     return {
-        "analysis": analysis
+        "analysis": analysis,
+        "session_id": session_id
     }
 
 
 # Node 2: Drafting -----------------------
 def draft_node(state: EmailState):
-    store = ContractStore(state["contract_text"])
+    # Reuse the contract parsed into the session instead of re-parsing;
+    # the session may already be evicted (shared LRU), so fall back
+    try:
+        session = session_store.get(state["session_id"])
+        store = session["contract_store"] or ContractStore(None)
+    except SessionNotFoundError:
+        store = ContractStore(state.get("contract_text"))
     clauses = store.get_all_clauses()
     draft = generate_draft_reply(
         analysis=state["analysis"],
@@ -6,10 +6,17 @@ FastAPI application entrypoint.
 - No MCP integration anymore
 - LangGraph is used only inside workflow endpoints (if added)
 """
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.config import settings
-from routes import analyze, draft
+from routes import analyze, contracts, debug, draft, jobs, metrics, sessions
+from services.job_service import start_job_worker, stop_job_worker
+from services.profiling_service import PROFILING_ENABLED, profiling_middleware
+
+logging.basicConfig(level=settings.LOG_LEVEL)
+
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -25,11 +32,26 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Session-Id"],
     )
 
     # Include routers
     app.include_router(analyze.router, prefix="/analyze", tags=["analysis"])
     app.include_router(draft.router, prefix="/draft", tags=["drafting"])
+    app.include_router(contracts.router, prefix="/contracts", tags=["contracts"])
+    app.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+    app.include_router(sessions.router, prefix="/sessions", tags=["sessions"])
+    app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+
+    # Opt-in profiling: nothing is installed unless enabled in Settings
+    if PROFILING_ENABLED:
+        app.middleware("http")(profiling_middleware)
+        app.include_router(debug.router, prefix="/debug", tags=["debug"])
+
+    # Deferred low-urgency work is drained by a background batch worker
+    if settings.JOB_QUEUE_ENABLED:
+        app.add_event_handler("startup", start_job_worker)
+        app.add_event_handler("shutdown", stop_job_worker)
 
 
     return app
@@ -13,11 +13,15 @@ Matches assignment-required schema:
 }
 
 Ensures consistent shape before drafting.
+Missing fields (e.g. from repaired, truncated LLM output) fall back
+to defaults rather than failing validation.
 """
 
 
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field, model_validator
+
+from utils.analysis_utils import UNKNOWN
 
 
 class PartiesModel(BaseModel):
@@ -31,16 +35,30 @@ class AgreementReferenceModel(BaseModel):
 
 
 class AnalysisSchema(BaseModel):
-    intent: str
-    primary_topic: str
+    intent: str = Field(default=UNKNOWN)
+    primary_topic: str = Field(default=UNKNOWN)
 
-    parties: PartiesModel
-    agreement_reference: AgreementReferenceModel
+    parties: PartiesModel = Field(default_factory=PartiesModel)
+    agreement_reference: AgreementReferenceModel = Field(default_factory=AgreementReferenceModel)
 
     questions: List[str] = Field(default_factory=list)
 
     requested_due_date: Optional[str] = Field(default=None)
-    urgency_level: str
+    urgency_level: str = Field(default="low")
 
     class Config:
         extra = "ignore"
+
+    @model_validator(mode="before")
+    @classmethod
+    def _drop_nulls(cls, data: Any) -> Any:
+        """
+        Repaired / partial LLM output may carry null for required fields;
+        drop those keys so the field defaults apply instead.
+        """
+        if isinstance(data, dict):
+            return {
+                k: v for k, v in data.items()
+                if v is not None or k == "requested_due_date"
+            }
+        return data
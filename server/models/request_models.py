@@ -2,14 +2,16 @@
 Request models for FastAPI routes:
 
 - AnalyzeRequest → POST /analyze
-- DraftRequest   → POST /draft
+- DraftRequest   → POST /draft (full payload, or session_id + analysis_patch)
+- ContractUploadRequest → POST /contracts
+- JobSubmitRequest      → POST /jobs
 
 These models validate user input and guarantee that the service
 layer receives correct parameter structures.
 """
-from typing import Dict, Any
+from typing import Dict, Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 # ============================================================
@@ -27,23 +29,123 @@ class AnalyzeRequest(BaseModel):
         description="Optional contract snippet text (not required for analysis)."
     )
 
+    contract_id: str | None = Field(
+        default=None,
+        description="Id from POST /contracts; used instead of contract_text."
+    )
+
+    defer_if_low_urgency: bool = Field(
+        default=False,
+        description="Queue a low-urgency email as a batch job (202) instead of analyzing now."
+    )
+
 
 # ============================================================
 # Request Model: /draft
 # ============================================================
 
 class DraftRequest(BaseModel):
-    email_text: str = Field(
-        ...,
+    email_text: str | None = Field(
+        default=None,
         description="Original raw email text used to detect sender name."
     )
 
-    analysis: Dict[str, Any] = Field(
-        ...,
+    analysis: Dict[str, Any] | None = Field(
+        default=None,
         description="JSON output from analyze_email()."
     )
 
+    contract_text: str | None = Field(
+        default=None,
+        description="Contract snippet containing clauses (9.1, 9.2, 10.2)."
+    )
+
+    contract_id: str | None = Field(
+        default=None,
+        description="Id from POST /contracts; used instead of contract_text."
+    )
+
+    # Session mode: everything above is already held server-side
+    session_id: str | None = Field(
+        default=None,
+        description="Session id returned by /analyze (X-Session-Id header)."
+    )
+
+    analysis_patch: Dict[str, Any] | None = Field(
+        default=None,
+        description="Partial edit applied to the session's analysis."
+    )
+
+    defer_if_low_urgency: bool = Field(
+        default=False,
+        description="Queue the draft as a batch job (202) when the analysis is low urgency."
+    )
+
+    @model_validator(mode="after")
+    def _session_or_full_payload(self):
+        if self.session_id:
+            return self
+        missing = [
+            name for name in ("email_text", "analysis")
+            if getattr(self, name) is None
+        ]
+        if self.contract_text is None and self.contract_id is None:
+            missing.append("contract_text or contract_id")
+        if missing:
+            raise ValueError(
+                f"Provide session_id, or email_text, analysis and contract_text/contract_id (missing: {', '.join(missing)})"
+            )
+        return self
+
+
+# ============================================================
+# Request Model: /contracts
+# ============================================================
+
+class ContractUploadRequest(BaseModel):
     contract_text: str = Field(
         ...,
-        description="Contract snippet containing clauses (9.1, 9.2, 10.2)."
+        description="Full contract text; clauses are parsed and indexed once."
+    )
+
+    name: str | None = Field(
+        default=None,
+        description="Optional contract name; re-uploads under the same name get a new version."
+    )
+
+
+# ============================================================
+# Request Model: /jobs
+# ============================================================
+
+class JobSubmitRequest(BaseModel):
+    kind: Literal["analyze", "draft"] = Field(
+        ...,
+        description="Deferred work to run in the next off-peak batch."
+    )
+
+    email_text: str = Field(
+        ...,
+        description="Raw legal email text."
+    )
+
+    analysis: Dict[str, Any] | None = Field(
+        default=None,
+        description="JSON output from analyze_email() (required for draft jobs)."
+    )
+
+    contract_text: str | None = Field(
+        default=None,
+        description="Contract snippet for draft jobs."
     )
+
+    contract_id: str | None = Field(
+        default=None,
+        description="Id from POST /contracts; used instead of contract_text."
+    )
+
+    @model_validator(mode="after")
+    def _draft_needs_analysis(self):
+        if self.kind == "draft" and self.analysis is None:
+            raise ValueError("Draft jobs require analysis")
+        return self
@@ -12,16 +12,29 @@ This module uses a single strong Gemini call to extract all required fields:
 
 Regex is NOT used anywhere.
 All reasoning is left to the LLM.
-Output is validated using AnalysisSchema.
+Output is repaired if needed (json_utils) and validated using AnalysisSchema.
+
+Very long emails (pasted contract sections, transcripts) are split on
+paragraph/sentence boundaries, analyzed concurrently and reduced in
+chunk order into a single AnalysisSchema result.
+
+The same requests (analysis_requests) and the same parsing/combining
+(parse_analysis_response, combine_analysis_parts) serve the deferred
+batch worker, so queued analyses behave like /analyze.
 """
 
-import json
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Dict, Any, List, Tuple
 
 from google import genai
 from core.config import settings
 from models.analysis_schema import AnalysisSchema
-from utils.text_utils import clean_text
+from modules.model_router import route, timed
+from utils.analysis_utils import reduce_chunk_analyses
+from utils.json_utils import extract_json_object
+from utils.profiling_utils import span
+from utils.text_utils import clean_text, iter_text_chunks
 
 
 # ---------------------------------------------------------
@@ -41,11 +54,97 @@ def analyze_email(email_text: str) -> Dict[str, Any]:
     - Asks it to extract ALL fields
     - Forces strict JSON output
     - Validates with AnalysisSchema
+
+    Emails longer than ANALYSIS_CHUNK_THRESHOLD_CHARS are analyzed
+    in chunks instead (see analyze_email_chunked).
+    """
+
+    with span("clean_text"):
+        email_text = clean_text(email_text)
+
+    if len(email_text) > settings.ANALYSIS_CHUNK_THRESHOLD_CHARS:
+        return analyze_email_chunked(email_text)
+
+    decision, prompt = analysis_requests(email_text)[0]
+    return combine_analysis_parts([_run_analysis(prompt, decision)])
+
+
+def analysis_requests(email_text: str) -> List[Tuple[Dict[str, Any], str]]:
+    """
+    (routing decision, prompt) for every LLM call a cleaned email needs:
+    one, or one per chunk above ANALYSIS_CHUNK_THRESHOLD_CHARS.
+    """
+    if len(email_text) <= settings.ANALYSIS_CHUNK_THRESHOLD_CHARS:
+        return [(route("analyze", email_text), build_analysis_prompt(email_text))]
+
+    chunks = list(iter_text_chunks(email_text, settings.ANALYSIS_CHUNK_SIZE_CHARS))
+    total = len(chunks)
+    return [
+        (route("analyze", chunk), build_analysis_prompt(chunk, part=(i + 1, total)))
+        for i, chunk in enumerate(chunks)
+    ]
+
+
+def combine_analysis_parts(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
+    Validate the raw JSON of a single analysis, or reduce per-chunk
+    results in chunk order, into an AnalysisSchema dict.
+    """
+    data = parts[0] if len(parts) == 1 else reduce_chunk_analyses(parts)
+
+    # Validate with Pydantic
+    with span("validate"):
+        validated = AnalysisSchema(**data)
+        return validated.model_dump()
 
-    email_text = clean_text(email_text)
 
-    prompt = f"""
+# ---------------------------------------------------------
+# LONG-INPUT (MAP-REDUCE) ANALYSIS
+# ---------------------------------------------------------
+
+def analyze_email_chunked(email_text: str) -> Dict[str, Any]:
+    """
+    Map-reduce analysis for emails too long for one prompt:
+    - Split on paragraph / sentence boundaries (iter_text_chunks)
+    - Analyze chunks concurrently (each chunk is one LLM call)
+    - Reduce partial results in chunk order (deterministic)
+
+    Latency is bounded by the slowest chunk, not the total length.
+    """
+    requests = analysis_requests(email_text)
+
+    # One context copy per chunk so request-scoped state (profiling) follows
+    contexts = [copy_context() for _ in requests]
+
+    workers = max(1, min(settings.ANALYSIS_CHUNK_MAX_CONCURRENCY, len(requests)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # map() keeps chunk order regardless of completion order
+        parts: List[Dict[str, Any]] = list(pool.map(
+            lambda ctx, request: ctx.run(_run_analysis, request[1], request[0]),
+            contexts, requests,
+        ))
+
+    return combine_analysis_parts(parts)
+
+
+# ---------------------------------------------------------
+# PROMPT + LLM CALL
+# ---------------------------------------------------------
+
+def build_analysis_prompt(email_text: str, part: tuple[int, int] | None = None) -> str:
+    """
+    Build the extraction prompt for a (cleaned) email.
+    `part` = (index, total) marks a chunk of a longer email.
+    """
+
+    part_note = ""
+    if part:
+        part_note = (
+            f"\nNOTE: This is part {part[0]} of {part[1]} of a longer email.\n"
+            "Extract only what appears in THIS part; use null / [] for anything not in it.\n"
+        )
+
+    return f"""
 You are a legal email analysis engine.
 
 Extract structured information from the email below.
@@ -85,30 +184,32 @@ RULES:
     treat urgency as high.
 - Do NOT hallucinate. If unsure, use null.
 - Output ONLY JSON. No explanations.
-
+{part_note}
 Email:
 {email_text}
 """
 
-    response = client.models.generate_content(
-        model=settings.GEMINI_MODEL,
-        contents=prompt
-    )
-
-    raw = response.text.strip()
-
-    # Ensure JSON extraction
-    try:
-        data = json.loads(raw)
-    except:
-        # Try to locate JSON inside any surrounding text
-        try:
-            start = raw.index("{")
-            end = raw.rindex("}") + 1
-            data = json.loads(raw[start:end])
-        except:
-            raise ValueError("LLM did not return valid JSON:\n" + raw)
 
-    # Validate with Pydantic
-    validated = AnalysisSchema(**data)
-    return validated.model_dump()
+def _run_analysis(prompt: str, decision: Dict[str, Any]) -> Dict[str, Any]:
+    """Send one analysis prompt to the routed model and return the raw JSON dict."""
+
+    with timed(decision):
+        response = client.models.generate_content(
+            model=decision["model"],
+            contents=prompt
+        )
+
+    return parse_analysis_response(response.text)
+
+
+def parse_analysis_response(text: str) -> Dict[str, Any]:
+    """Raw JSON dict from one analysis response. Raises ValueError."""
+    raw = (text or "").strip()
+
+    # Tolerant extraction: fences, trailing commas, truncation, ...
+    with span("json_extract"):
+        data, _repairs = extract_json_object(raw)
+    if data is None:
+        raise ValueError("LLM did not return valid JSON:\n" + raw)
+
+    return data
@@ -0,0 +1,89 @@
+"""
+Batch prediction backends for the deferred job queue.
+
+A backend takes many prompts for ONE model and returns one result per
+prompt, in input order. Submission and polling are separate so the
+worker can have several batches (one per model) in flight and poll
+them together without blocking a thread:
+
+    handle = submit(model, prompts)
+    poll(handle) → None while running
+                 | [ (text, None) | (None, error), ... ] when finished
+                 (raises if the whole batch failed)
+
+Backends:
+- GeminiBatchBackend → google-genai `client.batches` (inlined requests,
+                       discounted, completes asynchronously)
+- LocalBatchBackend  → in-process stand-in that calls `generate_fn`
+                       once per prompt on the first poll (tests / offline)
+"""
+
+import logging
+from typing import Callable, Dict, List, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+BatchResult = Tuple[str | None, str | None]
+
+_TERMINAL_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
+
+
+class GeminiBatchBackend:
+    """Gemini batch mode; the handle is the provider's batch name."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def submit(self, model: str, prompts: List[str]) -> str:
+        job = self.client.batches.create(
+            model=model,
+            src=[{"contents": [{"parts": [{"text": prompt}], "role": "user"}]} for prompt in prompts],
+            config={"display_name": "deferred-jobs"},
+        )
+        logger.info("batch_submitted name=%s model=%s size=%d", job.name, model, len(prompts))
+        return job.name
+
+    def poll(self, handle: str) -> List[BatchResult] | None:
+        job = self.client.batches.get(name=handle)
+        if job.state.name not in _TERMINAL_STATES:
+            return None
+        if job.state.name != "JOB_STATE_SUCCEEDED":
+            raise RuntimeError(f"Batch {handle} ended in {job.state.name}")
+
+        results: List[BatchResult] = []
+        for item in job.dest.inlined_responses:
+            if item.response is not None:
+                results.append((item.response.text, None))
+            else:
+                results.append((None, str(item.error or "empty batch response")))
+        return results
+
+
+class LocalBatchBackend:
+    """In-process stand-in: one `generate_fn(model, prompt)` call per prompt."""
+
+    def __init__(self, generate_fn: Callable[[str, str], str]):
+        self.generate_fn = generate_fn
+        self._pending: Dict[int, Tuple[str, List[str]]] = {}
+        self._next = 0
+
+    def submit(self, model: str, prompts: List[str]) -> int:
+        self._next += 1
+        self._pending[self._next] = (model, list(prompts))
+        return self._next
+
+    def poll(self, handle: int) -> List[BatchResult] | None:
+        model, prompts = self._pending.pop(handle)
+        results: List[BatchResult] = []
+        for prompt in prompts:
+            try:
+                results.append((self.generate_fn(model, prompt), None))
+            except Exception as e:
+                results.append((None, str(e)))
+        return results
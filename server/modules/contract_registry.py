@@ -0,0 +1,212 @@
+"""
+ContractRegistry
+
+Upload a contract once, reference it by id on every draft.
+
+On registration the text is cleaned, hashed and parsed (parse_clauses,
+no LLM). The clauses and a term → clause inverted index are stored in a
+local SQLite database opened with memory-mapped I/O (PRAGMA mmap_size),
+so loading a contract reads pages straight from the OS page cache.
+
+    contract_id = first 16 hex chars of sha256(cleaned text)
+    version     = 1 + previous versions registered under the same name
+
+Re-uploading identical text returns the existing id and version.
+Text without any numbered clauses is rejected (EmptyContractError).
+Hot contracts are kept as ready ContractStore objects in an LRU.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+from modules.contract_store import ContractStore
+from utils.clause_utils import clause_terms, parse_clauses
+from utils.text_utils import clean_text
+
+
+class ContractNotFoundError(LookupError):
+    """Unknown contract id."""
+
+
+class EmptyContractError(ValueError):
+    """No numbered clauses could be parsed from the uploaded text."""
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contracts (
+    contract_id   TEXT PRIMARY KEY,
+    name          TEXT,
+    version       INTEGER NOT NULL,
+    content_hash  TEXT NOT NULL,
+    clause_count  INTEGER NOT NULL,
+    created_at    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS clauses (
+    contract_id   TEXT NOT NULL,
+    clause_id     TEXT NOT NULL,
+    position      INTEGER NOT NULL,
+    text          TEXT NOT NULL,
+    PRIMARY KEY (contract_id, clause_id)
+);
+CREATE TABLE IF NOT EXISTS clause_terms (
+    contract_id   TEXT NOT NULL,
+    term          TEXT NOT NULL,
+    clause_id     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_clause_terms ON clause_terms (contract_id, term);
+CREATE INDEX IF NOT EXISTS idx_contracts_name ON contracts (name);
+"""
+
+
+class ContractRegistry:
+
+    def __init__(self, db_path: str, cache_size: int = 64, mmap_bytes: int = 64 * 1024 * 1024):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_size = cache_size
+        self.mmap_bytes = mmap_bytes
+
+        self._cache: "OrderedDict[str, ContractStore]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        with self._db() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_bytes)}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        return conn
+
+    @contextmanager
+    def _db(self):
+        """Connection committed on success, rolled back on error, always closed."""
+        conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ---------------------------------------------------------
+    # REGISTER
+    # ---------------------------------------------------------
+
+    def register(self, contract_text: str, name: str | None = None) -> Dict[str, Any]:
+        """
+        Parse and store a contract.
+
+        Returns:
+            { contract_id, name, version, clause_count, created_at, created }
+            created = False when identical text was already registered
+
+        Raises EmptyContractError when no clauses can be parsed.
+        """
+        text = clean_text(contract_text)
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        contract_id = content_hash[:16]
+
+        with self._lock, self._db() as conn:
+            existing = conn.execute(
+                "SELECT * FROM contracts WHERE contract_id = ?", (contract_id,)
+            ).fetchone()
+            if existing:
+                return dict(existing, created=False)
+
+            clauses = parse_clauses(text)
+            if not clauses:
+                raise EmptyContractError("No numbered clauses found in contract text")
+
+            version = 1
+            if name:
+                row = conn.execute(
+                    "SELECT MAX(version) AS v FROM contracts WHERE name = ?", (name,)
+                ).fetchone()
+                version = (row["v"] or 0) + 1
+
+            meta = {
+                "contract_id": contract_id,
+                "name": name,
+                "version": version,
+                "content_hash": content_hash,
+                "clause_count": len(clauses),
+                "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            }
+            conn.execute(
+                "INSERT INTO contracts VALUES (:contract_id, :name, :version, "
+                ":content_hash, :clause_count, :created_at)",
+                meta,
+            )
+            conn.executemany(
+                "INSERT INTO clauses VALUES (?, ?, ?, ?)",
+                [(contract_id, cid, pos, body) for pos, (cid, body) in enumerate(clauses.items())],
+            )
+            conn.executemany(
+                "INSERT INTO clause_terms VALUES (?, ?, ?)",
+                [
+                    (contract_id, term, cid)
+                    for cid, body in clauses.items()
+                    for term in sorted(clause_terms(body))
+                ],
+            )
+
+        return dict(meta, created=True)
+
+    # ---------------------------------------------------------
+    # LOOKUP
+    # ---------------------------------------------------------
+
+    def get_metadata(self, contract_id: str) -> Dict[str, Any]:
+        with self._db() as conn:
+            row = conn.execute(
+                "SELECT * FROM contracts WHERE contract_id = ?", (contract_id,)
+            ).fetchone()
+        if row is None:
+            raise ContractNotFoundError(contract_id)
+        return dict(row)
+
+    def get_store(self, contract_id: str) -> ContractStore:
+        """ContractStore for a registered contract (LRU-cached)."""
+        with self._lock:
+            store = self._cache.get(contract_id)
+            if store is not None:
+                self._cache.move_to_end(contract_id)
+                return store
+
+        store = self._load(contract_id)
+
+        with self._lock:
+            self._cache[contract_id] = store
+            self._cache.move_to_end(contract_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return store
+
+    def _load(self, contract_id: str) -> ContractStore:
+        with self._db() as conn:
+            if conn.execute(
+                "SELECT 1 FROM contracts WHERE contract_id = ?", (contract_id,)
+            ).fetchone() is None:
+                raise ContractNotFoundError(contract_id)
+
+            clauses = {
+                row["clause_id"]: row["text"]
+                for row in conn.execute(
+                    "SELECT clause_id, text FROM clauses WHERE contract_id = ? ORDER BY position",
+                    (contract_id,),
+                )
+            }
+            index: Dict[str, List[str]] = {}
+            for row in conn.execute(
+                "SELECT term, clause_id FROM clause_terms WHERE contract_id = ?", (contract_id,)
+            ):
+                index.setdefault(row["term"], []).append(row["clause_id"])
+
+        return ContractStore.from_clauses(clauses, index)
@@ -6,8 +6,16 @@ We HARD-CODE the ONLY clauses the drafter is allowed to use:
 9.1, 9.2, 10.2
 
 LLM extraction is DISABLED because it causes hallucinations.
+
+Contracts uploaded to the ContractRegistry are parsed deterministically
+(no LLM) and served through ContractStore.from_clauses(), together with
+their precompiled term index.
 """
 
+from typing import Dict, List
+
+from utils.clause_utils import clause_terms
+
 class ContractStore:
     """
     Holds ONLY the assignment-required clauses.
@@ -32,12 +40,37 @@ class ContractStore:
             )
         }
 
+        self.index: Dict[str, List[str]] | None = None
+
+    @classmethod
+    def from_clauses(cls, clauses: Dict[str, str], index: Dict[str, List[str]] | None = None):
+        """
+        Store for a registered contract: its parsed clauses plus the
+        term → clause ids index built at upload time.
+        Never substitutes the hard-coded clauses.
+        """
+        store = cls()
+        store.clauses = dict(clauses)
+        store.index = index
+        return store
+
     def get_clause(self, cid: str):
         return self.clauses.get(cid)
 
     def get_all_clauses(self):
         return dict(self.clauses)
 
-    def search_clauses(self, _q: str):
-        # Search is intentionally disabled for safety
-        return []
+    def search_clauses(self, q: str):
+        # Search is intentionally disabled for the hard-coded clauses;
+        # registered contracts search their precompiled index.
+        if not self.index:
+            return []
+
+        hits: Dict[str, int] = {}
+        for term in clause_terms(q):
+            for cid in self.index.get(term, []):
+                hits[cid] = hits.get(cid, 0) + 1
+
+        order = {cid: i for i, cid in enumerate(self.clauses)}
+        ranked = sorted(hits, key=lambda cid: (-hits[cid], order.get(cid, 0)))
+        return [(cid, self.clauses[cid]) for cid in ranked]
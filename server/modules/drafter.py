@@ -6,24 +6,65 @@ Produces a professional legal reply that:
 - Answers ONLY based on snippet
 - Says “Based on the provided excerpt… cannot confirm” when needed
 - Uses proper legal tone like the assignment example
+
+The instruction preamble + clause block is identical for every draft
+against the same contract, so it is registered once as a cached prompt
+prefix (PromptPrefixCache); each call then sends only email + analysis.
+
+Parallel mode (DRAFT_PARALLEL_ENABLED, >= DRAFT_PARALLEL_MIN_QUESTIONS
+questions): each question is answered by its own short call using only
+the clauses relevant to it, concurrently with one framing call
+(greeting / opening / closing). The parts are assembled in question
+order, so latency approaches that of the slowest single answer. If any
+parallel call fails, the draft is regenerated by the single-call path.
 """
 
 import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Dict, List
+
 from google import genai
 from core.config import settings
+from modules.model_router import route, timed
+from modules.prompt_cache import GeminiCacheBackend, LocalCacheBackend, PromptPrefixCache
+from utils.clause_utils import relevant_clauses
+from utils.json_utils import extract_json_object
 from utils.text_utils import clean_text
 
+logger = logging.getLogger(__name__)
+
 client = genai.Client(api_key=settings.GEMINI_API_KEY)
 
-def generate_draft_reply(analysis: dict, clauses: dict, original_email: str) -> str:
-    """
-    Fully compliant drafter.
-    Uses ONLY the 3 allowed clauses.
-    """
+
+def generate_uncached(model: str, prompt: str) -> str:
+    resp = client.models.generate_content(
+        model=model,
+        contents=[prompt]
+    )
+    return resp.text
+
+
+prompt_cache = PromptPrefixCache(
+    backend=(
+        LocalCacheBackend(generate_uncached)
+        if settings.DRAFT_PROMPT_CACHE_BACKEND == "local"
+        else GeminiCacheBackend(client)
+    ),
+    ttl_seconds=settings.DRAFT_PROMPT_CACHE_TTL_SECONDS,
+    refresh_margin_seconds=settings.DRAFT_PROMPT_CACHE_REFRESH_MARGIN_SECONDS,
+    max_entries=settings.DRAFT_PROMPT_CACHE_MAX_ENTRIES,
+    retry_seconds=settings.DRAFT_PROMPT_CACHE_RETRY_SECONDS,
+)
+
+
+def build_draft_prefix(clauses: dict) -> str:
+    """Static part of the prompt: instructions + rendered clause block."""
 
     clause_block = "\n".join([f"{cid}: {text}" for cid, text in clauses.items()])
 
-    prompt = f"""
+    return f"""
 You are a senior commercial contracts lawyer.
 
 Produce a reply that:
@@ -39,7 +80,13 @@ Produce a reply that:
 - NEVER reference clauses not in the hardcoded list.
 - NEVER declare breach unless the snippet explicitly defines one.
 - DO NOT output JSON.
+"""
+
 
+def build_draft_suffix(analysis: dict, original_email: str) -> str:
+    """Per-request part of the prompt: email + structured analysis."""
+
+    return f"""
 ORIGINAL EMAIL:
 {original_email}
 
@@ -49,9 +96,174 @@ STRUCTURED ANALYSIS:
 --- DRAFT THE EMAIL BELOW THIS LINE ONLY ---
 """
 
-    resp = client.models.generate_content(
-        model=settings.GEMINI_MODEL,
-        contents=[prompt]
-    )
 
-    return clean_text(resp.text)
+def generate_draft_reply(analysis: dict, clauses: dict, original_email: str) -> str:
+    """
+    Fully compliant drafter.
+    Uses ONLY the 3 allowed clauses.
+    """
+
+    questions = analysis.get("questions") or []
+    if settings.DRAFT_PARALLEL_ENABLED and len(questions) >= settings.DRAFT_PARALLEL_MIN_QUESTIONS:
+        try:
+            return generate_draft_reply_parallel(analysis, clauses, original_email)
+        except Exception:
+            logger.exception("parallel_draft_failed questions=%d", len(questions))
+
+    return generate_draft_reply_single(analysis, clauses, original_email)
+
+
+def generate_draft_reply_single(analysis: dict, clauses: dict, original_email: str) -> str:
+    """The whole reply in one call (cached prefix + per-request suffix)."""
+
+    prefix = build_draft_prefix(clauses)
+    suffix = build_draft_suffix(analysis, original_email)
+
+    decision = route("draft", original_email, questions=len(analysis.get("questions") or []))
+    model = decision["model"]
+
+    with timed(decision):
+        text = None
+        if settings.DRAFT_PROMPT_CACHE_ENABLED:
+            text = prompt_cache.generate(model, prefix, suffix)
+
+        if text is None:
+            text = generate_uncached(model, prefix + suffix)
+
+    return clean_text(text)
+
+
+# ---------------------------------------------------------
+# PARALLEL PER-QUESTION DRAFTING
+# ---------------------------------------------------------
+
+FRAMING_DEFAULTS = {
+    "greeting": "Dear Sir or Madam,",
+    "opening": "Thank you for your email. Please find our responses to your questions below.",
+    "closing": "Please let us know if you have any further questions.",
+    "sign_off": "Kind regards,",
+}
+
+
+def build_answer_prompt(question: str, clauses: dict, analysis: dict) -> str:
+    """One question, only its relevant clauses, answer paragraph only."""
+
+    clause_block = "\n".join([f"{cid}: {text}" for cid, text in clauses.items()])
+
+    return f"""
+You are a senior commercial contracts lawyer answering ONE question
+from a client email, as one paragraph of a longer reply.
+
+Rules:
+- Use a professional legal tone.
+- Use ONLY these clauses (do not add others):
+  {clause_block}
+- If the clause needed to answer the question is NOT in this list,
+  you MUST write:
+  "Based on the provided excerpt, this clause is not included, so we cannot confirm."
+- NEVER invent or infer clauses.
+- NEVER declare breach unless the snippet explicitly defines one.
+- Begin by briefly naming the point addressed; cite clause numbers.
+- NO greeting, NO sign-off, NO numbering, NO JSON.
+
+CONTEXT:
+Agreement: {json.dumps(analysis.get("agreement_reference") or {})}
+Topic: {analysis.get("primary_topic")}
+
+QUESTION:
+{question}
+
+--- ANSWER PARAGRAPH BELOW THIS LINE ONLY ---
+"""
+
+
+def build_framing_prompt(analysis: dict, original_email: str) -> str:
+    """Short pass for the parts around the answers (no legal content)."""
+
+    return f"""
+You are writing the framing of a professional legal reply email.
+The answers to the client's questions are written separately.
+
+Return ONLY valid JSON EXACTLY in this schema:
+
+{{
+  "greeting": "salutation addressing the sender by name, e.g. Dear Ms. Sharma,",
+  "opening": "one sentence acknowledging the email and its topic",
+  "closing": "one sentence closing the reply",
+  "sign_off": "sign-off line(s), e.g. Kind regards,"
+}}
+
+Do NOT answer the questions. Do NOT mention clauses.
+
+ORIGINAL EMAIL:
+{original_email}
+
+TOPIC: {analysis.get("primary_topic")}
+"""
+
+
+def _generate_answer(question: str, clauses: dict, analysis: dict, decision: dict) -> str:
+    prompt = build_answer_prompt(question, relevant_clauses(question, clauses), analysis)
+    with timed(decision):
+        text = generate_uncached(decision["model"], prompt)
+    return clean_text(text)
+
+
+def _generate_framing(analysis: dict, original_email: str) -> Dict[str, str]:
+    decision = route("draft_framing", original_email, questions=0)
+    with timed(decision):
+        raw = generate_uncached(decision["model"], build_framing_prompt(analysis, original_email))
+
+    data, _repairs = extract_json_object(raw or "")
+    framing = dict(FRAMING_DEFAULTS)
+    for key in framing:
+        value = (data or {}).get(key)
+        if isinstance(value, str) and value.strip():
+            framing[key] = value.strip()
+    return framing
+
+
+def assemble_draft(framing: Dict[str, str], answers: List[str]) -> str:
+    """Deterministic layout: greeting, opening, numbered answers, closing, sign-off."""
+
+    paragraphs = [framing["greeting"], framing["opening"]]
+    if len(answers) == 1:
+        paragraphs.append(answers[0])
+    else:
+        paragraphs.extend(f"{i}. {answer}" for i, answer in enumerate(answers, start=1))
+    paragraphs.extend([framing["closing"], framing["sign_off"]])
+    return clean_text("\n\n".join(p for p in paragraphs if p))
+
+
+def generate_draft_reply_parallel(analysis: dict, clauses: dict, original_email: str) -> str:
+    """
+    Answer every question concurrently (plus one framing call) and
+    assemble the reply in question order, whatever order calls finish in.
+    A failed call's error is raised; calls not yet started are cancelled.
+    """
+    questions = analysis.get("questions") or []
+
+    # Answers use the tier the single-call path would pick for the whole
+    # email: a short question can still be a hard one
+    decision = route("draft", original_email, questions=len(questions))
+    answer_decision = dict(decision, task="draft_answer")
+
+    # One context copy per call so request-scoped state (profiling) follows
+    workers = max(1, min(settings.DRAFT_PARALLEL_MAX_CONCURRENCY, len(questions) + 1))
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        framing_future = pool.submit(
+            copy_context().run, _generate_framing, analysis, original_email
+        )
+        answer_futures = [
+            pool.submit(
+                copy_context().run, _generate_answer, question, clauses, analysis, answer_decision
+            )
+            for question in questions
+        ]
+        answers = [future.result() for future in answer_futures]
+        framing = framing_future.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    return assemble_draft(framing, answers)
@@ -0,0 +1,193 @@
+"""
+JobQueue
+
+Durable local queue for deferred (non-interactive) LLM work, backed by
+SQLite so queued jobs survive restarts:
+
+    job_id → { kind, status, reason, payload, result | error, timestamps }
+
+    status: queued → running → done | failed
+
+Workers claim the oldest queued jobs in one atomic UPDATE, so several
+processes can share the same database file without double-processing.
+A worker refreshes `heartbeat_at` on the jobs it holds while their
+batch runs; only claims whose heartbeat is older than a timeout (the
+worker died) are returned to the queue, never a live sibling's jobs.
+"""
+
+import json
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+class JobNotFoundError(LookupError):
+    """Unknown job id."""
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id        TEXT PRIMARY KEY,
+    kind          TEXT NOT NULL,
+    status        TEXT NOT NULL,
+    reason        TEXT,
+    payload       TEXT NOT NULL,
+    result        TEXT,
+    error         TEXT,
+    claim         TEXT,
+    created_at    TEXT NOT NULL,
+    started_at    TEXT,
+    heartbeat_at  TEXT,
+    finished_at   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+"""
+
+# Columns returned to API clients (payload stays server-side)
+_PUBLIC = ("job_id", "kind", "status", "reason", "created_at", "started_at", "finished_at", "error")
+
+
+def _now(offset_seconds: float = 0) -> str:
+    return (datetime.utcnow() + timedelta(seconds=offset_seconds)).isoformat(timespec="seconds")
+
+
+class JobQueue:
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._db() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = WAL")
+        return conn
+
+    @contextmanager
+    def _db(self):
+        """Connection committed on success, rolled back on error, always closed."""
+        conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ---------------------------------------------------------
+    # SUBMIT / POLL
+    # ---------------------------------------------------------
+
+    def submit(self, kind: str, payload: Dict[str, Any], reason: str | None = None) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        with self._db() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, kind, status, reason, payload, created_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, reason, json.dumps(payload, ensure_ascii=False), _now()),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        """Public view of a job (result decoded). Raises JobNotFoundError."""
+        with self._db() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise JobNotFoundError(job_id)
+
+        job = {key: row[key] for key in _PUBLIC}
+        job["result"] = json.loads(row["result"]) if row["result"] else None
+        return job
+
+    # ---------------------------------------------------------
+    # WORKER SIDE
+    # ---------------------------------------------------------
+
+    def claim(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Mark up to `limit` oldest queued jobs as running and return them
+        (with decoded payload and their claim token), oldest first.
+        """
+        token = uuid.uuid4().hex
+        now = _now()
+        with self._db() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'running', claim = ?, started_at = ?, heartbeat_at = ? "
+                "WHERE job_id IN ("
+                "  SELECT job_id FROM jobs WHERE status = 'queued' "
+                "  ORDER BY created_at, rowid LIMIT ?"
+                ")",
+                (token, now, now, limit),
+            )
+            rows = conn.execute(
+                "SELECT job_id, kind, payload FROM jobs WHERE claim = ? ORDER BY created_at, rowid",
+                (token,),
+            ).fetchall()
+
+        return [
+            {
+                "job_id": row["job_id"],
+                "kind": row["kind"],
+                "payload": json.loads(row["payload"]),
+                "claim": token,
+            }
+            for row in rows
+        ]
+
+    def finish(
+        self,
+        job_id: str,
+        result: Dict[str, Any] | None = None,
+        error: str | None = None,
+        claim: str | None = None,
+    ) -> bool:
+        """
+        Record a job's outcome. With `claim`, only if the job is still held
+        under that claim (not re-queued meanwhile). Returns True if recorded.
+        """
+        query = "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE job_id = ?"
+        params = [
+            "failed" if error else "done",
+            json.dumps(result, ensure_ascii=False) if result is not None else None,
+            error,
+            _now(),
+            job_id,
+        ]
+        if claim is not None:
+            query += " AND claim = ?"
+            params.append(claim)
+
+        with self._db() as conn:
+            return conn.execute(query, params).rowcount > 0
+
+    def heartbeat(self, job_ids: List[str]) -> None:
+        """Mark claimed jobs as still being worked on."""
+        if not job_ids:
+            return
+        marks = ",".join("?" * len(job_ids))
+        with self._db() as conn:
+            conn.execute(
+                f"UPDATE jobs SET heartbeat_at = ? WHERE status = 'running' AND job_id IN ({marks})",
+                (_now(), *job_ids),
+            )
+
+    def requeue_stale(self, timeout_seconds: float) -> int:
+        """Return running jobs whose worker stopped heartbeating to the queue."""
+        with self._db() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = 'queued', claim = NULL, started_at = NULL, heartbeat_at = NULL "
+                "WHERE status = 'running' AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                (_now(-timeout_seconds),),
+            )
+            return cur.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """{ status: number of jobs }"""
+        with self._db() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
@@ -0,0 +1,133 @@
+"""
+Model tier routing.
+
+Scores each input locally (no LLM call) and picks a model tier:
+- "fast"   → cheap / low-latency model for simple inputs
+             ("please confirm receipt", one short question)
+- "strong" → the stronger model for everything else
+
+An input is "fast" only if EVERY feature is within its threshold
+(MODEL_ROUTING_FAST_MAX_*). Tiers map to model names via
+settings.MODEL_TIERS; a missing or null tier (the strong tier by
+default) resolves to settings.GEMINI_MODEL, so routing never
+downgrades the configured model for complex inputs. Every decision and
+its latency is logged and aggregated per tier for /metrics, so
+thresholds can be tuned.
+"""
+
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict
+
+from core.config import settings
+from utils.date_utils import find_date_mentions
+from utils.profiling_utils import span
+
+
+logger = logging.getLogger(__name__)
+
+_CLAUSE_RE = re.compile(r"\b(?:clause|section|article)\s+\d+(?:\.\d+)*", re.IGNORECASE)
+_LIST_ITEM_RE = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s+", re.MULTILINE)
+_WHETHER_RE = re.compile(r"\bwhether\b", re.IGNORECASE)
+
+_stats: Dict[str, Dict[str, float]] = {}
+_stats_lock = threading.Lock()
+
+
+# ============================================================
+# SCORING
+# ============================================================
+
+def score_complexity(text: str, questions: int | None = None) -> Dict[str, int]:
+    """
+    Local complexity features of an input.
+
+    Args:
+        text: email (or prompt-relevant) text
+        questions: known question count (e.g. from an analysis);
+                   estimated from the text when None
+
+    Returns:
+        { words, questions, dates, clauses }
+    """
+    text = text or ""
+    if questions is None:
+        questions = max(
+            text.count("?"),
+            len(_LIST_ITEM_RE.findall(text)) + len(_WHETHER_RE.findall(text)),
+        )
+
+    return {
+        "words": len(text.split()),
+        "questions": questions,
+        "dates": len(find_date_mentions(text)),
+        "clauses": len(_CLAUSE_RE.findall(text)),
+    }
+
+
+def choose_tier(features: Dict[str, int]) -> str:
+    fast = (
+        features["words"] <= settings.MODEL_ROUTING_FAST_MAX_WORDS
+        and features["questions"] <= settings.MODEL_ROUTING_FAST_MAX_QUESTIONS
+        and features["dates"] <= settings.MODEL_ROUTING_FAST_MAX_DATES
+        and features["clauses"] <= settings.MODEL_ROUTING_FAST_MAX_CLAUSES
+    )
+    return "fast" if fast else "strong"
+
+
+# ============================================================
+# ROUTING
+# ============================================================
+
+def route(task: str, text: str, questions: int | None = None) -> Dict[str, Any]:
+    """
+    Pick the model for one LLM task ("analyze", "draft", "parse").
+
+    Returns:
+        { task, tier, model, features }
+    """
+    if not settings.MODEL_ROUTING_ENABLED:
+        return {"task": task, "tier": "default", "model": settings.GEMINI_MODEL, "features": {}}
+
+    features = score_complexity(text, questions)
+    tier = choose_tier(features)
+    model = settings.MODEL_TIERS.get(tier) or settings.GEMINI_MODEL
+
+    logger.info("model_route task=%s tier=%s model=%s features=%s", task, tier, model, features)
+    return {"task": task, "tier": tier, "model": model, "features": features}
+
+
+@contextmanager
+def timed(decision: Dict[str, Any]):
+    """Time the LLM call made for a routing decision and record it per tier."""
+    start = time.perf_counter()
+    try:
+        with span(f"llm:{decision['task']}:{decision['tier']}"):
+            yield
+    finally:
+        elapsed = time.perf_counter() - start
+        key = f"{decision['task']}:{decision['tier']}"
+        with _stats_lock:
+            entry = _stats.setdefault(key, {"calls": 0, "total_seconds": 0.0})
+            entry["calls"] += 1
+            entry["total_seconds"] += elapsed
+        logger.info(
+            "model_latency task=%s tier=%s model=%s seconds=%.3f",
+            decision["task"], decision["tier"], decision["model"], elapsed,
+        )
+
+
+def get_routing_stats() -> Dict[str, Dict[str, float]]:
+    """{ "task:tier": { calls, total_seconds, avg_seconds } }"""
+    with _stats_lock:
+        return {
+            key: dict(
+                entry,
+                total_seconds=round(entry["total_seconds"], 3),
+                avg_seconds=round(entry["total_seconds"] / entry["calls"], 3),
+            )
+            for key, entry in _stats.items()
+        }
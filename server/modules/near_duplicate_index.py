@@ -0,0 +1,379 @@
+"""
+NearDuplicateIndex
+
+SimHash index over normalised emails so templated mail (same vendor
+notice, different date) reuses an earlier analysis instead of a new
+LLM call.
+
+Normalisation before hashing:
+    clean_text → lower-case → dates masked → digits masked → spaces collapsed
+so a template differing only in dates hashes (almost) identically.
+
+Storage is array-backed to stay compact for millions of entries:
+    - signatures      array('Q')  8 bytes / entry
+    - band buckets    array('I')  4 bytes / entry / band
+Analyses themselves are kept in a bounded LRU. Evicting one also
+removes its band-bucket entries and recycles its id (and signature
+slot), so the arrays never grow past `max_stored_analyses` entries.
+
+Digits are masked for hashing only. On reuse, the details a template
+varies are re-extracted from the new email instead of re-asking the LLM:
+    - dates      → aligned one-to-one, substituted in due / agreement date
+    - figures    → non-date numbers (amounts, quantities, references)
+                   aligned one-to-one, substituted in cached questions
+    - party names → re-found between the words that surrounded the
+                   cached name in the indexed email (its template slot)
+A match is rejected when any of these cannot be aligned.
+
+Lookup uses LSH banding: the 64-bit signature is cut into
+(max_hamming + 1) bands, so any signature within `max_hamming` bits
+shares at least one band exactly (pigeonhole) and is found.
+"""
+
+import hashlib
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from utils.date_utils import compute_urgency, find_date_mentions, mask_dates, parse_date_safe
+from utils.text_utils import clean_text, collapse_spaces
+
+
+SIGNATURE_BITS = 64
+SHINGLE_SIZE = 3
+
+# Words kept on each side of a party name to re-find its template slot
+PARTY_ANCHOR_WORDS = 3
+PARTY_NAME_MAX_WORDS = 6
+
+_NUMBER_RE = re.compile(r"\d[\d,.]*\d|\d")
+
+
+# ============================================================
+# SIMHASH
+# ============================================================
+
+def normalize_for_simhash(text: str) -> str:
+    """Lower-case, mask dates and digits, collapse whitespace."""
+    txt = mask_dates(clean_text(text).lower(), token=" datetoken ")
+    txt = re.sub(r"\d+", "#", txt)
+    return collapse_spaces(txt)
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word shingles of the normalised text."""
+    words = normalize_for_simhash(text).split()
+    if len(words) < SHINGLE_SIZE:
+        shingles = [" ".join(words)] if words else []
+    else:
+        shingles = [
+            " ".join(words[i:i + SHINGLE_SIZE])
+            for i in range(len(words) - SHINGLE_SIZE + 1)
+        ]
+
+    weights = [0] * SIGNATURE_BITS
+    for shingle in shingles:
+        h = int.from_bytes(
+            hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for bit in range(SIGNATURE_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    sig = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            sig |= 1 << bit
+    return sig
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def number_tokens(text: str) -> List[str]:
+    """Non-date numbers in order, as written ("$5,000" → "5,000")."""
+    return _NUMBER_RE.findall(mask_dates(clean_text(text)))
+
+
+def number_mentions(text: str) -> List[str]:
+    """Non-date numbers in order ("$5,000" → "5000"; dates excluded)."""
+    return [n.replace(",", "") for n in number_tokens(text)]
+
+
+def party_anchors(email_text: str, analysis: Dict[str, Any]) -> Dict[str, Tuple[str, str]]:
+    """
+    { party name: (words before, words after) } around the first mention
+    of each party name; names not found verbatim get no anchor.
+    """
+    text = clean_text(email_text)
+    lowered = text.lower()
+    anchors: Dict[str, Tuple[str, str]] = {}
+    for name in (analysis.get("parties") or {}).values():
+        if not name or name in anchors:
+            continue
+        start = lowered.find(name.lower())
+        if start < 0:
+            continue
+        before = text[:start].split()[-PARTY_ANCHOR_WORDS:]
+        after = text[start + len(name):].split()[:PARTY_ANCHOR_WORDS]
+        if before or after:
+            anchors[name] = (" ".join(before), " ".join(after))
+    return anchors
+
+
+# ============================================================
+# INDEX
+# ============================================================
+
+class NearDuplicateIndex:
+    """
+    Array-backed SimHash index: entry id → signature, banded buckets,
+    plus an LRU of { entry id → (analysis, date mentions, numbers,
+    party anchors) }.
+    Ids of evicted entries are reused.
+    """
+
+    def __init__(self, max_hamming: int = 3, max_stored_analyses: int = 50000):
+        self.max_hamming = max_hamming
+        self.bands = max_hamming + 1
+        self.band_bits = SIGNATURE_BITS // self.bands
+        self._band_mask = (1 << self.band_bits) - 1
+
+        self._signatures = array("Q")
+        self._buckets: List[Dict[int, array]] = [dict() for _ in range(self.bands)]
+        self._payloads: "OrderedDict[int, Tuple[Dict[str, Any], List[str], List[str], Dict]]" = (
+            OrderedDict()
+        )
+        self._max_payloads = max_stored_analyses
+        self._free_ids: List[int] = []
+        self._lock = threading.Lock()
+
+        self.stats = {"lookups": 0, "hits": 0, "rejected": 0}
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def _band_keys(self, sig: int):
+        for band in range(self.bands):
+            yield band, (sig >> (band * self.band_bits)) & self._band_mask
+
+    # ---------------------------------------------------------
+    # ADD / FIND
+    # ---------------------------------------------------------
+
+    def add(self, email_text: str, analysis: Dict[str, Any]) -> int:
+        """Index an analysed email. Returns its entry id."""
+        sig = simhash(email_text)
+        dates = [iso for _raw, iso in find_date_mentions(clean_text(email_text))]
+        numbers = number_mentions(email_text)
+        anchors = party_anchors(email_text, analysis)
+
+        with self._lock:
+            if self._free_ids:
+                entry_id = self._free_ids.pop()
+                self._signatures[entry_id] = sig
+            else:
+                entry_id = len(self._signatures)
+                self._signatures.append(sig)
+            for band, key in self._band_keys(sig):
+                self._buckets[band].setdefault(key, array("I")).append(entry_id)
+
+            self._payloads[entry_id] = (dict(analysis), dates, numbers, anchors)
+            while len(self._payloads) > self._max_payloads:
+                old_id, _payload = self._payloads.popitem(last=False)
+                self._release(old_id)
+            return entry_id
+
+    def _release(self, entry_id: int) -> None:
+        """Unlink an evicted entry from its buckets and recycle its id (lock held)."""
+        for band, key in self._band_keys(self._signatures[entry_id]):
+            bucket = self._buckets[band].get(key)
+            if bucket is None:
+                continue
+            try:
+                bucket.remove(entry_id)
+            except ValueError:
+                pass
+            if not bucket:
+                del self._buckets[band][key]
+        self._free_ids.append(entry_id)
+
+    def find(
+        self, email_text: str
+    ) -> Tuple[int, float, Dict[str, Any], List[str], List[str], Dict] | None:
+        """
+        Closest indexed email within `max_hamming` bits.
+
+        Returns:
+            (entry_id, similarity 0..1, analysis, date_mentions, numbers,
+             party_anchors) or None
+        """
+        sig = simhash(email_text)
+
+        with self._lock:
+            self.stats["lookups"] += 1
+            best: Tuple[int, int] | None = None
+            seen = set()
+            for band, key in self._band_keys(sig):
+                for entry_id in self._buckets[band].get(key, ()):
+                    if entry_id in seen:
+                        continue
+                    seen.add(entry_id)
+                    dist = hamming(sig, self._signatures[entry_id])
+                    if dist <= self.max_hamming and (best is None or dist < best[1]):
+                        best = (entry_id, dist)
+
+            if best is None:
+                return None
+
+            entry_id, dist = best
+            self._payloads.move_to_end(entry_id)
+            analysis, dates, numbers, anchors = self._payloads[entry_id]
+            similarity = 1 - dist / SIGNATURE_BITS
+            return entry_id, similarity, dict(analysis), list(dates), list(numbers), dict(anchors)
+
+    # ---------------------------------------------------------
+    # REUSE
+    # ---------------------------------------------------------
+
+    def reuse(self, email_text: str) -> Tuple[int, float, Dict[str, Any]] | None:
+        """
+        Find a near-duplicate and adapt its analysis to this email:
+        - dates that differ are re-extracted via parse_date_safe and
+          substituted in requested_due_date / agreement_reference.date
+        - urgency is recomputed when it was date-driven
+        - figures that differ are substituted in cached questions
+        - a party name absent from this email is re-found in its
+          template slot and replaced in parties and questions
+
+        A match is rejected (None) when the dates or figures cannot be
+        aligned one-to-one, a missing party name cannot be re-found, or
+        a cached question still mentions a number or date this email
+        does not contain.
+        """
+        found = self.find(email_text)
+        if found is None:
+            return None
+
+        entry_id, similarity, analysis, old_dates, old_numbers, anchors = found
+        cleaned = clean_text(email_text)
+        new_dates = [iso for _raw, iso in find_date_mentions(cleaned)]
+
+        adapted = _adapt_analysis(analysis, old_dates, new_dates, old_numbers, anchors, cleaned)
+        with self._lock:
+            if adapted is None:
+                self.stats["rejected"] += 1
+                return None
+            self.stats["hits"] += 1
+        return entry_id, similarity, adapted
+
+
+def _adapt_analysis(
+    analysis: Dict[str, Any],
+    old_dates: List[str],
+    new_dates: List[str],
+    old_numbers: List[str],
+    anchors: Dict[str, Tuple[str, str]],
+    email_text: str,
+) -> Dict[str, Any] | None:
+    """Re-extract differing dates, figures and party names; None if they do not fit."""
+    mapping = _align(old_dates, new_dates)
+    if mapping is None:
+        return None
+
+    figures = _align(old_numbers, number_tokens(email_text))
+    if figures is None:
+        return None
+    figures = {old: new for old, new in figures.items() if new.replace(",", "") != old}
+
+    lowered = email_text.lower()
+    renames: Dict[str, str] = {}
+    for name in (analysis.get("parties") or {}).values():
+        if name and name.lower() not in lowered:
+            new_name = _refind_party(email_text, anchors.get(name))
+            if new_name is None:
+                return None
+            renames[name] = new_name
+
+    questions = []
+    for question in analysis.get("questions") or []:
+        for old, new in renames.items():
+            question = question.replace(old, new)
+        questions.append(_replace_figures(question, figures))
+
+    # Questions are otherwise reused verbatim: their details must still hold
+    email_numbers = set(number_mentions(email_text))
+    for question in questions:
+        if not set(number_mentions(question)) <= email_numbers:
+            return None
+        if any(iso not in new_dates for _raw, iso in find_date_mentions(question)):
+            return None
+
+    adapted = dict(analysis)
+    if analysis.get("questions"):
+        adapted["questions"] = questions
+    if renames:
+        adapted["parties"] = {
+            role: renames.get(name, name) for role, name in analysis["parties"].items()
+        }
+
+    old_due = parse_date_safe(analysis.get("requested_due_date"))
+    new_due = mapping.get(old_due, old_due) if old_due else None
+    if new_due != old_due:
+        adapted["requested_due_date"] = new_due
+        # Only recompute urgency the LLM derived from the date itself;
+        # phrase-driven urgency ("ASAP") is shared by the template.
+        if analysis.get("urgency_level") == compute_urgency(old_due):
+            adapted["urgency_level"] = compute_urgency(new_due)
+
+    agreement = dict(analysis.get("agreement_reference") or {})
+    old_agreement_date = parse_date_safe(agreement.get("date"))
+    if old_agreement_date in mapping:
+        agreement["date"] = mapping[old_agreement_date]
+        adapted["agreement_reference"] = agreement
+
+    return adapted
+
+
+def _align(old: List[str], new: List[str]) -> Dict[str, str] | None:
+    """Positional old → new mapping; None if counts differ or it is not one-to-one."""
+    if len(old) != len(new):
+        return None
+    mapping: Dict[str, str] = {}
+    for a, b in zip(old, new):
+        if mapping.setdefault(a, b) != b:
+            return None
+    return mapping
+
+
+def _refind_party(email_text: str, anchor: Tuple[str, str] | None) -> str | None:
+    """The name between a party's anchor words in this email, or None."""
+    if anchor is None:
+        return None
+    before, after = (r"\s+".join(map(re.escape, words.split())) for words in anchor)
+    pattern = (rf"{before}\s+" if before else r"^\s*") + r"(\S.*?)" + (
+        rf"\s*{after}" if after else r"\s*$"
+    )
+    match = re.search(pattern, email_text, re.IGNORECASE | re.MULTILINE)
+    if match is None:
+        return None
+    name = match.group(1).strip()
+    if not name or len(name.split()) > PARTY_NAME_MAX_WORDS:
+        return None
+    return name
+
+
+def _replace_figures(text: str, figures: Dict[str, str]) -> str:
+    """Swap changed figures (normalised old → new as written), leaving dates alone."""
+    if not figures:
+        return text
+    dates = [raw for raw, _iso in find_date_mentions(text)]
+    parts = re.split("(" + "|".join(map(re.escape, dates)) + ")", text) if dates else [text]
+    return "".join(
+        part if i % 2 else _NUMBER_RE.sub(
+            lambda m: figures.get(m.group().replace(",", ""), m.group()), part
+        )
+        for i, part in enumerate(parts)
+    )
@@ -3,10 +3,11 @@ PURE LLM EMAIL PARSER (Assignment-Compliant)
 Extracts clean structural components without regex logic.
 """
 
-import json
 import textwrap
 from google import genai
 from core.config import settings
+from modules.model_router import route, timed
+from utils.json_utils import extract_json_object
 from utils.text_utils import clean_text
 
 client = genai.Client(api_key=settings.GEMINI_API_KEY)
@@ -48,28 +49,30 @@ def parse_email(email_text: str) -> dict:
     {email_text}
     """)
 
-    response = client.models.generate_content(
-        model=settings.GEMINI_MODEL,
-        contents=[prompt]
-    )
+    decision = route("parse", email_text)
+    with timed(decision):
+        response = client.models.generate_content(
+            model=decision["model"],
+            contents=[prompt]
+        )
 
     raw = response.text.strip()
 
-    # Extract JSON strictly
-    try:
-        start = raw.index("{")
-        end = raw.rindex("}") + 1
-        parsed = json.loads(raw[start:end])
-    except:
-        return {
-            "subject": None,
-            "greeting": None,
-            "body": email_text,
-            "signature_text": None,
-            "sender_name": None,
-            "sender_role": None,
-            "questions": []
-        }
+    defaults = {
+        "subject": None,
+        "greeting": None,
+        "body": email_text,
+        "signature_text": None,
+        "sender_name": None,
+        "sender_role": None,
+        "questions": []
+    }
 
+    # Tolerant extraction; partial output keeps whatever was recovered
+    parsed, _repairs = extract_json_object(raw)
+    if parsed is None:
+        return defaults
+
+    parsed = {**defaults, **{k: v for k, v in parsed.items() if v is not None}}
     parsed["body"] = clean_text(parsed.get("body", ""))
     return parsed
@@ -0,0 +1,326 @@
+"""
+PromptPrefixCache
+
+Registers a static prompt prefix (drafter instructions + rendered clause
+block) ONCE with the provider's cached-content facility, so later calls
+send only their dynamic suffix (email + analysis).
+
+Entries are keyed by model + prefix hash (the prefix embeds the clause
+set, so one entry per clause set per model) and track their expiry.
+An entry is refreshed when it is within `refresh_margin_seconds` of
+expiring; a prefix the provider refuses to cache (e.g. below its minimum
+token count) is remembered for a TTL and callers fall back to the full
+prompt. Any other create failure only backs off for `retry_seconds`.
+Provider calls run outside the cache lock (one in-flight call per key)
+and the number of tracked entries is bounded.
+
+Generation falls back (returns None) only when the named cache is gone
+(CacheMissError); every other provider error — timeouts, 5xx, safety
+blocks — is raised to the caller, so it never turns into a second
+billed call.
+
+Backends:
+- GeminiCacheBackend → google-genai `client.caches`
+- LocalCacheBackend  → in-process stand-in (tests / offline)
+"""
+
+import hashlib
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Tuple
+
+
+class CacheMissError(LookupError):
+    """The named cache no longer exists (expired or dropped by the provider)."""
+
+
+class PrefixRejectedError(ValueError):
+    """The provider refuses to cache this prefix (e.g. below its minimum size)."""
+
+
+# ============================================================
+# BACKENDS
+# ============================================================
+
+def _is_missing_cache(error: Exception) -> bool:
+    """A provider error saying the cached content is gone (404 / expired)."""
+    code = getattr(error, "code", None)
+    message = str(getattr(error, "message", None) or error).lower()
+    return code == 404 or (code in (400, 403) and "expired" in message)
+
+
+class GeminiCacheBackend:
+    """Gemini explicit context caching."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def create(self, model: str, prefix: str, ttl_seconds: int) -> str:
+        from google.genai import errors, types
+
+        try:
+            cache = self.client.caches.create(
+                model=model,
+                config=types.CreateCachedContentConfig(
+                    contents=[prefix],
+                    ttl=f"{ttl_seconds}s",
+                    display_name="drafter-prefix",
+                ),
+            )
+        except errors.ClientError as e:
+            if e.code == 400:
+                raise PrefixRejectedError(str(e)) from e
+            raise
+        return cache.name
+
+    def extend(self, name: str, ttl_seconds: int) -> None:
+        from google.genai import errors, types
+
+        try:
+            self.client.caches.update(
+                name=name,
+                config=types.UpdateCachedContentConfig(ttl=f"{ttl_seconds}s"),
+            )
+        except errors.ClientError as e:
+            if _is_missing_cache(e):
+                raise CacheMissError(name) from e
+            raise
+
+    def delete(self, name: str) -> None:
+        self.client.caches.delete(name=name)
+
+    def generate(self, model: str, name: str, suffix: str) -> str:
+        from google.genai import errors, types
+
+        try:
+            resp = self.client.models.generate_content(
+                model=model,
+                contents=[suffix],
+                config=types.GenerateContentConfig(cached_content=name),
+            )
+        except errors.ClientError as e:
+            if _is_missing_cache(e):
+                raise CacheMissError(name) from e
+            raise
+        return resp.text
+
+
+class LocalCacheBackend:
+    """
+    In-process stand-in: keeps the prefix locally and sends
+    prefix + suffix through `generate_fn(model, prompt)`.
+    Prefixes past their TTL are dropped, like provider caches.
+    """
+
+    def __init__(self, generate_fn: Callable[[str, str], str]):
+        self.generate_fn = generate_fn
+        self._prefixes: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, model: str, prefix: str, ttl_seconds: int) -> str:
+        name = f"local/{uuid.uuid4().hex}"
+        now = time.time()
+        with self._lock:
+            for old in [n for n, (_p, exp) in self._prefixes.items() if exp <= now]:
+                del self._prefixes[old]
+            self._prefixes[name] = (prefix, now + ttl_seconds)
+        return name
+
+    def extend(self, name: str, ttl_seconds: int) -> None:
+        with self._lock:
+            prefix = self._live_prefix(name)
+            self._prefixes[name] = (prefix, time.time() + ttl_seconds)
+
+    def delete(self, name: str) -> None:
+        with self._lock:
+            self._prefixes.pop(name, None)
+
+    def generate(self, model: str, name: str, suffix: str) -> str:
+        with self._lock:
+            prefix = self._live_prefix(name)
+        return self.generate_fn(model, prefix + suffix)
+
+    def _live_prefix(self, name: str) -> str:
+        """Prefix of an unexpired cache (lock held). Raises CacheMissError."""
+        prefix, expires_at = self._prefixes.get(name, (None, 0.0))
+        if prefix is None or expires_at <= time.time():
+            self._prefixes.pop(name, None)
+            raise CacheMissError(name)
+        return prefix
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+class PromptPrefixCache:
+    """
+    key → { name, expires_at } for registered prefixes,
+    plus key → retry_at for prefixes that could not be cached (refused:
+    one TTL; failed otherwise: `retry_seconds`).
+
+    Provider round trips (create / extend / delete) never run under the
+    shared lock: one caller per key does the create or refresh while
+    others wait on its in-flight event — or, during a refresh, keep
+    using the still-valid entry. Expired entries are pruned and at most
+    `max_entries` are kept (soonest-expiring dropped first).
+    """
+
+    def __init__(
+        self,
+        backend,
+        ttl_seconds: int = 3600,
+        refresh_margin_seconds: int = 300,
+        max_entries: int = 256,
+        retry_seconds: int = 30,
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.max_entries = max_entries
+        self.retry_seconds = retry_seconds
+
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._uncacheable: Dict[str, float] = {}
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "hits": 0,
+            "created": 0,
+            "refreshed": 0,
+            "fallbacks": 0,
+            "evicted": 0,
+            "create_errors": 0,
+        }
+
+    @staticmethod
+    def make_key(model: str, prefix: str) -> str:
+        digest = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        return f"{model}:{digest}"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def generate(self, model: str, prefix: str, suffix: str) -> str | None:
+        """
+        Generate with `prefix` served from the cache.
+        Returns None when the prefix cannot be cached or its cache is
+        gone — the caller should then send the full prompt itself.
+        Other provider errors are raised.
+        """
+        name = self._ensure(model, prefix)
+        if name is None:
+            return None
+
+        try:
+            return self.backend.generate(model, name, suffix)
+        except CacheMissError:
+            # Provider dropped the cache early; forget it and fall back
+            with self._lock:
+                entry = self._entries.get(self.make_key(model, prefix))
+                if entry and entry["name"] == name:
+                    del self._entries[self.make_key(model, prefix)]
+                self.stats["fallbacks"] += 1
+            return None
+
+    # ---------------------------------------------------------
+    # INTERNALS
+    # ---------------------------------------------------------
+
+    def _ensure(self, model: str, prefix: str) -> str | None:
+        """Return a live cache name for the prefix, creating/refreshing it."""
+        key = self.make_key(model, prefix)
+
+        while True:
+            now = time.time()
+            with self._lock:
+                if self._uncacheable.get(key, 0) > now:
+                    self.stats["fallbacks"] += 1
+                    return None
+
+                entry = self._entries.get(key)
+                if entry and now < entry["expires_at"] - self.refresh_margin_seconds:
+                    self.stats["hits"] += 1
+                    return entry["name"]
+
+                event = self._inflight.get(key)
+                if event is None:
+                    # This caller does the provider round trip for the key
+                    event = self._inflight[key] = threading.Event()
+                    break
+
+                if entry and now < entry["expires_at"]:
+                    # Being refreshed by another caller; still valid meanwhile
+                    self.stats["hits"] += 1
+                    return entry["name"]
+
+            event.wait()
+
+        try:
+            return self._refresh_or_create(key, model, prefix, entry, now)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+
+    def _refresh_or_create(self, key: str, model: str, prefix: str, entry, now: float) -> str | None:
+        if entry and now < entry["expires_at"]:
+            try:
+                self.backend.extend(entry["name"], self.ttl_seconds)
+                with self._lock:
+                    entry["expires_at"] = now + self.ttl_seconds
+                    self._entries[key] = entry
+                    self.stats["refreshed"] += 1
+                return entry["name"]
+            except CacheMissError:
+                pass  # gone already: re-create
+            except Exception:
+                return entry["name"]    # still valid; the next call retries the refresh
+
+        try:
+            name = self.backend.create(model, prefix, self.ttl_seconds)
+        except Exception as e:
+            # Do not retry on every call: a refused prefix for a TTL,
+            # a transient failure for a short backoff
+            refused = isinstance(e, PrefixRejectedError)
+            with self._lock:
+                self._entries.pop(key, None)
+                self._uncacheable[key] = now + (self.ttl_seconds if refused else self.retry_seconds)
+                self.stats["fallbacks"] += 1
+                if not refused:
+                    self.stats["create_errors"] += 1
+                self._prune(now)
+            return None
+
+        with self._lock:
+            self._entries[key] = {"name": name, "expires_at": now + self.ttl_seconds}
+            self.stats["created"] += 1
+            evicted = self._prune(now)
+
+        # Replaced or evicted live caches are released (best effort)
+        if entry and entry["name"] != name:
+            evicted.append(entry["name"])
+        for old_name in evicted:
+            try:
+                self.backend.delete(old_name)
+            except Exception:
+                pass
+        return name
+
+    def _prune(self, now: float) -> list:
+        """Drop expired / surplus entries (lock held). Returns live names evicted."""
+        for key in [k for k, retry_at in self._uncacheable.items() if retry_at <= now]:
+            del self._uncacheable[key]
+        for key in [k for k, e in self._entries.items() if e["expires_at"] <= now]:
+            del self._entries[key]
+
+        evicted = []
+        while len(self._entries) > self.max_entries:
+            key = min(self._entries, key=lambda k: self._entries[k]["expires_at"])
+            evicted.append(self._entries.pop(key)["name"])
+            self.stats["evicted"] += 1
+        while len(self._uncacheable) > self.max_entries:
+            del self._uncacheable[min(self._uncacheable, key=self._uncacheable.get)]
+        return evicted
@@ -0,0 +1,146 @@
+"""
+SessionStore
+
+Server-side state of one analyze → draft workflow, so the client does
+not re-upload the email, analysis and contract on every step:
+
+    session_id → {
+        email_text      (cleaned),
+        analysis        (latest, incl. applied patches),
+        contract_store  (ContractStore, parsed once) | None,
+        expires_at, size
+    }
+
+Sessions expire `ttl_seconds` after last use. When over `max_sessions`
+or `max_bytes` (approximate text size), least recently used sessions
+are evicted first.
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict
+
+from modules.contract_store import ContractStore
+from utils.text_utils import clean_text
+
+
+class SessionNotFoundError(LookupError):
+    """Unknown or expired session id."""
+
+
+class SessionStore:
+
+    def __init__(self, ttl_seconds: int = 1800, max_sessions: int = 1000, max_bytes: int = 50_000_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------
+    # CRUD
+    # ---------------------------------------------------------
+
+    def create(
+        self,
+        email_text: str,
+        analysis: Dict[str, Any],
+        contract_text: str | None = None,
+        contract_store: ContractStore | None = None,
+    ) -> str:
+        """Open a session; the contract is a ready store, or text parsed once."""
+        if contract_store is None and contract_text:
+            contract_store = ContractStore(contract_text)
+        session_id = uuid.uuid4().hex
+        session = {
+            "email_text": clean_text(email_text),
+            "analysis": dict(analysis),
+            "contract_store": contract_store,
+        }
+        with self._lock:
+            self._store(session_id, session)
+        return session_id
+
+    def get(self, session_id: str) -> Dict[str, Any]:
+        """Return the session (sliding TTL). Raises SessionNotFoundError."""
+        with self._lock:
+            self._evict_expired()
+            session = self._sessions.get(session_id)
+            if session is None:
+                raise SessionNotFoundError(session_id)
+            session["expires_at"] = time.time() + self.ttl_seconds
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def update(
+        self,
+        session_id: str,
+        analysis: Dict[str, Any] | None = None,
+        contract_text: str | None = None,
+        contract_store: ContractStore | None = None,
+    ) -> Dict[str, Any]:
+        """Replace the analysis and/or the contract (parsed text or a ready store)."""
+        with self._lock:
+            self._evict_expired()
+            session = self._sessions.get(session_id)
+            if session is None:
+                raise SessionNotFoundError(session_id)
+            self._bytes -= session["size"]
+            if analysis is not None:
+                session["analysis"] = dict(analysis)
+            if contract_store is not None:
+                session["contract_store"] = contract_store
+            elif contract_text:
+                session["contract_store"] = ContractStore(contract_text)
+            self._store(session_id, session)
+            return session
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._bytes -= session["size"]
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    # ---------------------------------------------------------
+    # INTERNALS (lock held)
+    # ---------------------------------------------------------
+
+    def _store(self, session_id: str, session: Dict[str, Any]) -> None:
+        session["size"] = _approx_size(session)
+        session["expires_at"] = time.time() + self.ttl_seconds
+        self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        self._bytes += session["size"]
+
+        self._evict_expired()
+        while self._sessions and (
+            len(self._sessions) > self.max_sessions or self._bytes > self.max_bytes
+        ):
+            _sid, old = self._sessions.popitem(last=False)
+            self._bytes -= old["size"]
+
+    def _evict_expired(self) -> None:
+        now = time.time()
+        # Sessions are in last-used order, so expired ones sit at the front
+        while self._sessions:
+            sid, session = next(iter(self._sessions.items()))
+            if session["expires_at"] > now:
+                break
+            del self._sessions[sid]
+            self._bytes -= session["size"]
+
+
+def _approx_size(session: Dict[str, Any]) -> int:
+    size = len(session["email_text"]) + len(json.dumps(session["analysis"], ensure_ascii=False))
+    store = session.get("contract_store")
+    if store is not None:
+        size += sum(len(cid) + len(text) for cid, text in store.get_all_clauses().items())
+    return size
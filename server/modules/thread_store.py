@@ -0,0 +1,150 @@
+"""
+ThreadStore
+
+In-memory record of email threads already analysed, so a reply only
+needs its NEW text sent to the LLM.
+
+A thread is found by:
+1. Message-ID / In-Reply-To / References headers (exact)
+2. Fingerprints of quoted history lines matching lines we have
+   already seen in that thread (for clients that strip headers)
+
+Fingerprint matching is deliberately strict, since a false match
+merges another matter's analysis into this one:
+- lines recorded by more than one thread (confidentiality footers,
+  firm signature blocks) are ignored entirely
+- at least MIN_QUOTED_MATCHES distinctive lines must match, AND
+- they must make up MIN_QUOTED_SHARE of the substantial quoted lines
+
+Each thread keeps the merged AnalysisSchema dict of everything
+seen so far. Oldest threads are evicted past `max_threads`.
+"""
+
+import threading
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Set
+
+from utils.thread_utils import line_fingerprints
+
+
+# Quoted lines that must match before we trust a fingerprint link
+MIN_QUOTED_MATCHES = 2
+
+# ... and the share of all substantial quoted lines they must cover
+MIN_QUOTED_SHARE = 0.5
+
+
+class ThreadStore:
+    """
+    Thread-id → { analysis, message_ids, fingerprints, message_count }
+    with header and fingerprint lookup maps.
+    """
+
+    def __init__(self, max_threads: int = 1000):
+        self.max_threads = max_threads
+        self._threads: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._by_message_id: Dict[str, str] = {}
+        # fingerprint → threads that recorded it (more than one = boilerplate)
+        self._by_fingerprint: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------
+    # LOOKUP
+    # ---------------------------------------------------------
+
+    def find_thread(self, headers: Dict[str, List[str]], quoted_text: str) -> str | None:
+        """
+        Return the id of the thread this message replies to, or None.
+        Headers are checked first; quoted-line fingerprints second.
+        """
+        with self._lock:
+            for mid in headers.get("in_reply_to", []) + headers.get("references", []):
+                tid = self._by_message_id.get(mid)
+                if tid in self._threads:
+                    self._threads.move_to_end(tid)
+                    return tid
+
+            prints = line_fingerprints(quoted_text)
+            if not prints:
+                return None
+
+            votes = Counter(
+                next(iter(tids))
+                for tids in (self._by_fingerprint.get(fp) for fp in prints)
+                if tids and len(tids) == 1
+            )
+            if not votes:
+                return None
+
+            tid, hits = votes.most_common(1)[0]
+            if (
+                tid in self._threads
+                and hits >= MIN_QUOTED_MATCHES
+                and hits / len(prints) >= MIN_QUOTED_SHARE
+            ):
+                self._threads.move_to_end(tid)
+                return tid
+            return None
+
+    def get_analysis(self, thread_id: str) -> Dict[str, Any] | None:
+        with self._lock:
+            thread = self._threads.get(thread_id)
+            return dict(thread["analysis"]) if thread else None
+
+    # ---------------------------------------------------------
+    # RECORDING
+    # ---------------------------------------------------------
+
+    def record(
+        self,
+        thread_id: str | None,
+        headers: Dict[str, List[str]],
+        new_text: str,
+        analysis: Dict[str, Any],
+    ) -> str:
+        """
+        Store the (merged) analysis for a thread and index the new
+        message's id and text fingerprints. Creates the thread when
+        `thread_id` is None. Returns the thread id.
+        """
+        with self._lock:
+            if thread_id is None or thread_id not in self._threads:
+                thread_id = uuid.uuid4().hex
+                self._threads[thread_id] = {
+                    "analysis": {},
+                    "message_ids": set(),
+                    "fingerprints": set(),
+                    "message_count": 0,
+                }
+
+            thread = self._threads[thread_id]
+            thread["analysis"] = dict(analysis)
+            thread["message_count"] += 1
+
+            for mid in headers.get("message_id", []):
+                thread["message_ids"].add(mid)
+                self._by_message_id[mid] = thread_id
+
+            prints: Set[str] = line_fingerprints(new_text)
+            thread["fingerprints"].update(prints)
+            for fp in prints:
+                self._by_fingerprint.setdefault(fp, set()).add(thread_id)
+
+            self._threads.move_to_end(thread_id)
+            self._evict()
+            return thread_id
+
+    def _evict(self):
+        """Drop least recently used threads and their lookup entries."""
+        while len(self._threads) > self.max_threads:
+            tid, thread = self._threads.popitem(last=False)
+            for mid in thread["message_ids"]:
+                if self._by_message_id.get(mid) == tid:
+                    del self._by_message_id[mid]
+            for fp in thread["fingerprints"]:
+                tids = self._by_fingerprint.get(fp)
+                if tids is not None:
+                    tids.discard(tid)
+                    if not tids:
+                        del self._by_fingerprint[fp]
@@ -4,29 +4,54 @@ FastAPI Route: POST /analyze
 Uses the analyzer_service to:
 - Parse + analyze a raw legal email
 - Return structured JSON defined by AnalysisSchema
+- Optionally start a speculative draft in the background
+- Open a workflow session (id in the X-Session-Id header)
+- Or, with defer_if_low_urgency and nothing pressing in the email,
+  queue it as a batch job instead (202, poll GET /jobs/{id})
 """
 
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from models.request_models import AnalyzeRequest
+from modules.contract_registry import ContractNotFoundError
 from services.analyzer_service import analyze_email_service
+from services.contract_service import resolve_optional_contract_store
+from services.job_service import is_low_urgency_email, submit_analyze_job
+from services.session_service import create_session
+from services.speculative_service import schedule_speculative_draft
 
 router = APIRouter()
 
 
 @router.post("/", summary="Analyze legal email", description="Parse and analyze a raw legal email.")
-async def analyze_email_endpoint(payload: AnalyzeRequest):
+async def analyze_email_endpoint(payload: AnalyzeRequest, response: Response):
     """
     POST /analyze
     Body:
         {
-            "email_text": "raw email text ..."
+            "email_text": "raw email text ...",
+            "contract_text" | "contract_id": "..." (optional)
         }
     Response:
         { JSON analysis }
+    Headers:
+        X-Session-Id: session holding email + analysis for /draft
+    Deferred:
+        202 { "job_id": "...", "status": "queued", ... }
     """
     try:
+        if payload.defer_if_low_urgency and is_low_urgency_email(payload.email_text):
+            response.status_code = 202
+            return await submit_analyze_job(payload.email_text, reason="low_urgency")
+
+        store = resolve_optional_contract_store(payload.contract_text, payload.contract_id)
         result = await analyze_email_service(payload.email_text)
+        schedule_speculative_draft(payload.email_text, result, store)
+        response.headers["X-Session-Id"] = create_session(
+            payload.email_text, result, contract_store=store
+        )
         return result
+    except ContractNotFoundError:
+        raise HTTPException(status_code=404, detail="Contract not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,53 @@
+"""
+FastAPI Routes: /contracts
+
+- POST /contracts/                   → register a contract once, get its id
+- GET  /contracts/{id}               → metadata (name, version, clause count)
+- GET  /contracts/{id}/search?q=...  → clauses ranked by the precompiled index
+
+Drafts then send `contract_id` instead of the full contract text.
+"""
+
+
+from fastapi import APIRouter, HTTPException
+from models.request_models import ContractUploadRequest
+from modules.contract_registry import ContractNotFoundError, EmptyContractError
+from services.contract_service import contract_registry, register_contract_service
+
+router = APIRouter()
+
+
+@router.post("/", status_code=201, summary="Register contract", description="Parse and store a contract; returns its content-hash id.")
+async def register_contract_endpoint(payload: ContractUploadRequest):
+    """
+    POST /contracts
+    Body:
+        { "contract_text": "...", "name": "Acme MSA" }
+    Response:
+        { "contract_id": "...", "version": 1, "clause_count": 4, ... }
+    """
+    try:
+        return await register_contract_service(payload.contract_text, payload.name)
+    except EmptyContractError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{contract_id}", summary="Contract metadata")
+async def get_contract_endpoint(contract_id: str):
+    try:
+        meta = contract_registry.get_metadata(contract_id)
+        clauses = contract_registry.get_store(contract_id).get_all_clauses()
+    except ContractNotFoundError:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    return dict(meta, clause_ids=list(clauses))
+
+
+@router.get("/{contract_id}/search", summary="Search contract clauses")
+async def search_contract_endpoint(contract_id: str, q: str):
+    try:
+        store = contract_registry.get_store(contract_id)
+    except ContractNotFoundError:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    return [{"clause_id": cid, "text": text} for cid, text in store.search_clauses(q)]
@@ -0,0 +1,39 @@
+"""
+FastAPI Routes: /debug (mounted only when profiling is enabled)
+
+- GET /debug/profiles/{id}         → span timeline JSON of a profiled request
+- GET /debug/profiles/{id}.folded  → sampled stacks in folded format
+                                     (flamegraph.pl / speedscope compatible)
+"""
+
+
+import re
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from services.profiling_service import profile_paths
+
+router = APIRouter()
+
+_PROFILE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _paths(profile_id: str):
+    if not _PROFILE_ID_RE.match(profile_id):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    folded_path, spans_path = profile_paths(profile_id)
+    if not spans_path.exists():
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return folded_path, spans_path
+
+
+@router.get("/profiles/{profile_id}.folded", summary="Flamegraph stacks")
+async def profile_folded_endpoint(profile_id: str):
+    folded_path, _ = _paths(profile_id)
+    return FileResponse(folded_path, media_type="text/plain")
+
+
+@router.get("/profiles/{profile_id}", summary="Span timeline")
+async def profile_timeline_endpoint(profile_id: str):
+    _, spans_path = _paths(profile_id)
+    return FileResponse(spans_path, media_type="application/json")
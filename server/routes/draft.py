@@ -5,21 +5,30 @@ Inputs:
 - raw email text
 - analysis JSON from /analyze
 - contract snippet
+(or a session id from /analyze plus an optional analysis patch)
 
 Returns:
 - fully drafted legal reply email
+- or, with defer_if_low_urgency and a low-urgency analysis,
+  202 + a queued batch job (poll GET /jobs/{id})
 """
 
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from models.request_models import DraftRequest
+from modules.contract_registry import ContractNotFoundError
+from modules.contract_store import ContractStore
+from modules.session_store import SessionNotFoundError
+from services.contract_service import resolve_contract_store
 from services.drafting_service import draft_reply_service
+from services.job_service import is_low_urgency_analysis, submit_draft_job
+from services.session_service import prepare_session_draft
 
 router = APIRouter()
 
 
 @router.post("/", summary="Draft legal reply", description="Draft the reply email using JSON analysis + contract snippet.")
-async def draft_email_endpoint(payload: DraftRequest):
+async def draft_email_endpoint(payload: DraftRequest, response: Response):
     """
     POST /draft
     Body:
@@ -27,18 +36,50 @@ async def draft_email_endpoint(payload: DraftRequest):
             "email_text": "...",
             "analysis": { ... JSON ... },
             "contract_text": "Clause 9.1 ... Clause 9.2 ..."
+                (or "contract_id": "<id from POST /contracts>")
+        }
+        or, after /analyze:
+        {
+            "session_id": "...",
+            "analysis_patch": { ... optional edits ... }
         }
     Response:
         {
             "draft": "Dear Ms. Sharma,..."
         }
+        or 202 { "job_id": "...", "status": "queued", ... } when deferred
     """
     try:
+        if payload.session_id:
+            session = prepare_session_draft(
+                session_id=payload.session_id,
+                analysis_patch=payload.analysis_patch,
+                contract_text=payload.contract_text,
+                contract_id=payload.contract_id
+            )
+            email_text = session["email_text"]
+            analysis = session["analysis"]
+            store = session["contract_store"] or ContractStore(None)
+        else:
+            email_text = payload.email_text
+            analysis = payload.analysis
+            store = resolve_contract_store(payload.contract_text, payload.contract_id)
+
+        if payload.defer_if_low_urgency and is_low_urgency_analysis(analysis):
+            response.status_code = 202
+            return await submit_draft_job(
+                email_text, analysis, store.get_all_clauses(), reason="low_urgency"
+            )
+
         draft_text = await draft_reply_service(
-            email_text=payload.email_text,
-            analysis=payload.analysis,
-            contract_text=payload.contract_text
+            email_text=email_text,
+            analysis=analysis,
+            store=store
         )
         return {"draft": draft_text}
+    except SessionNotFoundError:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    except ContractNotFoundError:
+        raise HTTPException(status_code=404, detail="Contract not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,57 @@
+"""
+FastAPI Routes: /jobs
+
+Deferred (batch) processing for work that does not need an immediate
+answer:
+
+- POST /jobs/          → queue an analyze or draft job (202)
+- GET  /jobs/{job_id}  → status and, once done, the result
+
+Jobs run in the next off-peak batch; results are also audit-logged.
+"""
+
+
+from fastapi import APIRouter, HTTPException
+from models.request_models import JobSubmitRequest
+from modules.contract_registry import ContractNotFoundError
+from modules.job_queue import JobNotFoundError
+from services.contract_service import resolve_contract_store
+from services.job_service import get_job, submit_analyze_job, submit_draft_job
+
+router = APIRouter()
+
+
+@router.post("/", status_code=202, summary="Submit deferred job", description="Queue analysis or drafting for the next batch.")
+async def submit_job_endpoint(payload: JobSubmitRequest):
+    """
+    POST /jobs
+    Body:
+        { "kind": "analyze", "email_text": "..." }
+        { "kind": "draft", "email_text": "...", "analysis": {...},
+          "contract_text": "..." | "contract_id": "..." }
+    Response:
+        { "job_id": "...", "status": "queued", ... }
+    """
+    try:
+        if payload.kind == "analyze":
+            return await submit_analyze_job(payload.email_text)
+
+        store = resolve_contract_store(payload.contract_text, payload.contract_id)
+        return await submit_draft_job(payload.email_text, payload.analysis, store.get_all_clauses())
+    except ContractNotFoundError:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{job_id}", summary="Get deferred job")
+async def get_job_endpoint(job_id: str):
+    """
+    Response:
+        { "job_id", "kind", "status": "queued|running|done|failed",
+          "result": { "analysis": {...} } | { "draft": "..." } | null, ... }
+    """
+    try:
+        return await get_job(job_id)
+    except JobNotFoundError:
+        raise HTTPException(status_code=404, detail="Job not found")
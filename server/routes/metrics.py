@@ -0,0 +1,35 @@
+"""
+FastAPI Route: GET /metrics
+
+Process-level counters for the optimisation layers:
+- json_repair      → LLM outputs parsed clean / repaired / failed
+                     (`repaired` = round trips saved)
+- near_duplicate   → templated-email reuse lookups and hits
+- prompt_cache     → drafter prefix cache hits / creations / refreshes
+- speculative_draft → background drafts launched / claimed (hit rate) / cancelled
+- model_routing    → calls and latency per task:tier
+- job_queue        → deferred jobs per status, batch worker counters
+"""
+
+
+from fastapi import APIRouter
+from modules.drafter import prompt_cache
+from modules.model_router import get_routing_stats
+from services.analyzer_service import near_duplicate_index
+from services.job_service import get_job_stats
+from services.speculative_service import speculative_drafter
+from utils.json_utils import get_repair_stats
+
+router = APIRouter()
+
+
+@router.get("/", summary="Service metrics", description="Counters since process start.")
+async def metrics_endpoint():
+    return {
+        "json_repair": get_repair_stats(),
+        "near_duplicate": dict(near_duplicate_index.stats, entries=len(near_duplicate_index)),
+        "prompt_cache": dict(prompt_cache.stats),
+        "speculative_draft": speculative_drafter.snapshot(),
+        "model_routing": get_routing_stats(),
+        "job_queue": get_job_stats(),
+    }
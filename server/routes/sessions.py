@@ -0,0 +1,109 @@
+"""
+FastAPI Routes: /sessions
+
+- GET    /sessions/{id}  → current analysis + session info
+- DELETE /sessions/{id}  → drop a session early
+- WS     /sessions/ws    → step-by-step workflow over one connection
+
+WebSocket messages (JSON):
+    → { "action": "analyze", "email_text": "...", "contract_text" | "contract_id": "..."? }
+    ← { "type": "analysis", "session_id": "...", "analysis": {...} }
+
+    → { "action": "resume", "session_id": "..." }
+    ← { "type": "analysis", "session_id": "...", "analysis": {...} }
+
+    → { "action": "draft", "analysis_patch": {...}?, "contract_text" | "contract_id": "..."? }
+    ← { "type": "draft", "session_id": "...", "draft": "..." }
+
+    ← { "type": "error", "detail": "..." }   on any failure
+"""
+
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from modules.contract_registry import ContractNotFoundError
+from modules.session_store import SessionNotFoundError
+from services.analyzer_service import analyze_email_service
+from services.contract_service import resolve_optional_contract_store
+from services.session_service import create_session, draft_session_service, session_store
+from services.speculative_service import schedule_speculative_draft
+
+router = APIRouter()
+
+
+@router.get("/{session_id}", summary="Get workflow session")
+async def get_session_endpoint(session_id: str):
+    try:
+        session = session_store.get(session_id)
+    except SessionNotFoundError:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+
+    return {
+        "session_id": session_id,
+        "analysis": session["analysis"],
+        "has_contract": session["contract_store"] is not None,
+        "expires_at": session["expires_at"],
+    }
+
+
+@router.delete("/{session_id}", summary="Delete workflow session")
+async def delete_session_endpoint(session_id: str):
+    session_store.delete(session_id)
+    return {"deleted": session_id}
+
+
+@router.websocket("/ws")
+async def session_websocket(websocket: WebSocket):
+    await websocket.accept()
+    session_id: str | None = None
+
+    try:
+        while True:
+            message = await websocket.receive_json()
+            action = message.get("action")
+
+            try:
+                if action == "analyze":
+                    email_text = message["email_text"]
+                    store = resolve_optional_contract_store(
+                        message.get("contract_text"), message.get("contract_id")
+                    )
+                    analysis = await analyze_email_service(email_text)
+                    schedule_speculative_draft(email_text, analysis, store)
+                    session_id = create_session(email_text, analysis, contract_store=store)
+                    await websocket.send_json(
+                        {"type": "analysis", "session_id": session_id, "analysis": analysis}
+                    )
+
+                elif action == "resume":
+                    session = session_store.get(message["session_id"])
+                    session_id = message["session_id"]
+                    await websocket.send_json(
+                        {"type": "analysis", "session_id": session_id, "analysis": session["analysis"]}
+                    )
+
+                elif action == "draft":
+                    target = message.get("session_id") or session_id
+                    if not target:
+                        raise SessionNotFoundError("no session: send 'analyze' or 'resume' first")
+                    draft = await draft_session_service(
+                        session_id=target,
+                        analysis_patch=message.get("analysis_patch"),
+                        contract_text=message.get("contract_text"),
+                        contract_id=message.get("contract_id"),
+                    )
+                    await websocket.send_json({"type": "draft", "session_id": target, "draft": draft})
+
+                else:
+                    await websocket.send_json({"type": "error", "detail": f"Unknown action: {action}"})
+
+            except SessionNotFoundError:
+                await websocket.send_json({"type": "error", "detail": "Session not found or expired"})
+            except ContractNotFoundError:
+                await websocket.send_json({"type": "error", "detail": "Contract not found"})
+            except KeyError as e:
+                await websocket.send_json({"type": "error", "detail": f"Missing field: {e}"})
+            except Exception as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+
+    except WebSocketDisconnect:
+        return
@@ -4,10 +4,131 @@ Service layer for running analyze_email().
 Thin abstraction that allows:
 - FastAPI routes
 - LangGraph nodes
+- the deferred batch worker (job_service)
 to reuse the same analysis logic.
+
+Before calling the LLM the service tries, in order:
+1. Thread match  → analyze only the NEW text of a reply and merge it
+                   into the cached thread analysis (ThreadStore)
+2. Near-duplicate → reuse the analysis of a templated email seen
+                    before, with dates re-extracted (NearDuplicateIndex)
+
+plan_analysis() runs those steps and says what (if anything) the LLM
+must still analyze; finish_analysis() records the LLM result. The batch
+worker calls both around its batched LLM calls.
 """
 
+from typing import Any, Dict
+
+from core.config import settings
 from modules.analyzer import analyze_email
+from modules.near_duplicate_index import NearDuplicateIndex
+from modules.thread_store import ThreadStore
+from services.audit_service import write_audit_log
+from utils.analysis_utils import merge_analyses
+from utils.profiling_utils import span
+from utils.thread_utils import (
+    extract_thread_headers,
+    split_new_and_quoted,
+    strip_thread_headers,
+)
+
+
+thread_store = ThreadStore(max_threads=settings.THREAD_STORE_MAX_THREADS)
+
+near_duplicate_index = NearDuplicateIndex(
+    max_hamming=settings.NEAR_DUP_MAX_HAMMING,
+    max_stored_analyses=settings.NEAR_DUP_MAX_STORED_ANALYSES,
+)
+
 
 async def analyze_email_service(email_text: str):
-    return analyze_email(email_text)
+    plan = await plan_analysis(email_text)
+    if plan["analysis"] is not None:
+        return plan["analysis"]
+
+    return finish_analysis(plan, analyze_email(plan["text"]))
+
+
+async def plan_analysis(email_text: str) -> Dict[str, Any]:
+    """
+    Everything that happens before the LLM call.
+
+    - Known thread, no new text → cached thread state, no LLM call
+    - Known thread              → only the new delta must be analyzed
+    - Otherwise                 → the body, unless a near-duplicate's
+                                  analysis can be reused (audit-logged
+                                  with its similarity)
+
+    Returns:
+        {
+            "analysis": finished result (no LLM call needed) | None,
+            "text":     text the LLM must analyze when analysis is None,
+            ...         state used by finish_analysis()
+        }
+    """
+    plan: Dict[str, Any] = {
+        "analysis": None,
+        "text": email_text,
+        "headers": None,
+        "thread_id": None,
+        "previous": None,
+        "index_near_duplicate": settings.NEAR_DUP_ENABLED,
+    }
+
+    if settings.THREAD_TRACKING_ENABLED:
+        with span("thread_lookup"):
+            headers = extract_thread_headers(email_text)
+            body = strip_thread_headers(email_text)
+            new_text, quoted_text = split_new_and_quoted(body)
+
+            thread_id = thread_store.find_thread(headers, quoted_text)
+            previous = thread_store.get_analysis(thread_id) if thread_id else None
+
+        plan.update(text=body, headers=headers)
+        if previous is not None:
+            if not new_text:
+                plan["analysis"] = previous
+            else:
+                plan.update(
+                    text=new_text,
+                    thread_id=thread_id,
+                    previous=previous,
+                    index_near_duplicate=False,
+                )
+            return plan
+
+    if plan["index_near_duplicate"]:
+        with span("near_duplicate_lookup"):
+            reused = near_duplicate_index.reuse(plan["text"])
+        if reused is not None:
+            entry_id, similarity, analysis = reused
+            await write_audit_log({
+                "event": "near_duplicate_hit",
+                "entry_id": entry_id,
+                "similarity": round(similarity, 4),
+                "analysis": analysis,
+            })
+            if plan["headers"] is not None:
+                thread_store.record(None, plan["headers"], plan["text"], analysis)
+            plan["analysis"] = analysis
+
+    return plan
+
+
+def finish_analysis(plan: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Record the LLM analysis of plan["text"]: index it for near-duplicate
+    reuse, merge a reply's delta into its thread, and store the thread
+    state. Returns the analysis to answer with.
+    """
+    if plan["index_near_duplicate"]:
+        with span("near_duplicate_add"):
+            near_duplicate_index.add(plan["text"], analysis)
+
+    if plan["previous"] is not None:
+        analysis = merge_analyses(plan["previous"], analysis)
+
+    if plan["headers"] is not None:
+        thread_store.record(plan["thread_id"], plan["headers"], plan["text"], analysis)
+    return analysis
@@ -15,6 +15,7 @@ from datetime import datetime
 from pathlib import Path
 
 from core.config import settings
+from utils.profiling_utils import span
 
 
 # Ensure log directory exists
@@ -42,7 +43,8 @@ async def write_audit_log(entry: dict) -> None:
 
     # Async safe write
     loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, _write_json, file_path, entry_with_meta)
+    with span("audit_write"):
+        await loop.run_in_executor(None, _write_json, file_path, entry_with_meta)
 
 
 def _write_json(path: Path, data: dict):
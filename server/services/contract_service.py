@@ -0,0 +1,46 @@
+"""
+Service layer for the contract registry.
+
+- register_contract_service() → POST /contracts
+- resolve_contract_store()    → ContractStore for a draft, from a
+                                registered contract_id or raw text
+- resolve_optional_contract_store() → same, None if neither is given
+"""
+
+import asyncio
+
+from core.config import settings
+from modules.contract_registry import ContractRegistry
+from modules.contract_store import ContractStore
+
+
+contract_registry = ContractRegistry(
+    db_path=settings.CONTRACT_REGISTRY_DB_PATH,
+    cache_size=settings.CONTRACT_REGISTRY_CACHE_SIZE,
+    mmap_bytes=settings.CONTRACT_REGISTRY_MMAP_BYTES,
+)
+
+
+async def register_contract_service(contract_text: str, name: str | None = None) -> dict:
+    # SQLite writes are blocking; keep them off the event loop
+    return await asyncio.to_thread(contract_registry.register, contract_text, name)
+
+
+def resolve_contract_store(contract_text: str | None = None, contract_id: str | None = None) -> ContractStore:
+    """
+    Registered contract (by id) wins over raw text.
+    Raises ContractNotFoundError for an unknown id.
+    """
+    if contract_id:
+        return contract_registry.get_store(contract_id)
+    return ContractStore(contract_text)
+
+
+def resolve_optional_contract_store(
+    contract_text: str | None = None,
+    contract_id: str | None = None,
+) -> ContractStore | None:
+    """Like resolve_contract_store, but None when no contract was sent (/analyze)."""
+    if not contract_text and not contract_id:
+        return None
+    return resolve_contract_store(contract_text, contract_id)
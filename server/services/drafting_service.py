@@ -3,14 +3,34 @@ Service wrapper around the deterministic draft generator.
 
 Loads required clauses, calls generate_draft_reply(),
 and returns the final drafted email.
+
+If a speculative draft was started for this exact email + analysis
+(see speculative_service), it is returned instead of a new LLM call.
 """
 
 from modules.drafter import generate_draft_reply
 from modules.contract_store import ContractStore
+from services.contract_service import resolve_contract_store
+from services.speculative_service import speculative_drafter
+from core.config import settings
 
-async def draft_reply_service(email_text: str, analysis: dict, contract_text: str):
-    store = ContractStore(contract_text)
+async def draft_reply_service(
+    email_text: str,
+    analysis: dict,
+    contract_text: str | None = None,
+    store: ContractStore | None = None,
+    contract_id: str | None = None,
+):
+    # A session passes its already-parsed store; otherwise resolve the
+    # registered contract or parse the text
+    store = store or resolve_contract_store(contract_text, contract_id)
     clauses = store.get_all_clauses()
+
+    if settings.SPECULATIVE_DRAFT_ENABLED:
+        draft = await speculative_drafter.claim(email_text, analysis, clauses)
+        if draft is not None:
+            return draft
+
     draft = generate_draft_reply(
         analysis=analysis,
         clauses=clauses,
@@ -0,0 +1,291 @@
+"""
+Deferred bulk processing of low-urgency work.
+
+Low-urgency analyses and drafts do not need interactive latency, so
+instead of competing with urgent requests for synchronous Gemini calls
+they can be queued (JobQueue, SQLite) and drained later in large
+batches through the provider's batch mode:
+
+- explicit       → POST /jobs, poll GET /jobs/{id}
+- automatic      → /analyze or /draft with "defer_if_low_urgency": true
+                   answer 202 + job instead of running the LLM call when
+                   the email / analysis is low urgency
+
+The worker (opt-in: started with the app only if JOB_QUEUE_ENABLED) only
+drains during the off-peak window [JOB_OFF_PEAK_START_HOUR,
+JOB_OFF_PEAK_END_HOUR) (server local time; equal hours = always).
+
+Analyze jobs go through the same preparation as /analyze
+(analyzer_service.plan_analysis): thread and near-duplicate reuse may
+answer them without any LLM call, and long emails become one prompt per
+chunk. Every prompt of the claimed jobs is grouped by model and each
+group submitted as one batch. All batches are then polled together
+(non-blocking) while the claimed jobs are kept alive with heartbeats; a
+job is finished once all its prompts are back. Claims whose heartbeat
+goes stale (worker died) are re-queued for any worker to pick up. Every
+finished job is audit-logged.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List
+
+from core.config import settings
+from modules.analyzer import analysis_requests, combine_analysis_parts, parse_analysis_response
+from modules.batch_backend import GeminiBatchBackend, LocalBatchBackend
+from modules.drafter import build_draft_prefix, build_draft_suffix, client, generate_uncached
+from modules.job_queue import JobQueue
+from modules.model_router import route
+from services.analyzer_service import finish_analysis, plan_analysis
+from services.audit_service import write_audit_log
+from utils.date_utils import compute_urgency, estimate_urgency
+from utils.text_utils import clean_text
+
+
+logger = logging.getLogger(__name__)
+
+job_queue = JobQueue(settings.JOB_QUEUE_DB_PATH)
+
+batch_backend = (
+    LocalBatchBackend(generate_uncached)
+    if settings.JOB_BATCH_BACKEND == "local"
+    else GeminiBatchBackend(client)
+)
+
+worker_stats = {"batches": 0, "done": 0, "failed": 0, "last_batch_at": None}
+
+_worker_task: asyncio.Task | None = None
+
+
+# ============================================================
+# DEFERRAL DECISIONS
+# ============================================================
+
+def is_low_urgency_email(email_text: str) -> bool:
+    """Before analysis: local estimate only (dates + urgent phrases)."""
+    return estimate_urgency(email_text) == "low"
+
+
+def is_low_urgency_analysis(analysis: dict) -> bool:
+    """After analysis: the LLM's urgency AND the due-date rule must both say low."""
+    return (
+        analysis.get("urgency_level") == "low"
+        and compute_urgency(analysis.get("requested_due_date")) == "low"
+    )
+
+
+# ============================================================
+# SUBMIT
+# ============================================================
+
+async def submit_analyze_job(email_text: str, reason: str = "explicit") -> dict:
+    return await asyncio.to_thread(
+        job_queue.submit, "analyze", {"email_text": email_text}, reason
+    )
+
+
+async def submit_draft_job(email_text: str, analysis: dict, clauses: dict, reason: str = "explicit") -> dict:
+    # Clauses are resolved now so the job does not depend on a session
+    # or registry cache entry still existing when the batch runs
+    payload = {"email_text": email_text, "analysis": analysis, "clauses": clauses}
+    return await asyncio.to_thread(job_queue.submit, "draft", payload, reason)
+
+
+async def get_job(job_id: str) -> dict:
+    """Public view of a job. Raises JobNotFoundError."""
+    return await asyncio.to_thread(job_queue.get, job_id)
+
+
+# ============================================================
+# BATCH WORKER
+# ============================================================
+
+def in_off_peak_window(now: datetime | None = None) -> bool:
+    start, end = settings.JOB_OFF_PEAK_START_HOUR, settings.JOB_OFF_PEAK_END_HOUR
+    if start == end:
+        return True
+
+    hour = (now or datetime.now()).hour
+    if start < end:
+        return start <= hour < end
+    return hour >= start or hour < end      # window wraps midnight
+
+
+async def _prepare(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Work item for one claimed job:
+        { job, prompts: [(model, prompt), ...], outputs, result | None, plan }
+    `result` is set when no LLM call is needed (thread / near-duplicate).
+    """
+    payload = job["payload"]
+    work: Dict[str, Any] = {"job": job, "prompts": [], "result": None, "plan": None}
+
+    if job["kind"] == "analyze":
+        plan = await plan_analysis(payload["email_text"])
+        if plan["analysis"] is not None:
+            work["result"] = {"analysis": plan["analysis"]}
+        else:
+            work["plan"] = plan
+            work["prompts"] = [
+                (decision["model"], prompt)
+                for decision, prompt in analysis_requests(clean_text(plan["text"]))
+            ]
+
+    elif job["kind"] == "draft":
+        email_text = clean_text(payload["email_text"])
+        analysis = payload["analysis"]
+        decision = route("draft", email_text, questions=len(analysis.get("questions") or []))
+        prompt = build_draft_prefix(payload["clauses"]) + build_draft_suffix(analysis, email_text)
+        work["prompts"] = [(decision["model"], prompt)]
+
+    else:
+        raise ValueError(f"Unknown job kind: {job['kind']}")
+
+    work["outputs"] = [None] * len(work["prompts"])
+    return work
+
+
+def _complete(work: Dict[str, Any], texts: List[str]) -> dict:
+    """Job result from the texts of all its prompts, in prompt order."""
+    if work["job"]["kind"] == "analyze":
+        analysis = combine_analysis_parts([parse_analysis_response(text) for text in texts])
+        return {"analysis": finish_analysis(work["plan"], analysis)}
+
+    return {"draft": clean_text(texts[0])}
+
+
+async def _finish(job: Dict[str, Any], result: dict | None = None, error: str | None = None) -> None:
+    recorded = await asyncio.to_thread(
+        job_queue.finish, job["job_id"], result, error, job.get("claim")
+    )
+    if not recorded:
+        # Claim went stale and the job was re-queued; its new owner reports it
+        logger.warning("job_claim_lost job_id=%s", job["job_id"])
+        return
+    worker_stats["failed" if error else "done"] += 1
+
+    await write_audit_log({
+        "event": "deferred_job",
+        "job_id": job["job_id"],
+        "kind": job["kind"],
+        "status": "failed" if error else "done",
+        "result": result,
+        "error": error,
+    })
+
+
+async def _finish_group(items: List[tuple[Dict[str, Any], int]], outputs) -> None:
+    """Store one batch's outputs; finish every job whose prompts are all back."""
+    worker_stats["batches"] += 1
+    for (work, index), output in zip(items, outputs):
+        work["outputs"][index] = output
+        if any(out is None for out in work["outputs"]):
+            continue
+
+        error = next((err for _text, err in work["outputs"] if err is not None), None)
+        if error is None:
+            try:
+                result = _complete(work, [text for text, _err in work["outputs"]])
+                await _finish(work["job"], result=result)
+                continue
+            except Exception as e:
+                error = str(e)
+        await _finish(work["job"], error=error)
+
+
+async def run_batch_once() -> int:
+    """
+    Claim up to JOB_BATCH_MAX_SIZE queued jobs, submit one provider
+    batch per model (covering every prompt of every job), then poll all
+    batches together until each is done.
+    Returns the number of jobs claimed.
+    """
+    jobs = await asyncio.to_thread(job_queue.claim, settings.JOB_BATCH_MAX_SIZE)
+    if not jobs:
+        return 0
+
+    groups: Dict[str, List[tuple[Dict[str, Any], int, str]]] = {}
+    for job in jobs:
+        try:
+            work = await _prepare(job)
+        except Exception as e:
+            await _finish(job, error=str(e))
+            continue
+        if work["result"] is not None:
+            await _finish(job, result=work["result"])
+            continue
+        for index, (model, prompt) in enumerate(work["prompts"]):
+            groups.setdefault(model, []).append((work, index, prompt))
+
+    # Submit every group first so no model's batch waits behind another's
+    pending: Dict[Any, List[tuple[Dict[str, Any], int]]] = {}
+    for model, entries in groups.items():
+        items = [(work, index) for work, index, _prompt in entries]
+        try:
+            handle = await asyncio.to_thread(
+                batch_backend.submit, model, [prompt for _work, _index, prompt in entries]
+            )
+            pending[handle] = items
+        except Exception as e:
+            logger.exception("batch_submit_failed model=%s size=%d", model, len(items))
+            await _finish_group(items, [(None, str(e))] * len(items))
+
+    while pending:
+        for handle, items in list(pending.items()):
+            try:
+                outputs = await asyncio.to_thread(batch_backend.poll, handle)
+            except Exception as e:
+                logger.exception("batch_failed handle=%s size=%d", handle, len(items))
+                outputs = [(None, str(e))] * len(items)
+            if outputs is not None:
+                del pending[handle]
+                await _finish_group(items, outputs)
+
+        if pending:
+            job_ids = {work["job"]["job_id"] for items in pending.values() for work, _index in items}
+            await asyncio.to_thread(job_queue.heartbeat, sorted(job_ids))
+            await asyncio.sleep(settings.JOB_BATCH_POLL_SECONDS)
+
+    worker_stats["last_batch_at"] = datetime.utcnow().isoformat(timespec="seconds")
+    return len(jobs)
+
+
+async def job_worker() -> None:
+    """Drain the queue during off-peak hours; idle otherwise."""
+    while True:
+        try:
+            claimed = 0
+            requeued = await asyncio.to_thread(
+                job_queue.requeue_stale, settings.JOB_CLAIM_TIMEOUT_SECONDS
+            )
+            if requeued:
+                logger.info("job_queue_requeued_stale count=%d", requeued)
+            if in_off_peak_window():
+                claimed = await run_batch_once()
+            # A full batch means more may be waiting: go again immediately
+            if claimed < settings.JOB_BATCH_MAX_SIZE:
+                await asyncio.sleep(settings.JOB_WORKER_INTERVAL_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("job_worker_error")
+            await asyncio.sleep(settings.JOB_WORKER_INTERVAL_SECONDS)
+
+
+async def start_job_worker() -> None:
+    global _worker_task
+    _worker_task = asyncio.create_task(job_worker())
+
+
+async def stop_job_worker() -> None:
+    if _worker_task is not None:
+        _worker_task.cancel()
+
+
+def get_job_stats() -> dict:
+    return {
+        "jobs": job_queue.counts(),
+        "worker": dict(worker_stats),
+        "off_peak_now": in_off_peak_window(),
+    }
@@ -0,0 +1,109 @@
+"""
+Opt-in per-request profiling.
+
+A request is profiled when profiling is enabled in Settings and either
+- it carries the PROFILING_HEADER (if PROFILING_ALLOW_HEADER), or
+- it is picked by PROFILING_SAMPLE_RATE.
+
+A profiled request gets:
+- a span timeline   → span("name") blocks (clean_text, LLM calls,
+                       validation, audit I/O, ...)
+- a sampling profile → stacks of every thread that ran one of its spans,
+                       sampled every PROFILING_INTERVAL_MS, in folded
+                       ("a;b;c count") flamegraph format
+
+Both are written next to the audit logs and an audit entry links them;
+/debug/profiles/{id} serves them back.
+
+When profiling is disabled the middleware is not installed, no profile
+is ever active and span() is a shared no-op — there is no overhead.
+Note: the request's event-loop thread is shared, so concurrent requests
+can appear in its samples; the span timeline is per request.
+"""
+
+import asyncio
+import json
+import random
+from pathlib import Path
+
+from core.config import settings
+from services.audit_service import LOG_DIR, write_audit_log
+from utils.profiling_utils import RequestProfile, activate, deactivate, span
+
+
+PROFILING_ENABLED = settings.PROFILING_SAMPLE_RATE > 0 or settings.PROFILING_ALLOW_HEADER
+
+
+# ============================================================
+# MIDDLEWARE
+# ============================================================
+
+def _should_profile(request) -> bool:
+    if settings.PROFILING_ALLOW_HEADER and request.headers.get(settings.PROFILING_HEADER):
+        return True
+    return random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+async def profiling_middleware(request, call_next):
+    """HTTP middleware; installed by create_app() only if PROFILING_ENABLED."""
+    if request.url.path.startswith("/debug") or not _should_profile(request):
+        return await call_next(request)
+
+    profile = RequestProfile(request.method, request.url.path, settings.PROFILING_INTERVAL_MS)
+    token = activate(profile)
+    profile.start()
+    try:
+        with span("request"):
+            response = await call_next(request)
+    finally:
+        duration_ms = profile.stop()
+        deactivate(token)
+
+    await _persist(profile, duration_ms, response.status_code)
+    response.headers["X-Profile-Id"] = profile.profile_id
+    return response
+
+
+# ============================================================
+# PERSISTENCE
+# ============================================================
+
+def profile_paths(profile_id: str) -> tuple[Path, Path]:
+    """(<id>.folded, <id>.json) next to the audit logs."""
+    return (
+        LOG_DIR / f"profile-{profile_id}.folded",
+        LOG_DIR / f"profile-{profile_id}.json",
+    )
+
+
+async def _persist(profile: RequestProfile, duration_ms: float, status_code: int) -> None:
+    folded_path, spans_path = profile_paths(profile.profile_id)
+    timeline = {
+        "profile_id": profile.profile_id,
+        "method": profile.method,
+        "path": profile.path,
+        "status_code": status_code,
+        "duration_ms": round(duration_ms, 3),
+        "samples": sum(profile.stacks.values()),
+        "spans": sorted(profile.spans, key=lambda s: s["start_ms"]),
+    }
+
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, _write_profile, folded_path, profile.folded(), spans_path, timeline)
+
+    await write_audit_log({
+        "event": "request_profile",
+        "profile_id": profile.profile_id,
+        "method": profile.method,
+        "path": profile.path,
+        "duration_ms": timeline["duration_ms"],
+        "flamegraph": f"/debug/profiles/{profile.profile_id}.folded",
+        "timeline": f"/debug/profiles/{profile.profile_id}",
+    })
+
+
+def _write_profile(folded_path: Path, folded: str, spans_path: Path, timeline: dict):
+    """Blocking writes wrapped in async executor."""
+    folded_path.write_text(folded + "\n", encoding="utf-8")
+    with open(spans_path, "w", encoding="utf-8") as f:
+        json.dump(timeline, f, indent=4, ensure_ascii=False)
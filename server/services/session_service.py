@@ -0,0 +1,72 @@
+"""
+Service layer for server-side workflow sessions.
+
+/analyze stores the cleaned email, analysis and (optional) parsed
+contract in a session; /draft and the WebSocket then only send the
+session id plus an optional analysis patch.
+"""
+
+from core.config import settings
+from models.analysis_schema import AnalysisSchema
+from modules.contract_store import ContractStore
+from modules.session_store import SessionStore
+from services.contract_service import contract_registry
+from services.drafting_service import draft_reply_service
+from utils.analysis_utils import apply_analysis_patch
+
+
+session_store = SessionStore(
+    ttl_seconds=settings.SESSION_TTL_SECONDS,
+    max_sessions=settings.SESSION_MAX_SESSIONS,
+    max_bytes=settings.SESSION_MAX_BYTES,
+)
+
+
+def create_session(
+    email_text: str,
+    analysis: dict,
+    contract_text: str | None = None,
+    contract_store: ContractStore | None = None,
+) -> str:
+    return session_store.create(email_text, analysis, contract_text, contract_store)
+
+
+def prepare_session_draft(
+    session_id: str,
+    analysis_patch: dict | None = None,
+    contract_text: str | None = None,
+    contract_id: str | None = None,
+) -> dict:
+    """
+    Session ready to draft from.
+    A patch is validated, applied and kept in the session; contract text
+    or a registered contract id, if given, is resolved once and kept.
+    Raises SessionNotFoundError / ContractNotFoundError.
+    """
+    session = session_store.get(session_id)
+
+    if analysis_patch or contract_text or contract_id:
+        analysis = session["analysis"]
+        if analysis_patch:
+            analysis = AnalysisSchema(**apply_analysis_patch(analysis, analysis_patch)).model_dump()
+        store = contract_registry.get_store(contract_id) if contract_id else None
+        session = session_store.update(
+            session_id, analysis=analysis, contract_text=contract_text, contract_store=store
+        )
+    return session
+
+
+async def draft_session_service(
+    session_id: str,
+    analysis_patch: dict | None = None,
+    contract_text: str | None = None,
+    contract_id: str | None = None,
+) -> str:
+    """Draft from a stored session (see prepare_session_draft)."""
+    session = prepare_session_draft(session_id, analysis_patch, contract_text, contract_id)
+
+    return await draft_reply_service(
+        email_text=session["email_text"],
+        analysis=session["analysis"],
+        store=session["contract_store"] or ContractStore(None),
+    )
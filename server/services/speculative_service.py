@@ -0,0 +1,198 @@
+"""
+Speculative drafting.
+
+While the user reviews the /analyze JSON the server is idle, so when
+SPECULATIVE_DRAFT_ENABLED is set, /analyze starts generate_draft_reply()
+in the background. The job is keyed by a hash of (email, analysis,
+clauses):
+
+- /draft with the same email + unchanged analysis → the ready (or
+  in-flight) draft is returned instead of a new LLM call
+- /draft with the same email but an EDITED analysis → the speculative
+  job is cancelled and a normal draft is made
+
+The clauses in the key come from the contract resolved for /analyze
+(raw text, registered contract_id, or the session's contract), i.e.
+the same store /draft will use.
+
+Budget: at most `max_inflight` speculative LLM calls run at once and at
+most `max_ready` finished drafts are held (oldest dropped first).
+Cancelling only discards the result — a call that already started is
+not interrupted — so a slot is released only when its worker thread
+actually finishes, never on cancel.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Dict
+
+from core.config import settings
+from modules.contract_store import ContractStore
+from modules.drafter import generate_draft_reply
+from utils.text_utils import clean_text
+
+
+def _hash(*parts) -> str:
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _consume_result(task: asyncio.Future) -> None:
+    """Mark unclaimed failures as retrieved (no 'never retrieved' warnings)."""
+    if not task.cancelled():
+        task.exception()
+
+
+class SpeculativeDrafter:
+    """
+    key → asyncio.Future producing the draft, plus email hash → key so an
+    edited analysis can cancel the stale job.
+
+    Drafts run on a dedicated executor; `_running` counts submitted calls
+    whose thread has not finished (cancelled or not).
+    """
+
+    def __init__(self, max_inflight: int = 4, max_ready: int = 100):
+        self.max_inflight = max_inflight
+        self.max_ready = max_ready
+        self._jobs: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        self._by_email: Dict[str, str] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_inflight, thread_name_prefix="speculative-draft"
+        )
+        self._running = 0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "launched": 0,
+            "hits": 0,
+            "misses": 0,
+            "cancelled": 0,
+            "skipped_budget": 0,
+            "failed": 0,
+        }
+
+    @staticmethod
+    def make_key(email_text: str, analysis: dict, clauses: dict) -> str:
+        # Cleaned, so raw (/draft body) and session (cleaned) emails match
+        return _hash(clean_text(email_text), analysis, clauses)
+
+    def snapshot(self) -> dict:
+        claimed = self.stats["hits"] + self.stats["misses"]
+        return dict(
+            self.stats,
+            hit_rate=round(self.stats["hits"] / claimed, 4) if claimed else 0.0,
+            pending=len(self._jobs),
+            running=self._running,
+        )
+
+    # ---------------------------------------------------------
+    # SCHEDULE (after /analyze)
+    # ---------------------------------------------------------
+
+    def schedule(self, email_text: str, analysis: dict, clauses: dict) -> bool:
+        """Start a background draft. Returns False if over budget."""
+        key = self.make_key(email_text, analysis, clauses)
+        if key in self._jobs:
+            return True
+
+        self._trim_ready()
+        # A new analysis of the same email supersedes the old speculation
+        self._cancel(self._by_email.get(_hash(clean_text(email_text))))
+
+        with self._lock:
+            if self._running >= self.max_inflight:
+                self.stats["skipped_budget"] += 1
+                return False
+            self._running += 1
+
+        # Released when the thread finishes, or if the call never started
+        call: Future = self._executor.submit(
+            copy_context().run,
+            generate_draft_reply,
+            analysis=analysis,
+            clauses=clauses,
+            original_email=email_text,
+        )
+        call.add_done_callback(self._release)
+        task = asyncio.wrap_future(call)
+        task.add_done_callback(_consume_result)
+        self._jobs[key] = task
+        self._by_email[_hash(clean_text(email_text))] = key
+        self.stats["launched"] += 1
+        return True
+
+    # ---------------------------------------------------------
+    # CLAIM (on /draft)
+    # ---------------------------------------------------------
+
+    async def claim(self, email_text: str, analysis: dict, clauses: dict) -> str | None:
+        """
+        Return the speculative draft for this exact input, awaiting it if
+        still running. None on a miss; a stale job for the same email
+        (analysis edited since /analyze) is cancelled.
+        """
+        key = self.make_key(email_text, analysis, clauses)
+        task = self._jobs.pop(key, None)
+
+        if task is None:
+            self.stats["misses"] += 1
+            self._cancel(self._by_email.pop(_hash(clean_text(email_text)), None))
+            return None
+
+        self._by_email.pop(_hash(clean_text(email_text)), None)
+        try:
+            draft = await task
+        except Exception:
+            self.stats["failed"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return draft
+
+    # ---------------------------------------------------------
+    # INTERNALS
+    # ---------------------------------------------------------
+
+    def _release(self, _call: Future) -> None:
+        with self._lock:
+            self._running -= 1
+
+    def _cancel(self, key: str | None) -> None:
+        task = self._jobs.pop(key, None) if key else None
+        if task is not None:
+            if not task.done():
+                task.cancel()
+            self.stats["cancelled"] += 1
+
+    def _trim_ready(self) -> None:
+        """Drop oldest finished drafts beyond max_ready."""
+        ready = [k for k, task in self._jobs.items() if task.done()]
+        for key in ready[: max(0, len(ready) - self.max_ready + 1)]:
+            del self._jobs[key]
+        if len(self._by_email) > len(self._jobs):
+            self._by_email = {e: k for e, k in self._by_email.items() if k in self._jobs}
+
+
+speculative_drafter = SpeculativeDrafter(
+    max_inflight=settings.SPECULATIVE_DRAFT_MAX_INFLIGHT,
+    max_ready=settings.SPECULATIVE_DRAFT_MAX_READY,
+)
+
+
+def schedule_speculative_draft(email_text: str, analysis: dict, store: ContractStore | None) -> None:
+    """
+    Called after /analyze with the contract resolved for it (None → the
+    default store, as /draft uses); no-op unless SPECULATIVE_DRAFT_ENABLED.
+    """
+    if not settings.SPECULATIVE_DRAFT_ENABLED:
+        return
+
+    clauses = (store or ContractStore(None)).get_all_clauses()
+    speculative_drafter.schedule(email_text, analysis, clauses)
@@ -0,0 +1,23 @@
+"""
+Test setup: modules are imported the way main.py imports them
+(`from utils... import`, `from modules... import`), relative to server/.
+
+Settings are read from the environment when core.config is first
+imported, so the API key and every on-disk path are pointed at a
+throwaway directory before any test module imports the app.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+_DATA_DIR = Path(tempfile.mkdtemp(prefix="legal-email-tests-"))
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("CONTRACT_REGISTRY_DB_PATH", str(_DATA_DIR / "registry.sqlite3"))
+os.environ.setdefault("JOB_QUEUE_DB_PATH", str(_DATA_DIR / "jobs.sqlite3"))
+os.environ.setdefault("AUDIT_LOG_DIR", str(_DATA_DIR / "audit_logs"))
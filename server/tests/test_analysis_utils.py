@@ -0,0 +1,51 @@
+"""Tests for utils/analysis_utils merging."""
+
+from utils.analysis_utils import UNKNOWN, merge_analyses
+
+
+THREAD = {
+    "intent": "renewal",
+    "primary_topic": "fees",
+    "parties": {"client": "Firm LLP", "vendor": None},
+    "agreement_reference": {"name": "MSA", "date": None},
+    "questions": ["Does the fee schedule still apply?"],
+    "requested_due_date": "2031-03-31",
+    "urgency_level": "medium",
+}
+
+
+def test_merge_new_message_into_thread():
+    update = {
+        "intent": "clarification",
+        "primary_topic": "termination",
+        "parties": {"client": "Other LLP", "vendor": "Acme Supplies"},
+        "agreement_reference": {"name": "Other", "date": "2030-01-10"},
+        "questions": ["does the fee schedule still apply", "Can we terminate early?"],
+        "requested_due_date": None,
+        "urgency_level": "low",
+    }
+    merged = merge_analyses(THREAD, update)
+
+    assert merged["intent"] == "clarification"
+    assert merged["primary_topic"] == "fees"
+    assert merged["parties"] == {"client": "Firm LLP", "vendor": "Acme Supplies"}
+    assert merged["agreement_reference"] == {"name": "MSA", "date": "2030-01-10"}
+    assert merged["questions"] == ["Does the fee schedule still apply?", "Can we terminate early?"]
+    assert merged["requested_due_date"] == "2031-03-31"
+    assert merged["urgency_level"] == "medium"
+
+
+def test_unknown_counts_as_missing():
+    base = dict(THREAD, primary_topic=UNKNOWN)
+    update = dict(THREAD, intent=UNKNOWN, primary_topic="termination")
+    merged = merge_analyses(base, update)
+
+    assert merged["intent"] == "renewal"
+    assert merged["primary_topic"] == "termination"
+
+
+def test_unknown_when_nothing_is_known():
+    merged = merge_analyses({"intent": UNKNOWN}, {"primary_topic": ""})
+    assert merged["intent"] == UNKNOWN
+    assert merged["primary_topic"] == UNKNOWN
+    assert merged["urgency_level"] == "low"
@@ -0,0 +1,103 @@
+"""Tests for utils/clause_utils.parse_clauses."""
+
+from utils.clause_utils import parse_clauses, relevant_clauses
+
+
+CONTRACT = """MASTER SERVICES AGREEMENT
+
+1. Definitions
+1.1 "Services" means the consulting services described in Schedule A.
+1.2 The Fees are capped at a total of
+2.5 million dollars for the initial term.
+
+2. Services
+2.1 The Vendor shall:
+1. act diligently;
+2. comply with law.
+
+Clause 9.1 Termination for convenience requires 30 days' written notice.
+9.2 Termination for breach takes effect immediately.
+Section 10.2 This Agreement is governed by the laws of England.
+"""
+
+
+def test_numbered_headers_in_document_order():
+    clauses = parse_clauses(CONTRACT)
+    assert list(clauses) == ["1", "1.1", "1.2", "2", "2.1", "9.1", "9.2", "10.2"]
+    assert clauses["1"] == "Definitions"
+    assert clauses["9.2"].startswith("Termination for breach")
+
+
+def test_number_inside_body_is_not_a_header():
+    clauses = parse_clauses(CONTRACT)
+    assert "2.5" not in clauses
+    assert "2.5 million dollars" in clauses["1.2"]
+
+
+def test_list_items_stay_in_their_clause():
+    clauses = parse_clauses(CONTRACT)
+    assert "act diligently" in clauses["2.1"]
+    assert "comply with law" in clauses["2.1"]
+
+
+def test_skipped_sections():
+    clauses = parse_clauses(
+        "9.1 Either party may terminate.\n"
+        "9.2 Termination takes effect on notice.\n"
+        "12.1 Notices must be in writing."
+    )
+    assert list(clauses) == ["9.1", "9.2", "12.1"]
+    assert clauses["9.2"] == "Termination takes effect on notice."
+
+
+def test_out_of_order_excerpt():
+    clauses = parse_clauses("2.1 The Vendor shall invoice monthly.\n1.4 Fees are exclusive of VAT.")
+    assert clauses == {
+        "2.1": "The Vendor shall invoice monthly.",
+        "1.4": "Fees are exclusive of VAT.",
+    }
+
+
+def test_lowercase_bodies():
+    assert parse_clauses("9.1 either party may terminate.") == {
+        "9.1": "either party may terminate."
+    }
+
+    clauses = parse_clauses("TERMINATION\n9.1 either party may terminate.\n9.2 notice is\n30 days.")
+    assert clauses == {"9.1": "either party may terminate.", "9.2": "notice is 30 days."}
+
+
+def test_labelled_headers_are_always_accepted():
+    clauses = parse_clauses("Clause 7.3 Payment is due within 30 days.")
+    assert clauses == {"7.3": "Payment is due within 30 days."}
+
+
+def test_text_without_clauses():
+    assert parse_clauses("Hello team,\n2.5 million dollars is the budget.") == {}
+    assert parse_clauses("") == {}
+    assert parse_clauses(None) == {}
+
+
+def test_relevant_clauses_by_number_and_term():
+    clauses = parse_clauses(CONTRACT)
+    picked = relevant_clauses("What does clause 9.1 say about termination?", clauses)
+    assert list(picked) == ["9.1", "9.2"]
+
+
+CLAUSES = {
+    "9.1": "Either Party may terminate this Agreement upon written notice.",
+    "9.2": "Repeated failure to meet delivery timelines constitutes a material breach.",
+    "11.2": "Fees are fixed for the initial term.",
+}
+
+
+def test_relevant_clauses_by_citation_and_shared_terms():
+    assert list(relevant_clauses("Does clause 9.2 apply to us?", CLAUSES)) == ["9.2"]
+    assert list(relevant_clauses("Could we terminate after late deliveries?", CLAUSES)) == [
+        "9.1",
+        "9.2",
+    ]
+
+
+def test_relevant_clauses_falls_back_to_all():
+    assert relevant_clauses("Who is our contact?", CLAUSES) == CLAUSES
@@ -0,0 +1,115 @@
+"""Tests for modules/drafter: parallel per-question drafting and its fallback."""
+
+import json
+import re
+import time
+
+import pytest
+
+import modules.drafter as drafter
+from modules.drafter import FRAMING_DEFAULTS, assemble_draft, generate_draft_reply
+
+CLAUSES = {
+    "9.1": "Either Party may terminate this Agreement upon thirty days' written notice.",
+    "11.2": "Fees are fixed for the initial term and invoiced monthly.",
+}
+
+ANALYSIS = {
+    "primary_topic": "termination and fees",
+    "questions": [
+        "Can we terminate early?",
+        "Are the fees fixed?",
+        "How are fees invoiced?",
+    ],
+}
+
+FRAMING = {
+    "greeting": "Dear Ms. Sharma,",
+    "opening": "Thank you for your email.",
+    "closing": "We remain at your disposal.",
+    "sign_off": "Kind regards,",
+}
+
+
+class FakeLLM:
+    """Answers echo their question; earlier questions finish last."""
+
+    def __init__(self, fail_on: str | None = None):
+        self.fail_on = fail_on
+        self.prompts = []
+
+    def __call__(self, model, prompt):
+        self.prompts.append(prompt)
+        if "framing of a professional legal reply" in prompt:
+            return json.dumps(FRAMING)
+        if "ORIGINAL EMAIL:" in prompt and "QUESTION:" not in prompt:
+            return "Single-call draft."
+        question = prompt.split("QUESTION:\n", 1)[1].split("\n", 1)[0]
+        if question == self.fail_on:
+            raise RuntimeError("provider error")
+        time.sleep(0.05 * (3 - ANALYSIS["questions"].index(question)))
+        return f"Answer to: {question}"
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    fake = FakeLLM()
+    monkeypatch.setattr(drafter, "generate_uncached", fake)
+    monkeypatch.setattr(drafter.settings, "DRAFT_PARALLEL_ENABLED", True)
+    monkeypatch.setattr(drafter.settings, "DRAFT_PARALLEL_MIN_QUESTIONS", 2)
+    monkeypatch.setattr(drafter.settings, "DRAFT_PARALLEL_MAX_CONCURRENCY", 4)
+    monkeypatch.setattr(drafter.settings, "DRAFT_PROMPT_CACHE_ENABLED", False)
+    return fake
+
+
+def test_answers_are_assembled_in_question_order(llm):
+    draft = generate_draft_reply(ANALYSIS, CLAUSES, "Dear Counsel, ...")
+
+    assert draft == "\n\n".join([
+        "Dear Ms. Sharma,",
+        "Thank you for your email.",
+        "1. Answer to: Can we terminate early?",
+        "2. Answer to: Are the fees fixed?",
+        "3. Answer to: How are fees invoiced?",
+        "We remain at your disposal.",
+        "Kind regards,",
+    ])
+
+
+def test_answer_prompts_carry_only_relevant_clauses(llm):
+    generate_draft_reply(ANALYSIS, CLAUSES, "Dear Counsel, ...")
+
+    answer_prompts = {
+        p.split("QUESTION:\n", 1)[1].split("\n", 1)[0]: p for p in llm.prompts if "QUESTION:" in p
+    }
+    fees = answer_prompts["Are the fees fixed?"]
+    assert "11.2:" in fees and "9.1:" not in fees
+    terminate = answer_prompts["Can we terminate early?"]
+    assert "9.1:" in terminate and "11.2:" not in terminate
+
+
+def test_failed_answer_falls_back_to_single_call(llm):
+    llm.fail_on = "Are the fees fixed?"
+
+    assert generate_draft_reply(ANALYSIS, CLAUSES, "Dear Counsel, ...") == "Single-call draft."
+
+
+def test_few_questions_use_single_call(llm):
+    analysis = dict(ANALYSIS, questions=["Are the fees fixed?"])
+
+    assert generate_draft_reply(analysis, CLAUSES, "Dear Counsel, ...") == "Single-call draft."
+    assert not any("QUESTION:" in p for p in llm.prompts)
+
+
+def test_assemble_draft_numbers_multiple_answers_only():
+    assert assemble_draft(FRAMING_DEFAULTS, ["Only answer."]) == "\n\n".join([
+        FRAMING_DEFAULTS["greeting"],
+        FRAMING_DEFAULTS["opening"],
+        "Only answer.",
+        FRAMING_DEFAULTS["closing"],
+        FRAMING_DEFAULTS["sign_off"],
+    ])
+
+    draft = assemble_draft(dict(FRAMING, closing=""), ["First.", "Second."])
+    assert re.findall(r"^\d\. .+$", draft, flags=re.M) == ["1. First.", "2. Second."]
+    assert draft.endswith("2. Second.\n\nKind regards,")
@@ -0,0 +1,106 @@
+"""Tests for modules/job_queue claim / finish with the local batch backend."""
+
+import pytest
+
+import modules.job_queue as job_queue_module
+from modules.batch_backend import LocalBatchBackend
+from modules.job_queue import JobNotFoundError, JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.db"))
+
+
+def echo(model, prompt):
+    if prompt == "boom":
+        raise RuntimeError("provider error")
+    return f"{model}:{prompt}"
+
+
+def test_submit_and_get(queue):
+    job = queue.submit("analyze", {"email_text": "Hello"}, reason="explicit")
+    assert job["status"] == "queued"
+    assert job["reason"] == "explicit"
+    assert job["result"] is None
+    assert "payload" not in job
+    assert queue.get(job["job_id"]) == job
+
+
+def test_unknown_job(queue):
+    with pytest.raises(JobNotFoundError):
+        queue.get("missing")
+
+
+def test_claim_is_oldest_first_and_exclusive(queue):
+    ids = [queue.submit("analyze", {"n": i})["job_id"] for i in range(3)]
+
+    first = queue.claim(2)
+    second = queue.claim(2)
+    assert [job["job_id"] for job in first] == ids[:2]
+    assert [job["job_id"] for job in second] == ids[2:]
+    assert first[0]["payload"] == {"n": 0}
+    assert first[0]["claim"] != second[0]["claim"]
+    assert queue.claim(2) == []
+    assert queue.counts() == {"running": 3}
+
+
+def test_batch_round_trip_finishes_jobs(queue):
+    backend = LocalBatchBackend(echo)
+    for prompt in ("a", "boom", "c"):
+        queue.submit("analyze", {"prompt": prompt})
+
+    claimed = queue.claim(10)
+    handle = backend.submit("m", [job["payload"]["prompt"] for job in claimed])
+    results = backend.poll(handle)
+
+    for job, (text, error) in zip(claimed, results):
+        assert queue.finish(job["job_id"], result={"text": text} if text else None,
+                            error=error, claim=job["claim"])
+
+    done, failed, done_again = (queue.get(job["job_id"]) for job in claimed)
+    assert done["status"] == "done" and done["result"] == {"text": "m:a"}
+    assert failed["status"] == "failed" and failed["error"] == "provider error"
+    assert done_again["result"] == {"text": "m:c"}
+    assert queue.counts() == {"done": 2, "failed": 1}
+
+
+def test_local_backend_handles_several_batches(queue):
+    backend = LocalBatchBackend(echo)
+    first = backend.submit("fast", ["x"])
+    second = backend.submit("strong", ["y", "z"])
+    assert backend.poll(second) == [("strong:y", None), ("strong:z", None)]
+    assert backend.poll(first) == [("fast:x", None)]
+
+
+def test_requeue_only_stale_claims(queue, monkeypatch):
+    # A worker that claimed long ago and stopped heartbeating
+    monkeypatch.setattr(job_queue_module, "_now", lambda offset_seconds=0: "2000-01-01T00:00:00")
+    stale_id = queue.submit("analyze", {"n": 1})["job_id"]
+    stale = queue.claim(1)[0]
+    monkeypatch.undo()
+
+    live_id = queue.submit("analyze", {"n": 2})["job_id"]
+    live = queue.claim(1)[0]
+
+    assert queue.requeue_stale(timeout_seconds=60) == 1
+    assert queue.get(stale_id)["status"] == "queued"
+    assert queue.get(live_id)["status"] == "running"
+
+    # The dead worker's claim no longer finishes the job ...
+    assert not queue.finish(stale_id, result={"late": True}, claim=stale["claim"])
+    assert queue.get(stale_id)["status"] == "queued"
+    # ... while the live claim still does
+    assert queue.finish(live_id, result={"ok": True}, claim=live["claim"])
+    assert queue.get(live_id)["result"] == {"ok": True}
+
+
+def test_heartbeat_keeps_claim_alive(queue, monkeypatch):
+    monkeypatch.setattr(job_queue_module, "_now", lambda offset_seconds=0: "2000-01-01T00:00:00")
+    job_id = queue.submit("analyze", {"n": 1})["job_id"]
+    queue.claim(1)
+    monkeypatch.undo()
+
+    queue.heartbeat([job_id])
+    assert queue.requeue_stale(timeout_seconds=60) == 0
+    assert queue.get(job_id)["status"] == "running"
@@ -0,0 +1,140 @@
+"""Tests for services/job_service: batch worker preparation and /jobs routes."""
+
+import asyncio
+import json
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+import services.analyzer_service as analyzer_service
+import services.job_service as job_service
+from main import app
+from modules.batch_backend import LocalBatchBackend
+from modules.job_queue import JobQueue
+from modules.near_duplicate_index import NearDuplicateIndex
+from modules.thread_store import ThreadStore
+
+
+def fake_llm(model, prompt):
+    """Analysis prompts → JSON naming the chunk; draft prompts → a reply."""
+    if "legal email analysis engine" not in prompt:
+        return "Dear Jane,\n\nThank you for your email."
+    part = re.search(r"This is part (\d+) of (\d+)", prompt)
+    return json.dumps({
+        "intent": "renewal",
+        "primary_topic": "fees",
+        "questions": [f"Question from part {part.group(1)}?" if part else "Do the fees change?"],
+        "urgency_level": "low",
+    })
+
+
+class RecordingBackend(LocalBatchBackend):
+    def __init__(self):
+        super().__init__(fake_llm)
+        self.batches = []
+
+    def submit(self, model, prompts):
+        self.batches.append((model, list(prompts)))
+        return super().submit(model, prompts)
+
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    backend = RecordingBackend()
+    monkeypatch.setattr(job_service, "job_queue", JobQueue(str(tmp_path / "jobs.sqlite3")))
+    monkeypatch.setattr(job_service, "batch_backend", backend)
+    monkeypatch.setattr(analyzer_service, "thread_store", ThreadStore())
+    monkeypatch.setattr(analyzer_service, "near_duplicate_index", NearDuplicateIndex())
+    monkeypatch.setattr(job_service.settings, "JOB_BATCH_POLL_SECONDS", 0)
+    return backend
+
+
+def _prompt_count(backend):
+    return sum(len(prompts) for _model, prompts in backend.batches)
+
+
+def test_long_analyze_job_is_chunked_like_analyze(worker, monkeypatch):
+    monkeypatch.setattr(job_service.settings, "ANALYSIS_CHUNK_THRESHOLD_CHARS", 200)
+    monkeypatch.setattr(job_service.settings, "ANALYSIS_CHUNK_SIZE_CHARS", 120)
+    email = "\n\n".join(
+        f"Paragraph {i}: the supplier asks about renewal fees for site number {i}."
+        for i in range(6)
+    )
+
+    async def scenario():
+        job = await job_service.submit_analyze_job(email)
+        assert await job_service.run_batch_once() == 1
+        return await job_service.get_job(job["job_id"])
+
+    job = asyncio.run(scenario())
+    assert job["status"] == "done"
+    assert _prompt_count(worker) > 1
+    questions = job["result"]["analysis"]["questions"]
+    assert questions[0] == "Question from part 1?"
+    assert len(questions) == _prompt_count(worker)
+
+
+def test_repeated_email_reuses_analysis_without_llm(worker):
+    email = "Dear Counsel,\n\nPlease confirm the renewal fees for 2031.\n\nRegards, Jane"
+
+    async def scenario():
+        first = await job_service.submit_analyze_job(email)
+        await job_service.run_batch_once()
+        second = await job_service.submit_analyze_job(email)
+        await job_service.run_batch_once()
+        return (
+            await job_service.get_job(first["job_id"]),
+            await job_service.get_job(second["job_id"]),
+        )
+
+    first, second = asyncio.run(scenario())
+    assert first["status"] == second["status"] == "done"
+    assert second["result"] == first["result"]
+    assert _prompt_count(worker) == 1
+
+
+def test_draft_job(worker):
+    analysis = {"intent": "renewal", "questions": ["Do fees change?"]}
+
+    async def scenario():
+        job = await job_service.submit_draft_job(
+            "Dear Counsel, do fees change? Jane", analysis, {"4.1": "Fees are fixed."}
+        )
+        await job_service.run_batch_once()
+        return await job_service.get_job(job["job_id"])
+
+    job = asyncio.run(scenario())
+    assert job["status"] == "done"
+    assert job["result"] == {"draft": "Dear Jane,\n\nThank you for your email."}
+    assert "4.1: Fees are fixed." in worker.batches[0][1][0]
+
+
+def test_invalid_llm_output_fails_the_job(worker, monkeypatch):
+    monkeypatch.setattr(worker, "generate_fn", lambda model, prompt: "not json")
+
+    async def scenario():
+        job = await job_service.submit_analyze_job("Dear Counsel, is the fee fixed? Jane")
+        await job_service.run_batch_once()
+        return await job_service.get_job(job["job_id"])
+
+    job = asyncio.run(scenario())
+    assert job["status"] == "failed"
+    assert "valid JSON" in job["error"]
+
+
+def test_jobs_routes(worker):
+    client = TestClient(app)
+
+    submitted = client.post("/jobs/", json={"kind": "analyze", "email_text": "Is the fee fixed?"})
+    assert submitted.status_code == 202
+    job_id = submitted.json()["job_id"]
+
+    fetched = client.get(f"/jobs/{job_id}")
+    assert fetched.status_code == 200
+    assert fetched.json()["status"] == "queued"
+    assert client.get("/jobs/missing").status_code == 404
+
+
+def test_worker_is_opt_in():
+    assert type(job_service.settings).model_fields["JOB_QUEUE_ENABLED"].default is False
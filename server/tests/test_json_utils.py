@@ -0,0 +1,106 @@
+"""Tests for utils/json_utils.extract_json_object repairs."""
+
+from utils.json_utils import extract_json_object
+
+
+def test_clean_json_needs_no_repair():
+    obj, repairs = extract_json_object('{"intent": "renewal", "questions": []}')
+    assert obj == {"intent": "renewal", "questions": []}
+    assert repairs == []
+
+
+def test_markdown_fence_and_surrounding_text():
+    raw = 'Here is the analysis:\n```json\n{"intent": "renewal"}\n```\nThanks!'
+    obj, repairs = extract_json_object(raw)
+    assert obj == {"intent": "renewal"}
+    assert "markdown_fence" in repairs
+
+
+def test_fence_inside_string_is_content():
+    raw = '```json\n{"note": "wrap code in ``` fences", "x": 1}\n```'
+    obj, repairs = extract_json_object(raw)
+    assert obj == {"note": "wrap code in ``` fences", "x": 1}
+    assert "markdown_fence" in repairs
+
+    obj, repairs = extract_json_object('{"note": "see ```code``` here"} done')
+    assert obj == {"note": "see ```code``` here"}
+    assert "markdown_fence" not in repairs
+
+
+def test_prose_around_object():
+    obj, repairs = extract_json_object('Sure! {"intent": "renewal"} Let me know.')
+    assert obj == {"intent": "renewal"}
+    assert "surrounding_text" in repairs
+
+
+def test_trailing_commas():
+    obj, repairs = extract_json_object('{"questions": ["a", "b",], "x": 1,}')
+    assert obj == {"questions": ["a", "b"], "x": 1}
+    assert "trailing_comma" in repairs
+
+
+def test_python_literals():
+    obj, repairs = extract_json_object('{"urgent": True, "date": None, "done": False}')
+    assert obj == {"urgent": True, "date": None, "done": False}
+    assert "python_literal" in repairs
+
+
+def test_smart_quote_delimiters():
+    obj, repairs = extract_json_object("{“intent”: “renewal”}")
+    assert obj == {"intent": "renewal"}
+    assert "smart_quotes" in repairs
+
+
+def test_unescaped_quote_inside_string():
+    obj, repairs = extract_json_object('{"topic": "the "Services" clause", "x": 1}')
+    assert obj == {"topic": 'the "Services" clause', "x": 1}
+    assert "unescaped_quote" in repairs
+
+
+def test_raw_newline_inside_string():
+    obj, repairs = extract_json_object('{"topic": "line one\nline two"}')
+    assert obj == {"topic": "line one\nline two"}
+    assert "control_char" in repairs
+
+
+def test_truncated_output_is_closed():
+    obj, repairs = extract_json_object(
+        '{"intent": "renewal", "questions": ["Is it due?"], "urgency'
+    )
+    assert obj == {"intent": "renewal", "questions": ["Is it due?"]}
+    assert "truncated" in repairs
+
+
+def test_truncated_string_value_is_dropped():
+    obj, _ = extract_json_object('{"intent": "renewal", "requested_due_date": "2025-1')
+    assert obj == {"intent": "renewal"}
+
+    obj, _ = extract_json_object(
+        '{"intent": "renewal", "questions": ["Is it due?", "Whether the supplier may termin'
+    )
+    assert obj == {"intent": "renewal", "questions": ["Is it due?"]}
+
+
+def test_truncated_number_is_dropped():
+    obj, _ = extract_json_object('{"intent": "renewal", "amount": 12')
+    assert obj == {"intent": "renewal"}
+
+
+def test_truncated_after_complete_values():
+    obj, _ = extract_json_object('{"parties": {"client": "Firm LLP"}')
+    assert obj == {"parties": {"client": "Firm LLP"}}
+
+    obj, _ = extract_json_object('{"parties": {"client": "Firm LLP", "vendor": "Acme')
+    assert obj == {"parties": {"client": "Firm LLP"}}
+
+
+def test_dangling_member_is_dropped():
+    obj, repairs = extract_json_object('{"intent": "renewal", "primary_topic":')
+    assert obj == {"intent": "renewal"}
+    assert "truncated" in repairs
+
+
+def test_unrecoverable_input():
+    assert extract_json_object("no json here")[0] is None
+    assert extract_json_object(None)[0] is None
+    assert extract_json_object("[1, 2, 3]")[0] is None
@@ -0,0 +1,73 @@
+"""Tests for modules/model_router: complexity thresholds and tier → model."""
+
+import pytest
+
+import modules.model_router as model_router
+from modules.model_router import choose_tier, get_routing_stats, route, score_complexity, timed
+
+
+@pytest.fixture
+def routing(monkeypatch):
+    settings = model_router.settings
+    monkeypatch.setattr(settings, "MODEL_ROUTING_ENABLED", True)
+    monkeypatch.setattr(settings, "GEMINI_MODEL", "configured-model")
+    monkeypatch.setattr(settings, "MODEL_TIERS", {"fast": "fast-model", "strong": None})
+    monkeypatch.setattr(settings, "MODEL_ROUTING_FAST_MAX_WORDS", 20)
+    monkeypatch.setattr(settings, "MODEL_ROUTING_FAST_MAX_QUESTIONS", 1)
+    monkeypatch.setattr(settings, "MODEL_ROUTING_FAST_MAX_DATES", 1)
+    monkeypatch.setattr(settings, "MODEL_ROUTING_FAST_MAX_CLAUSES", 0)
+    return settings
+
+
+def test_score_complexity_features():
+    features = score_complexity(
+        "Does clause 9.1 apply? And section 10.2 from 1 March 2025?\n"
+        "- whether notice was given"
+    )
+    assert features["questions"] == 2
+    assert features["clauses"] == 2
+    assert features["dates"] == 1
+    assert score_complexity("Anything else?", questions=4)["questions"] == 4
+
+
+def _features(**overrides):
+    return dict({"words": 20, "questions": 1, "dates": 1, "clauses": 0}, **overrides)
+
+
+def test_fast_only_when_every_feature_is_within_its_threshold(routing):
+    assert choose_tier(_features()) == "fast"
+    assert choose_tier(_features(words=21)) == "strong"
+    assert choose_tier(_features(questions=2)) == "strong"
+    assert choose_tier(_features(dates=2)) == "strong"
+    assert choose_tier(_features(clauses=1)) == "strong"
+
+
+def test_route_maps_tiers_to_models(routing):
+    fast = route("analyze", "Please confirm receipt.")
+    assert (fast["tier"], fast["model"]) == ("fast", "fast-model")
+
+    strong = route("draft", "Please confirm receipt.", questions=3)
+    assert (strong["tier"], strong["model"]) == ("strong", "configured-model")
+
+
+def test_missing_tier_falls_back_to_configured_model(routing, monkeypatch):
+    monkeypatch.setattr(routing, "MODEL_TIERS", {})
+    assert route("analyze", "Please confirm receipt.")["model"] == "configured-model"
+
+
+def test_disabled_routing_uses_configured_model(routing, monkeypatch):
+    monkeypatch.setattr(routing, "MODEL_ROUTING_ENABLED", False)
+    decision = route("analyze", "Please confirm receipt.")
+    assert (decision["tier"], decision["model"]) == ("default", "configured-model")
+
+
+def test_timed_records_latency_per_task_and_tier(routing, monkeypatch):
+    monkeypatch.setattr(model_router, "_stats", {})
+    decision = route("analyze", "Please confirm receipt.")
+    with timed(decision):
+        pass
+    with pytest.raises(RuntimeError):
+        with timed(decision):
+            raise RuntimeError("provider error")
+
+    assert get_routing_stats()["analyze:fast"]["calls"] == 2
@@ -0,0 +1,136 @@
+"""Tests for modules/near_duplicate_index SimHash reuse and rejection."""
+
+from modules.near_duplicate_index import (
+    NearDuplicateIndex,
+    hamming,
+    normalize_for_simhash,
+    number_mentions,
+    simhash,
+)
+
+
+TEMPLATE = (
+    "Dear Legal Team,\n\n"
+    "This is a reminder from Acme Supplies regarding the Master Services Agreement "
+    "dated {agreement}. Invoice INV-{invoice} for ${amount} is outstanding and payment "
+    "is requested by {due}. Please confirm whether the late-payment clause applies and "
+    "who on your side will approve the transfer.\n\n"
+    "Kind regards,\nAcme Supplies Accounts"
+)
+
+
+def make_email(due="March 3, 2031", amount="5,000", invoice="1042", agreement="January 10, 2030"):
+    return TEMPLATE.format(due=due, amount=amount, invoice=invoice, agreement=agreement)
+
+
+def make_analysis(due="2031-03-03"):
+    return {
+        "intent": "payment_reminder",
+        "primary_topic": "invoice",
+        "parties": {"client": None, "vendor": "Acme Supplies"},
+        "agreement_reference": {"name": "Master Services Agreement", "date": "2030-01-10"},
+        "questions": ["Does the late-payment clause apply?"],
+        "requested_due_date": due,
+        "urgency_level": "low",
+    }
+
+
+def test_dates_and_digits_do_not_change_the_signature():
+    a = make_email()
+    b = make_email(due="April 9, 2031", invoice="2077")
+    assert "datetoken" in normalize_for_simhash(a)
+    assert simhash(a) == simhash(b)
+    assert hamming(simhash(a), simhash(b)) == 0
+
+
+def test_number_mentions_skip_dates_and_strip_commas():
+    assert number_mentions(make_email()) == ["1042", "5000"]
+
+
+def test_reuse_adapts_changed_due_date():
+    index = NearDuplicateIndex()
+    index.add(make_email(), make_analysis())
+
+    found = index.reuse(make_email(due="April 9, 2031"))
+    assert found is not None
+    _entry_id, similarity, analysis = found
+    assert similarity == 1.0
+    assert analysis["requested_due_date"] == "2031-04-09"
+    assert analysis["agreement_reference"]["date"] == "2030-01-10"
+    assert index.stats["hits"] == 1
+
+
+def test_reuse_substitutes_changed_figures_in_questions():
+    index = NearDuplicateIndex()
+    analysis = make_analysis()
+    analysis["questions"] = ["Is the $5,000 payment under INV-1042 overdue?"]
+    index.add(make_email(), analysis)
+
+    found = index.reuse(make_email(amount="7,250", invoice="2077"))
+    assert found is not None
+    assert found[2]["questions"] == ["Is the $7,250 payment under INV-2077 overdue?"]
+
+
+def test_reuse_rejects_figures_that_do_not_align():
+    index = NearDuplicateIndex()
+    index.add(make_email(invoice="5000"), make_analysis())
+
+    assert index.reuse(make_email(invoice="5000", amount="6,000")) is None
+    assert index.stats["rejected"] == 1
+
+
+def test_reuse_rejects_question_mentioning_changed_date():
+    index = NearDuplicateIndex()
+    analysis = make_analysis()
+    analysis["questions"] = ["Can payment wait until after March 3, 2031?"]
+    index.add(make_email(), analysis)
+
+    assert index.reuse(make_email(due="April 9, 2031")) is None
+
+
+def test_reuse_re_extracts_renamed_party():
+    index = NearDuplicateIndex(max_hamming=10)
+    analysis = make_analysis()
+    analysis["questions"] = ["Will Acme Supplies waive the late fee?"]
+    index.add(make_email(), analysis)
+
+    found = index.reuse(make_email().replace("Acme Supplies", "Globex Partners"))
+    assert found is not None
+    assert found[2]["parties"] == {"client": None, "vendor": "Globex Partners"}
+    assert found[2]["questions"] == ["Will Globex Partners waive the late fee?"]
+
+
+def test_reuse_rejects_party_outside_its_template_slot():
+    index = NearDuplicateIndex(max_hamming=10)
+    index.add(make_email(), make_analysis())
+
+    other_vendor = (
+        make_email()
+        .replace("from Acme Supplies regarding", "from our office, Globex Partners, about")
+        .replace("Acme Supplies", "Globex Partners")
+    )
+    assert index.find(other_vendor) is not None
+    assert index.reuse(other_vendor) is None
+
+
+def test_unrelated_email_is_not_found():
+    index = NearDuplicateIndex()
+    index.add(make_email(), make_analysis())
+    assert index.find("Could you send over the signed NDA for the Berlin office lease?") is None
+
+
+def test_eviction_recycles_ids_and_unlinks_buckets():
+    index = NearDuplicateIndex(max_stored_analyses=2)
+    bodies = [
+        "Please review the attached lease renewal for the Leeds warehouse.",
+        "We dispute the termination notice served on our distribution agreement.",
+        "Kindly confirm the indemnity cap under the software licence.",
+        "Our auditors need a copy of the data processing addendum.",
+    ]
+    ids = [index.add(body, make_analysis()) for body in bodies]
+
+    assert len(index) == 2
+    assert len(index._signatures) == 3
+    assert set(ids[2:]) <= {0, 1, 2}
+    assert index.find(bodies[0]) is None
+    assert index.find(bodies[3])[0] == ids[3]
@@ -0,0 +1,95 @@
+"""Tests for request profiling: span propagation and the opt-in debug routes."""
+
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from fastapi.testclient import TestClient
+
+import main
+import services.profiling_service as profiling_service
+from utils.profiling_utils import RequestProfile, activate, deactivate, span
+
+
+def _profiled(fn):
+    """Run fn() with a fresh active profile; returns the profile."""
+    profile = RequestProfile("POST", "/analyze/", interval_ms=1)
+    token = activate(profile)
+    try:
+        fn()
+    finally:
+        deactivate(token)
+    return profile
+
+
+def _by_name(profile):
+    return {s["name"]: s for s in profile.spans}
+
+
+def test_span_is_a_no_op_without_active_profile():
+    assert span("a") is span("b")
+
+
+def test_spans_follow_asyncio_to_thread_and_nest():
+    def work():
+        with span("inner"):
+            pass
+
+    async def request():
+        with span("outer"):
+            await asyncio.to_thread(work)
+
+    profile = _profiled(lambda: asyncio.run(request()))
+    spans = _by_name(profile)
+    outer, inner = spans["outer"], spans["inner"]
+
+    assert inner["thread"] != outer["thread"]
+    assert inner["thread"] in profile.thread_ids
+    assert outer["start_ms"] <= inner["start_ms"]
+    assert inner["start_ms"] + inner["duration_ms"] <= outer["start_ms"] + outer["duration_ms"]
+
+
+def _answer(i):
+    with span(f"answer:{i}"):
+        pass
+
+
+def test_spans_follow_copied_contexts_into_pools():
+    def request():
+        with span("outer"), ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(copy_context().run, _answer, i) for i in range(2)]
+            for future in futures:
+                future.result()
+            # A plain submit does not carry the profile
+            pool.submit(_answer, 9).result()
+
+    profile = _profiled(request)
+    assert {"outer", "answer:0", "answer:1"} == set(_by_name(profile))
+
+
+def test_debug_routes_absent_when_profiling_disabled(monkeypatch):
+    monkeypatch.setattr(main, "PROFILING_ENABLED", False)
+    client = TestClient(main.create_app())
+
+    response = client.get("/metrics/", headers={"X-Profile": "1"})
+    assert "X-Profile-Id" not in response.headers
+    assert client.get(f"/debug/profiles/{'0' * 32}").status_code == 404
+    assert not any(route.path.startswith("/debug") for route in client.app.routes)
+
+
+def test_profiled_request_is_served_from_debug_routes(monkeypatch):
+    monkeypatch.setattr(main, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(profiling_service.settings, "PROFILING_ALLOW_HEADER", True)
+    monkeypatch.setattr(profiling_service.settings, "PROFILING_SAMPLE_RATE", 0)
+    client = TestClient(main.create_app())
+
+    assert "X-Profile-Id" not in client.get("/metrics/").headers
+    profile_id = client.get("/metrics/", headers={"X-Profile": "1"}).headers["X-Profile-Id"]
+    assert re.fullmatch(r"[0-9a-f]{32}", profile_id)
+
+    timeline = client.get(f"/debug/profiles/{profile_id}").json()
+    assert timeline["path"] == "/metrics/"
+    assert [s["name"] for s in timeline["spans"]][0] == "request"
+    assert client.get(f"/debug/profiles/{profile_id}.folded").status_code == 200
+    assert client.get("/debug/profiles/../../etc").status_code == 404
@@ -0,0 +1,292 @@
+"""Tests for modules/prompt_cache with the local backend."""
+
+import threading
+
+import pytest
+
+from google.genai import errors
+
+import modules.prompt_cache as prompt_cache
+from modules.prompt_cache import (
+    CacheMissError,
+    GeminiCacheBackend,
+    LocalCacheBackend,
+    PrefixRejectedError,
+    PromptPrefixCache,
+)
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(prompt_cache.time, "time", clock)
+    return clock
+
+
+class CountingBackend(LocalCacheBackend):
+    def __init__(self, generate_fn=lambda model, prompt: f"{model}|{prompt}"):
+        super().__init__(generate_fn)
+        self.calls = {"create": 0, "extend": 0, "delete": 0}
+
+    def create(self, model, prefix, ttl_seconds):
+        self.calls["create"] += 1
+        return super().create(model, prefix, ttl_seconds)
+
+    def extend(self, name, ttl_seconds):
+        self.calls["extend"] += 1
+        super().extend(name, ttl_seconds)
+
+    def delete(self, name):
+        self.calls["delete"] += 1
+        super().delete(name)
+
+
+class RefusingBackend(CountingBackend):
+    def create(self, model, prefix, ttl_seconds):
+        self.calls["create"] += 1
+        raise PrefixRejectedError("prefix below minimum token count")
+
+
+class FlakyBackend(CountingBackend):
+    """create fails `failures` times (provider 5xx / timeout), then works."""
+
+    def __init__(self, failures=1):
+        super().__init__()
+        self.failures = failures
+
+    def create(self, model, prefix, ttl_seconds):
+        if self.failures:
+            self.failures -= 1
+            self.calls["create"] += 1
+            raise TimeoutError("provider timeout")
+        return super().create(model, prefix, ttl_seconds)
+
+
+def test_prefix_is_created_once_and_reused(clock):
+    backend = CountingBackend()
+    cache = PromptPrefixCache(backend, ttl_seconds=100, refresh_margin_seconds=30)
+
+    assert cache.generate("m", "PREFIX:", "one") == "m|PREFIX:one"
+    assert cache.generate("m", "PREFIX:", "two") == "m|PREFIX:two"
+    assert backend.calls["create"] == 1
+    assert cache.stats["created"] == 1
+    assert cache.stats["hits"] == 1
+
+
+def test_entry_is_refreshed_inside_the_margin(clock):
+    backend = CountingBackend()
+    cache = PromptPrefixCache(backend, ttl_seconds=100, refresh_margin_seconds=30)
+    cache.generate("m", "PREFIX:", "one")
+
+    clock.now += 80            # 20s left, inside the 30s margin
+    assert cache.generate("m", "PREFIX:", "two") == "m|PREFIX:two"
+    assert backend.calls == {"create": 1, "extend": 1, "delete": 0}
+    assert cache.stats["refreshed"] == 1
+
+    clock.now += 60            # still valid thanks to the refresh
+    cache.generate("m", "PREFIX:", "three")
+    assert backend.calls["create"] == 1
+
+
+def test_expired_entry_is_recreated_and_old_cache_released(clock):
+    backend = CountingBackend()
+    cache = PromptPrefixCache(backend, ttl_seconds=100, refresh_margin_seconds=30)
+    cache.generate("m", "PREFIX:", "one")
+
+    old_name = next(iter(backend._prefixes))
+
+    clock.now += 150
+    assert cache.generate("m", "PREFIX:", "two") == "m|PREFIX:two"
+    assert backend.calls["create"] == 2
+    assert backend.calls["extend"] == 0
+    assert backend.calls["delete"] == 1
+    assert old_name not in backend._prefixes
+    assert len(cache) == 1
+
+
+def test_refused_prefix_falls_back_without_retrying(clock):
+    backend = RefusingBackend()
+    cache = PromptPrefixCache(backend, ttl_seconds=100)
+
+    assert cache.generate("m", "tiny", "one") is None
+    assert cache.generate("m", "tiny", "two") is None
+    assert backend.calls["create"] == 1
+    assert cache.stats["fallbacks"] == 2
+
+    clock.now += 101           # refusal is remembered for one TTL only
+    assert cache.generate("m", "tiny", "three") is None
+    assert backend.calls["create"] == 2
+
+
+def test_transient_create_failure_backs_off_briefly(clock):
+    backend = FlakyBackend(failures=1)
+    cache = PromptPrefixCache(backend, ttl_seconds=100, retry_seconds=5)
+
+    assert cache.generate("m", "PREFIX:", "one") is None
+    assert cache.generate("m", "PREFIX:", "two") is None
+    assert backend.calls["create"] == 1
+    assert cache.stats["create_errors"] == 1
+
+    clock.now += 6
+    assert cache.generate("m", "PREFIX:", "three") == "m|PREFIX:three"
+    assert backend.calls["create"] == 2
+
+
+def test_missing_cache_drops_the_entry_and_falls_back(clock):
+    backend = CountingBackend()
+    cache = PromptPrefixCache(backend, ttl_seconds=100, refresh_margin_seconds=30)
+    cache.generate("m", "PREFIX:", "one")
+
+    backend._prefixes.clear()          # provider dropped the cache early
+    assert cache.generate("m", "PREFIX:", "two") is None
+    assert cache.stats["fallbacks"] == 1
+    assert len(cache) == 0
+
+    assert cache.generate("m", "PREFIX:", "three") == "m|PREFIX:three"
+    assert backend.calls["create"] == 2
+
+
+def test_other_generate_errors_are_raised_and_keep_the_entry(clock):
+    def failing(model, prompt):
+        raise RuntimeError("response blocked by safety filters")
+
+    backend = CountingBackend(failing)
+    cache = PromptPrefixCache(backend, ttl_seconds=100, refresh_margin_seconds=30)
+
+    with pytest.raises(RuntimeError):
+        cache.generate("m", "PREFIX:", "one")
+    assert cache.stats["fallbacks"] == 0
+    assert len(cache) == 1
+
+
+def test_failed_refresh_keeps_the_valid_entry(clock):
+    class NoExtendBackend(CountingBackend):
+        def extend(self, name, ttl_seconds):
+            self.calls["extend"] += 1
+            raise TimeoutError("provider timeout")
+
+    backend = NoExtendBackend()
+    cache = PromptPrefixCache(backend, ttl_seconds=100, refresh_margin_seconds=30)
+    cache.generate("m", "PREFIX:", "one")
+
+    clock.now += 80
+    assert cache.generate("m", "PREFIX:", "two") == "m|PREFIX:two"
+    assert backend.calls == {"create": 1, "extend": 1, "delete": 0}
+
+
+def test_local_backend_expires_prefixes(clock):
+    backend = LocalCacheBackend(lambda model, prompt: prompt)
+    name = backend.create("m", "PREFIX:", 10)
+    assert backend.generate("m", name, "q") == "PREFIX:q"
+
+    clock.now += 11
+    with pytest.raises(CacheMissError):
+        backend.generate("m", name, "q")
+    with pytest.raises(CacheMissError):
+        backend.extend(name, 10)
+
+
+def test_entries_are_bounded(clock):
+    backend = CountingBackend()
+    cache = PromptPrefixCache(backend, ttl_seconds=100, max_entries=2)
+
+    for i in range(4):
+        clock.now += 1
+        cache.generate("m", f"PREFIX {i}:", "q")
+
+    assert len(cache) == 2
+    assert cache.stats["evicted"] == 2
+    assert backend.calls["delete"] == 2
+    assert len(backend._prefixes) == 2
+
+
+def test_concurrent_callers_share_one_create():
+    started = threading.Event()
+    release = threading.Event()
+
+    class SlowBackend(CountingBackend):
+        def create(self, model, prefix, ttl_seconds):
+            started.set()
+            release.wait(5)
+            return super().create(model, prefix, ttl_seconds)
+
+    backend = SlowBackend()
+    cache = PromptPrefixCache(backend)
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.generate("m", "P:", "q")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    assert started.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["m|P:q"] * 5
+    assert backend.calls["create"] == 1
+
+
+# ---------------------------------------------------------
+# Gemini backend error translation
+# ---------------------------------------------------------
+
+def _client_error(code, message):
+    status = {400: "INVALID_ARGUMENT", 403: "PERMISSION_DENIED", 404: "NOT_FOUND"}[code]
+    return errors.ClientError(code, {"error": {"code": code, "message": message, "status": status}})
+
+
+class FakeGeminiClient:
+    def __init__(self, create_error=None, generate_error=None):
+        class Caches:
+            def create(self, **_kwargs):
+                if create_error:
+                    raise create_error
+                return type("Cache", (), {"name": "cachedContents/1"})()
+
+        class Models:
+            def generate_content(self, **_kwargs):
+                if generate_error:
+                    raise generate_error
+                return type("Response", (), {"text": "ok"})()
+
+        self.caches = Caches()
+        self.models = Models()
+
+
+def test_gemini_backend_translates_missing_cache():
+    missing = _client_error(404, "CachedContent not found")
+    backend = GeminiCacheBackend(FakeGeminiClient(generate_error=missing))
+    with pytest.raises(CacheMissError):
+        backend.generate("m", "cachedContents/1", "q")
+
+    expired = _client_error(403, "Cache has expired")
+    backend = GeminiCacheBackend(FakeGeminiClient(generate_error=expired))
+    with pytest.raises(CacheMissError):
+        backend.generate("m", "cachedContents/1", "q")
+
+
+def test_gemini_backend_translates_refused_prefix():
+    too_small = _client_error(400, "Cached content is too small")
+    backend = GeminiCacheBackend(FakeGeminiClient(create_error=too_small))
+    with pytest.raises(PrefixRejectedError):
+        backend.create("m", "tiny", 60)
+
+
+def test_gemini_backend_raises_other_errors():
+    server_error = errors.ServerError(
+        503, {"error": {"code": 503, "message": "overloaded", "status": "UNAVAILABLE"}}
+    )
+    backend = GeminiCacheBackend(FakeGeminiClient(generate_error=server_error))
+    with pytest.raises(errors.ServerError):
+        backend.generate("m", "cachedContents/1", "q")
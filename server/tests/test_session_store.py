@@ -0,0 +1,101 @@
+"""Tests for modules/session_store: sliding TTL and LRU eviction."""
+
+import pytest
+
+import modules.session_store as session_store_module
+from modules.contract_store import ContractStore
+from modules.session_store import SessionNotFoundError, SessionStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_store_module.time, "time", clock)
+    return clock
+
+
+def test_create_cleans_email_and_parses_contract_once(clock):
+    store = SessionStore()
+    session_id = store.create(
+        "Dear Counsel,\r\n\r\nIs the fee fixed?  ",
+        {"intent": "query"},
+        contract_text="9.1 Fees are fixed for the initial term.",
+    )
+
+    session = store.get(session_id)
+    assert session["email_text"] == "Dear Counsel,\n\nIs the fee fixed?"
+    assert isinstance(session["contract_store"], ContractStore)
+    assert store.get(session_id)["contract_store"] is session["contract_store"]
+
+
+def test_ttl_slides_on_use(clock):
+    store = SessionStore(ttl_seconds=60)
+    session_id = store.create("email", {})
+
+    clock.now += 50
+    store.get(session_id)
+    clock.now += 50
+    assert store.get(session_id)["email_text"] == "email"
+
+    clock.now += 61
+    with pytest.raises(SessionNotFoundError):
+        store.get(session_id)
+    assert len(store) == 0
+
+
+def test_expired_session_cannot_be_updated(clock):
+    store = SessionStore(ttl_seconds=60)
+    session_id = store.create("email", {})
+
+    clock.now += 61
+    with pytest.raises(SessionNotFoundError):
+        store.update(session_id, analysis={"intent": "renewal"})
+    assert len(store) == 0
+
+
+def test_least_recently_used_session_is_evicted_first(clock):
+    store = SessionStore(max_sessions=2)
+    first = store.create("first", {})
+    second = store.create("second", {})
+
+    store.get(first)
+    third = store.create("third", {})
+
+    assert len(store) == 2
+    store.get(first)
+    store.get(third)
+    with pytest.raises(SessionNotFoundError):
+        store.get(second)
+
+
+def test_byte_budget_evicts_oldest(clock):
+    store = SessionStore(max_bytes=60)
+    first = store.create("a" * 20, {})
+    second = store.create("b" * 20, {})
+    third = store.create("c" * 20, {})
+
+    with pytest.raises(SessionNotFoundError):
+        store.get(first)
+    assert store.get(second) and store.get(third)
+
+
+def test_update_replaces_analysis_and_tracks_size(clock):
+    store = SessionStore(max_bytes=100)
+    session_id = store.create("email", {"intent": "query"})
+
+    session = store.update(session_id, analysis={"intent": "renewal"})
+    assert session["analysis"] == {"intent": "renewal"}
+    assert store._bytes == session["size"]
+
+    store.delete(session_id)
+    assert len(store) == 0 and store._bytes == 0
+    with pytest.raises(SessionNotFoundError):
+        store.update(session_id, analysis={})
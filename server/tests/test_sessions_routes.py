@@ -0,0 +1,126 @@
+"""Tests for the session workflow over HTTP (X-Session-Id) and WebSocket."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import modules.session_store as session_store_module
+import routes.analyze
+import routes.sessions
+import services.drafting_service as drafting_service
+import services.session_service as session_service
+from main import app
+from modules.session_store import SessionStore
+
+ANALYSIS = {
+    "intent": "query",
+    "primary_topic": "fees",
+    "questions": ["Are the fees fixed?"],
+    "urgency_level": "low",
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    store = SessionStore(ttl_seconds=60)
+    drafts = []
+
+    async def fake_analyze(email_text):
+        return dict(ANALYSIS)
+
+    def fake_draft(analysis, clauses, original_email):
+        drafts.append((analysis, clauses, original_email))
+        return f"Draft for {analysis['intent']}"
+
+    for module in (session_service, routes.sessions):
+        monkeypatch.setattr(module, "session_store", store)
+    for module in (routes.analyze, routes.sessions):
+        monkeypatch.setattr(module, "analyze_email_service", fake_analyze)
+    monkeypatch.setattr(drafting_service, "generate_draft_reply", fake_draft)
+    monkeypatch.setattr(drafting_service.settings, "SPECULATIVE_DRAFT_ENABLED", False)
+
+    client = TestClient(app)
+    client.drafts = drafts
+    return client
+
+
+def test_analyze_returns_session_usable_by_draft(client):
+    analyzed = client.post(
+        "/analyze/",
+        json={"email_text": "Are the fees fixed?", "contract_text": "9.1 Fees are fixed."},
+    )
+    session_id = analyzed.headers["X-Session-Id"]
+
+    drafted = client.post(
+        "/draft/", json={"session_id": session_id, "analysis_patch": {"intent": "renewal"}}
+    )
+    assert drafted.status_code == 200
+    assert drafted.json() == {"draft": "Draft for renewal"}
+    assert client.drafts[0][2] == "Are the fees fixed?"
+
+    session = client.get(f"/sessions/{session_id}").json()
+    assert session["analysis"]["intent"] == "renewal"
+    assert session["has_contract"] is True
+
+
+def test_unknown_session_is_404(client):
+    assert client.post("/draft/", json={"session_id": "missing"}).status_code == 404
+    assert client.get("/sessions/missing").status_code == 404
+
+
+def test_expired_session_is_404(client, monkeypatch):
+    session_id = client.post("/analyze/", json={"email_text": "Hi"}).headers["X-Session-Id"]
+    later = session_store_module.time.time() + 61
+    monkeypatch.setattr(session_store_module.time, "time", lambda: later)
+
+    assert client.post("/draft/", json={"session_id": session_id}).status_code == 404
+
+
+def test_deleted_session_is_gone(client):
+    session_id = client.post("/analyze/", json={"email_text": "Hi"}).headers["X-Session-Id"]
+
+    assert client.delete(f"/sessions/{session_id}").json() == {"deleted": session_id}
+    assert client.get(f"/sessions/{session_id}").status_code == 404
+
+
+def test_websocket_analyze_then_draft(client):
+    with client.websocket_connect("/sessions/ws") as ws:
+        ws.send_json({
+            "action": "analyze",
+            "email_text": "Are the fees fixed?",
+            "contract_text": "9.1 Fees are fixed.",
+        })
+        analysis = ws.receive_json()
+        assert analysis["type"] == "analysis"
+        assert analysis["analysis"] == ANALYSIS
+
+        ws.send_json({"action": "draft", "analysis_patch": {"intent": "renewal"}})
+        draft = ws.receive_json()
+
+    assert draft == {
+        "type": "draft",
+        "session_id": analysis["session_id"],
+        "draft": "Draft for renewal",
+    }
+
+
+def test_websocket_resume_and_errors(client):
+    session_id = client.post("/analyze/", json={"email_text": "Hi"}).headers["X-Session-Id"]
+
+    with client.websocket_connect("/sessions/ws") as ws:
+        ws.send_json({"action": "draft"})
+        assert ws.receive_json()["type"] == "error"
+
+        ws.send_json({"action": "resume", "session_id": "missing"})
+        assert ws.receive_json() == {"type": "error", "detail": "Session not found or expired"}
+
+        ws.send_json({"action": "resume", "session_id": session_id})
+        assert ws.receive_json()["session_id"] == session_id
+
+        ws.send_json({"action": "draft"})
+        assert ws.receive_json()["type"] == "draft"
+
+        ws.send_json({"action": "analyze"})
+        assert ws.receive_json() == {"type": "error", "detail": "Missing field: 'email_text'"}
+
+        ws.send_json({"action": "explode"})
+        assert ws.receive_json() == {"type": "error", "detail": "Unknown action: explode"}
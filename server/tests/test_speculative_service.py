@@ -0,0 +1,157 @@
+"""Tests for services/speculative_service scheduling, claiming and budget."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import services.speculative_service as speculative_service
+from modules.contract_store import ContractStore
+from services.speculative_service import SpeculativeDrafter
+
+
+EMAIL = "Dear Counsel, can we terminate the agreement early? Regards, Jane"
+ANALYSIS = {"intent": "termination", "questions": ["Can we terminate early?"]}
+CLAUSES = {"9.1": "Either party may terminate on 30 days' notice."}
+
+
+class FakeDrafter:
+    """Stand-in for generate_draft_reply; blocks until `release` is set."""
+
+    def __init__(self, blocking: bool = False):
+        self.release = threading.Event()
+        if not blocking:
+            self.release.set()
+        self.calls = 0
+        self.finished = 0
+
+    def __call__(self, analysis, clauses, original_email):
+        self.calls += 1
+        self.release.wait(5)
+        self.finished += 1
+        return f"draft for {analysis['intent']} using {sorted(clauses)}"
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeDrafter()
+    monkeypatch.setattr(speculative_service, "generate_draft_reply", fake)
+    return fake
+
+
+@pytest.fixture
+def blocking(monkeypatch):
+    fake = FakeDrafter(blocking=True)
+    monkeypatch.setattr(speculative_service, "generate_draft_reply", fake)
+    yield fake
+    fake.release.set()
+
+
+async def _wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def test_hit_returns_the_speculative_draft(fake):
+    async def scenario():
+        drafter = SpeculativeDrafter()
+        assert drafter.schedule(EMAIL, ANALYSIS, CLAUSES)
+        assert drafter.schedule(EMAIL, ANALYSIS, CLAUSES)      # same key: no second call
+        # Raw /draft email and the cleaned session email claim the same job
+        return drafter, await drafter.claim(f"  {EMAIL}\n\n", ANALYSIS, CLAUSES)
+
+    drafter, draft = asyncio.run(scenario())
+    assert draft == "draft for termination using ['9.1']"
+    assert fake.calls == 1
+    assert drafter.snapshot()["hits"] == 1
+    assert drafter.snapshot()["hit_rate"] == 1.0
+
+
+def test_edited_analysis_misses_and_cancels(fake):
+    async def scenario():
+        drafter = SpeculativeDrafter()
+        drafter.schedule(EMAIL, ANALYSIS, CLAUSES)
+        edited = dict(ANALYSIS, intent="renewal")
+        return drafter, await drafter.claim(EMAIL, edited, CLAUSES)
+
+    drafter, draft = asyncio.run(scenario())
+    assert draft is None
+    stats = drafter.snapshot()
+    assert stats["misses"] == 1
+    assert stats["cancelled"] == 1
+    assert stats["pending"] == 0
+
+
+def test_different_clauses_miss(fake):
+    async def scenario():
+        drafter = SpeculativeDrafter()
+        drafter.schedule(EMAIL, ANALYSIS, CLAUSES)
+        return await drafter.claim(EMAIL, ANALYSIS, {"10.2": "Notice in writing."})
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_new_analysis_supersedes_the_old_job(fake):
+    async def scenario():
+        drafter = SpeculativeDrafter()
+        drafter.schedule(EMAIL, ANALYSIS, CLAUSES)
+        drafter.schedule(EMAIL, dict(ANALYSIS, intent="renewal"), CLAUSES)
+        draft = await drafter.claim(EMAIL, dict(ANALYSIS, intent="renewal"), CLAUSES)
+        return drafter, draft
+
+    drafter, draft = asyncio.run(scenario())
+    assert draft == "draft for renewal using ['9.1']"
+    assert drafter.snapshot()["cancelled"] == 1
+
+
+def test_cancelled_call_keeps_its_budget_slot(blocking):
+    async def scenario():
+        drafter = SpeculativeDrafter(max_inflight=1)
+        assert drafter.schedule(EMAIL, ANALYSIS, CLAUSES)
+        await _wait_until(lambda: blocking.calls == 1)
+
+        # Editing the analysis cancels the job, but its thread is still running
+        assert await drafter.claim(EMAIL, dict(ANALYSIS, intent="renewal"), CLAUSES) is None
+        other = "Please send the signed NDA for the Berlin office."
+        assert not drafter.schedule(other, ANALYSIS, CLAUSES)
+        assert drafter.snapshot()["skipped_budget"] == 1
+        assert drafter.snapshot()["running"] == 1
+
+        blocking.release.set()
+        await _wait_until(lambda: drafter.snapshot()["running"] == 0)
+        assert drafter.schedule(other, ANALYSIS, CLAUSES)
+        return await drafter.claim(other, ANALYSIS, CLAUSES)
+
+    assert asyncio.run(scenario()) == "draft for termination using ['9.1']"
+    assert blocking.calls == 2
+
+
+def test_schedule_keys_on_the_resolved_contract(fake, monkeypatch):
+    drafter = SpeculativeDrafter()
+    monkeypatch.setattr(speculative_service, "speculative_drafter", drafter)
+    monkeypatch.setattr(speculative_service.settings, "SPECULATIVE_DRAFT_ENABLED", True)
+    registered = ContractStore.from_clauses({"4.1": "Fees are payable within 30 days."})
+
+    async def scenario():
+        speculative_service.schedule_speculative_draft(EMAIL, ANALYSIS, registered)
+        default_clauses = ContractStore(None).get_all_clauses()
+        miss = await drafter.claim(EMAIL, ANALYSIS, default_clauses)
+        speculative_service.schedule_speculative_draft(EMAIL, ANALYSIS, registered)
+        hit = await drafter.claim(EMAIL, ANALYSIS, registered.get_all_clauses())
+        return miss, hit
+
+    miss, hit = asyncio.run(scenario())
+    assert miss is None
+    assert hit == "draft for termination using ['4.1']"
+
+
+def test_disabled_schedules_nothing(fake, monkeypatch):
+    drafter = SpeculativeDrafter()
+    monkeypatch.setattr(speculative_service, "speculative_drafter", drafter)
+    monkeypatch.setattr(speculative_service.settings, "SPECULATIVE_DRAFT_ENABLED", False)
+
+    speculative_service.schedule_speculative_draft(EMAIL, ANALYSIS, None)
+    assert drafter.snapshot()["launched"] == 0
@@ -0,0 +1,45 @@
+"""Tests for utils/text_utils.iter_text_chunks boundaries."""
+
+from utils.text_utils import clean_text, iter_text_chunks
+
+
+def test_empty_input_yields_nothing():
+    assert list(iter_text_chunks("", 100)) == []
+    assert list(iter_text_chunks(None, 100)) == []
+
+
+def test_short_text_is_one_chunk():
+    assert list(iter_text_chunks("Hello there.", 100)) == ["Hello there."]
+
+
+def test_paragraphs_are_packed_up_to_max_chars():
+    paragraphs = ["A" * 30, "B" * 30, "C" * 30]
+    chunks = list(iter_text_chunks("\n\n".join(paragraphs), 70))
+    assert chunks == ["A" * 30 + "\n\n" + "B" * 30, "C" * 30]
+
+
+def test_long_paragraph_splits_on_sentences():
+    text = "First sentence here. Second sentence here. Third sentence here."
+    chunks = list(iter_text_chunks(text, 45))
+    assert all(len(chunk) <= 45 for chunk in chunks)
+    assert chunks[0].startswith("First sentence here.")
+    assert not any(chunk.startswith(" ") or chunk.endswith(" ") for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_oversized_sentence_is_hard_cut():
+    chunks = list(iter_text_chunks("x" * 25, 10))
+    assert chunks == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_every_chunk_respects_max_chars():
+    text = "\n\n".join(f"Paragraph {i}. " + "word " * (i * 7) for i in range(12))
+    chunks = list(iter_text_chunks(text, 80))
+    assert chunks
+    assert all(0 < len(chunk) <= 80 for chunk in chunks)
+
+
+def test_chunking_is_deterministic():
+    text = "One.\n\n\n\nTwo.   Three.\n\nFour."
+    assert list(iter_text_chunks(text, 8)) == list(iter_text_chunks(text, 8))
+    assert "\n\n\n" not in clean_text(text)
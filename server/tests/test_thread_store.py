@@ -0,0 +1,101 @@
+"""Tests for modules/thread_store thread lookup and recording."""
+
+from modules.thread_store import ThreadStore
+
+
+FIRST_MESSAGE = (
+    "We would like to renew the Master Services Agreement for another year.\n"
+    "Please confirm whether the current fee schedule still applies.\n"
+    "Our procurement team needs the signed renewal before the end of March.\n"
+    "Kind regards, Acme Supplies"
+)
+
+FOOTER = (
+    "This email is confidential and may be legally privileged.\n"
+    "If you are not the intended recipient please delete it immediately."
+)
+
+
+def headers(message_id=None, in_reply_to=None, references=None):
+    return {
+        "message_id": [message_id] if message_id else [],
+        "in_reply_to": [in_reply_to] if in_reply_to else [],
+        "references": list(references or []),
+    }
+
+
+def test_match_by_header():
+    store = ThreadStore()
+    tid = store.record(None, headers("<a1@acme.com>"), FIRST_MESSAGE, {"intent": "renewal"})
+
+    assert store.find_thread(headers(in_reply_to="<a1@acme.com>"), "") == tid
+    assert store.find_thread(headers(references=["<x@y.com>", "<a1@acme.com>"]), "") == tid
+    assert store.find_thread(headers(in_reply_to="<other@acme.com>"), "") is None
+    assert store.get_analysis(tid) == {"intent": "renewal"}
+
+
+def test_match_by_quoted_fingerprint():
+    store = ThreadStore()
+    tid = store.record(None, headers(), FIRST_MESSAGE, {"intent": "renewal"})
+
+    quoted = "\n".join(FIRST_MESSAGE.splitlines()[:3])
+    assert store.find_thread(headers(), quoted) == tid
+
+
+def test_single_quoted_line_is_not_enough():
+    store = ThreadStore()
+    store.record(None, headers(), FIRST_MESSAGE, {"intent": "renewal"})
+
+    quoted = FIRST_MESSAGE.splitlines()[0]
+    assert store.find_thread(headers(), quoted) is None
+
+
+def test_matches_must_cover_most_quoted_lines():
+    store = ThreadStore()
+    store.record(None, headers(), FIRST_MESSAGE, {"intent": "renewal"})
+
+    quoted = "\n".join(
+        FIRST_MESSAGE.splitlines()[:2]
+        + [
+            "The indemnity cap in clause 12 should be raised to two million.",
+            "Our insurer has asked for a copy of the liability schedule.",
+            "We also need the governing law changed to New York.",
+        ]
+    )
+    assert store.find_thread(headers(), quoted) is None
+
+
+def test_fingerprint_shared_by_several_threads_is_ignored():
+    store = ThreadStore()
+    first = store.record(
+        None, headers(), f"Please send the NDA for the Berlin office.\n{FOOTER}", {}
+    )
+    assert store.find_thread(headers(), FOOTER) == first
+
+    # Once a second thread records the same footer it no longer votes
+    store.record(None, headers(), f"Attached is the signed lease for Leeds.\n{FOOTER}", {})
+    assert store.find_thread(headers(), FOOTER) is None
+
+
+def test_record_updates_existing_thread():
+    store = ThreadStore()
+    tid = store.record(None, headers("<a1@acme.com>"), FIRST_MESSAGE, {"intent": "renewal"})
+    same = store.record(
+        tid, headers("<b2@firm.com>"), "Confirmed, the fee schedule applies.", {"intent": "confirm"}
+    )
+
+    assert same == tid
+    assert store.find_thread(headers(in_reply_to="<b2@firm.com>"), "") == tid
+    assert store.get_analysis(tid) == {"intent": "confirm"}
+
+
+def test_oldest_thread_is_evicted():
+    store = ThreadStore(max_threads=1)
+    old = store.record(None, headers("<a1@acme.com>"), FIRST_MESSAGE, {})
+    store.record(
+        None, headers("<z9@globex.com>"), "A different matter entirely, about the Leeds lease.", {}
+    )
+
+    assert store.get_analysis(old) is None
+    assert store.find_thread(headers(in_reply_to="<a1@acme.com>"), "") is None
+    assert store.find_thread(headers(), FIRST_MESSAGE) is None
@@ -0,0 +1,71 @@
+"""Tests for utils/thread_utils header handling and reply splitting."""
+
+from utils.thread_utils import (
+    extract_thread_headers,
+    split_new_and_quoted,
+    strip_thread_headers,
+)
+
+
+RAW = (
+    "From: Jane Doe <jane@acme.com>\n"
+    "Subject: Re: Renewal\n"
+    "Message-ID: <b2@acme.com>\n"
+    "In-Reply-To: <a1@firm.com>\n"
+    "References: <a0@acme.com>\n"
+    "  <a1@firm.com>\n"
+    "\n"
+    "Dear Counsel,\n\n"
+    "Please confirm the renewal terms.\n"
+)
+
+
+def test_headers_read_from_leading_block():
+    headers = extract_thread_headers(RAW)
+    assert headers == {
+        "message_id": ["<b2@acme.com>"],
+        "in_reply_to": ["<a1@firm.com>"],
+        "references": ["<a0@acme.com>", "<a1@firm.com>"],
+    }
+
+
+def test_strip_keeps_other_headers_and_body():
+    stripped = strip_thread_headers(RAW)
+    assert "Message-ID" not in stripped
+    assert "References" not in stripped
+    assert "From: Jane Doe <jane@acme.com>" in stripped
+    assert stripped.endswith("Please confirm the renewal terms.")
+
+
+def test_body_references_line_is_content():
+    email = (
+        "Dear Counsel,\n\n"
+        "References: Master Services Agreement dated 10 March 2023, clause 9.1\n"
+        "Message-ID: <not-a-header@acme.com>\n\n"
+        "Can we terminate early?"
+    )
+    assert extract_thread_headers(email) == {
+        "message_id": [],
+        "in_reply_to": [],
+        "references": [],
+    }
+    assert "References: Master Services Agreement dated 10 March 2023, clause 9.1" in (
+        strip_thread_headers(email)
+    )
+
+
+def test_header_without_message_id_is_kept():
+    email = "References: Master Services Agreement dated 10 March 2023\n\nCan we terminate early?"
+    assert extract_thread_headers(email)["references"] == []
+    assert strip_thread_headers(email).startswith("References: Master Services Agreement")
+
+
+def test_split_new_and_quoted():
+    reply = (
+        "Thanks, see my answer below.\n\n"
+        "On Mon, 3 Mar 2025, Jane Doe wrote:\n"
+        "> Please confirm the renewal terms.\n"
+    )
+    new_text, quoted = split_new_and_quoted(reply)
+    assert new_text == "Thanks, see my answer below."
+    assert quoted == "Please confirm the renewal terms."
@@ -0,0 +1,151 @@
+"""
+analysis_utils.py
+
+Helpers for combining AnalysisSchema dicts:
+    - Merging a follow-up message's analysis into its thread's analysis
+    - Reducing per-chunk analyses of one long email into one result
+    - Applying a client-side edit (patch) to a stored analysis
+    - Urgency ordering
+
+Used By:
+    - analyzer_service.py (thread-aware incremental analysis)
+    - analyzer.py (chunked long-input analysis)
+    - session_service.py (analysis patches)
+"""
+
+from typing import Any, Dict, List
+
+
+URGENCY_ORDER = {"low": 0, "medium": 1, "high": 2}
+
+# AnalysisSchema default for text fields the LLM did not provide;
+# merging treats it as missing, never as a real value
+UNKNOWN = "unknown"
+
+
+# ============================================================
+# URGENCY
+# ============================================================
+
+def max_urgency(a: str | None, b: str | None) -> str:
+    """Return the more urgent of two urgency levels ("low" if both unknown)."""
+    a = (a or "low").lower()
+    b = (b or "low").lower()
+    return a if URGENCY_ORDER.get(a, 0) >= URGENCY_ORDER.get(b, 0) else b
+
+
+# ============================================================
+# MERGING
+# ============================================================
+
+def _known(value: Any) -> Any:
+    """None for missing values, including the schema's "unknown" default."""
+    if value in (None, "") or value == UNKNOWN:
+        return None
+    return value
+
+
+def _union_questions(first: List[str], second: List[str]) -> List[str]:
+    """Ordered union; questions differing only in case/whitespace count once."""
+    seen = set()
+    merged = []
+    for q in list(first or []) + list(second or []):
+        key = " ".join(str(q).lower().split()).rstrip("?.")
+        if key and key not in seen:
+            seen.add(key)
+            merged.append(q)
+    return merged
+
+
+def _fill_nulls(base: Dict[str, Any] | None, update: Dict[str, Any] | None) -> Dict[str, Any]:
+    """Keep base values; take update values only where base is empty."""
+    merged = dict(base or {})
+    for key, value in (update or {}).items():
+        if merged.get(key) in (None, "") and value not in (None, ""):
+            merged[key] = value
+    return merged
+
+
+def merge_analyses(base: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge the analysis of a NEW message (`update`) into the analysis
+    of the thread so far (`base`).
+
+    Rules:
+        - intent            → latest message's intent (what they want now)
+        - primary_topic     → kept from the thread, filled if missing
+          ("unknown" counts as missing for both)
+        - parties / agreement_reference → kept, nulls filled from update
+        - questions         → ordered union (thread questions first)
+        - requested_due_date→ latest non-null date wins
+        - urgency_level     → the higher of the two
+
+    Returns:
+        dict in AnalysisSchema shape
+    """
+    return {
+        "intent": _known(update.get("intent")) or _known(base.get("intent")) or UNKNOWN,
+        "primary_topic": (
+            _known(base.get("primary_topic")) or _known(update.get("primary_topic")) or UNKNOWN
+        ),
+        "parties": _fill_nulls(base.get("parties"), update.get("parties")),
+        "agreement_reference": _fill_nulls(
+            base.get("agreement_reference"), update.get("agreement_reference")
+        ),
+        "questions": _union_questions(base.get("questions"), update.get("questions")),
+        "requested_due_date": update.get("requested_due_date") or base.get("requested_due_date"),
+        "urgency_level": max_urgency(base.get("urgency_level"), update.get("urgency_level")),
+    }
+
+
+def reduce_chunk_analyses(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine analyses of consecutive chunks of ONE email, in chunk order.
+
+    Unlike merge_analyses (newest wins), the earliest chunk that states a
+    field wins ("unknown" does not count): the opening of an email
+    carries the intent, parties and agreement reference. Questions are
+    unioned in order and urgency takes the highest level. Same input
+    order → same output.
+
+    Returns:
+        dict in AnalysisSchema shape
+    """
+    merged: Dict[str, Any] = {
+        "intent": None,
+        "primary_topic": None,
+        "parties": {},
+        "agreement_reference": {},
+        "questions": [],
+        "requested_due_date": None,
+        "urgency_level": "low",
+    }
+    for part in parts:
+        for key in ("intent", "primary_topic", "requested_due_date"):
+            merged[key] = merged[key] or _known(part.get(key))
+        merged["parties"] = _fill_nulls(merged["parties"], part.get("parties"))
+        merged["agreement_reference"] = _fill_nulls(
+            merged["agreement_reference"], part.get("agreement_reference")
+        )
+        merged["questions"] = _union_questions(merged["questions"], part.get("questions"))
+        merged["urgency_level"] = max_urgency(merged["urgency_level"], part.get("urgency_level"))
+
+    for key in ("intent", "primary_topic"):
+        merged[key] = merged[key] or UNKNOWN
+    return merged
+
+
+def apply_analysis_patch(analysis: Dict[str, Any], patch: Dict[str, Any] | None) -> Dict[str, Any]:
+    """
+    Apply a partial edit to an analysis.
+
+    Nested objects (parties, agreement_reference) are merged key by key;
+    every other value — including lists such as questions — is replaced.
+    """
+    merged = dict(analysis)
+    for key, value in (patch or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = {**merged[key], **value}
+        else:
+            merged[key] = value
+    return merged
@@ -2,6 +2,9 @@
 clause_utils.py
 
 Helper utilities for:
+    - Deterministic clause parsing from contract text
+    - Clause term extraction (search index)
+    - Per-question clause relevance (parallel drafting)
     - Clause substring search
     - Light fuzzy matching for fallback
     - Pretty formatting for clause excerpts
@@ -10,9 +13,145 @@ Used By:
     - contract_store.py
     - analyzer_service (optional)
     - mcp_tools.py
+    - contract_registry.py
+    - drafter.py
 """
 
-from typing import Dict, List, Tuple
+import re
+from typing import Dict, List, Set, Tuple
+
+
+# ============================================================
+# CLAUSE PARSING
+# ============================================================
+
+# "Clause 9.1: ...", "Section 10.2 - ...", "9.1 ...", "9.1. ...", "1. Definitions"
+_CLAUSE_HEADER_RE = re.compile(
+    r"^\s*(?P<label>(?:clause|section|article)\s+)?(?P<num>\d+(?:\.\d+)*)(?P<punct>[.)])?"
+    r"\s*[:\-–—]?\s+(?P<body>.*)$",
+    re.IGNORECASE,
+)
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have if in into is it its of on or "
+    "our shall that the their this to under upon was we were what whether which "
+    "will with within without you your any all may must other party parties".split()
+)
+
+
+def parse_clauses(text: str | None) -> Dict[str, str]:
+    """
+    Split contract text into numbered clauses (no LLM, no guessing).
+
+    A clause starts at a line beginning with a "Clause" / "Section" /
+    "Article" label and a number, or with an unlabelled clause number:
+    "9.1 Either ...", "12.1 either ...", "1. Definitions". Following
+    lines belong to it until the next clause header.
+
+    Unlabelled headers are rejected when the previous line stops
+    mid-sentence ("... capped at a total of" / "2.5 million dollars"),
+    or when their number was already parsed. Any dotted number is
+    accepted otherwise — excerpts may skip sections or run out of
+    order. A bare "3." / "3)" must also continue the numbering and
+    start with a capital letter, so numbered lists inside a clause
+    ("1. act diligently;") stay in it.
+
+    Returns:
+        { "9.1": "text", ... } in document order (first occurrence wins)
+    """
+    clauses: Dict[str, str] = {}
+    current_id = None
+    current_lines: List[str] = []
+    previous_line = ""
+
+    def flush():
+        if current_id and current_id not in clauses:
+            body = " ".join(" ".join(current_lines).split())
+            if body:
+                clauses[current_id] = body
+
+    for line in (text or "").splitlines():
+        match = _CLAUSE_HEADER_RE.match(line)
+        if match and _is_header(match, current_id, previous_line, clauses):
+            flush()
+            current_id = match.group("num")
+            current_lines = [match.group("body")]
+        elif current_id:
+            current_lines.append(line)
+        previous_line = line
+
+    flush()
+    return clauses
+
+
+def _clause_key(cid: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in cid.split("."))
+
+
+def _ends_mid_sentence(line: str) -> bool:
+    """A wrapped body line: ends on a comma, or is a long line ending on a lower-case word."""
+    line = line.rstrip()
+    if line.endswith(","):
+        return True
+    return bool(re.search(r"[a-z0-9]$", line)) and len(line.split()) > 4
+
+
+def _is_header(
+    match: re.Match,
+    previous_id: str | None,
+    previous_line: str,
+    clauses: Dict[str, str],
+) -> bool:
+    if match.group("label"):
+        return True
+
+    num = match.group("num")
+    if num in clauses or num == previous_id or _ends_mid_sentence(previous_line):
+        return False
+    if "." in num:
+        return True
+
+    # Bare number ("3." / "3)"): a top-level header, or a list item
+    if not match.group("punct") or not re.match(r"[A-Z\"“(]", match.group("body")):
+        return False
+    return previous_id is None or _clause_key(num) > _clause_key(previous_id)
+
+
+def clause_terms(text: str) -> Set[str]:
+    """Lower-cased content words (>= 3 chars, no stopwords) of a text."""
+    return {
+        word for word in re.findall(r"[a-z0-9]+", (text or "").lower())
+        if len(word) >= 3 and word not in STOPWORDS
+    }
+
+
+# ============================================================
+# PER-QUESTION RELEVANCE
+# ============================================================
+
+_CLAUSE_REF_RE = re.compile(r"\b\d+(?:\.\d+)+\b")
+
+
+def _stems(text: str) -> Set[str]:
+    # Crude prefix stem: "terminate" / "termination" → "termin"
+    return {term[:6] for term in clause_terms(text)}
+
+
+def relevant_clauses(question: str, clauses: Dict[str, str]) -> Dict[str, str]:
+    """
+    Clauses a single question needs: those it cites by number plus those
+    sharing a content word (prefix-stemmed) with it, in contract order.
+    Falls back to ALL clauses when nothing matches, so an answer never
+    loses context it might need.
+    """
+    cited = set(_CLAUSE_REF_RE.findall(question or ""))
+    stems = _stems(question)
+
+    selected = {
+        cid: text for cid, text in clauses.items()
+        if cid in cited or stems & _stems(text)
+    }
+    return selected or dict(clauses)
 
 
 # ============================================================
@@ -4,16 +4,21 @@ date_utils.py
 Provides:
     - Robust date parsing from loose natural-language formats
     - Safe ISO-8601 standardization
+    - Finding / masking date mentions inside free text
     - Urgency calculation based on due date
         * high   -> <= 2 days from today
         * medium -> <= 7 days
         * low    -> otherwise
+    - Local urgency estimate of raw text (deferral decisions)
 
 Used By:
     - analyzer.py
     - MCP tool: tool_compute_urgency_level
+    - near_duplicate_index.py
+    - job_service.py
 """
 
+import re
 from datetime import datetime, timedelta
 from dateutil import parser as date_parse
 
@@ -36,6 +41,12 @@ def parse_date_safe(date_str: str | None) -> str | None:
     if not date_str or not date_str.strip():
         return None
 
+    # Already ISO: dayfirst=True would swap month/day on "YYYY-MM-DD"
+    try:
+        return datetime.strptime(date_str.strip(), "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        pass
+
     try:
         dt = date_parse.parse(date_str, dayfirst=True)
         return dt.date().isoformat()  # YYYY-MM-DD
@@ -43,6 +54,46 @@ def parse_date_safe(date_str: str | None) -> str | None:
         return None
 
 
+# ============================================================
+# DATE MENTIONS IN TEXT
+# ============================================================
+
+_MONTH = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|"
+    r"aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+)
+
+DATE_MENTION_RE = re.compile(
+    r"\b(?:"
+    rf"\d{{1,2}}(?:st|nd|rd|th)?\s+{_MONTH}\.?,?\s+\d{{4}}"      # 18 November 2025
+    rf"|{_MONTH}\.?\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+\d{{4}}"      # November 18, 2025
+    r"|\d{4}-\d{2}-\d{2}"                                      # 2025-11-18
+    r"|\d{1,2}[/.]\d{1,2}[/.]\d{2,4}"                            # 18/11/2025
+    r")\b",
+    re.IGNORECASE,
+)
+
+
+def find_date_mentions(text: str | None) -> list[tuple[str, str]]:
+    """
+    Find explicit dates in free text, in order of appearance.
+
+    Returns:
+        list[ (raw_text, iso_date) ] — unparseable matches are skipped
+    """
+    mentions = []
+    for match in DATE_MENTION_RE.finditer(text or ""):
+        iso = parse_date_safe(match.group(0))
+        if iso:
+            mentions.append((match.group(0), iso))
+    return mentions
+
+
+def mask_dates(text: str | None, token: str = "<date>") -> str:
+    """Replace every explicit date mention with a fixed token."""
+    return DATE_MENTION_RE.sub(token, text or "")
+
+
 # ============================================================
 # URGENCY CALCULATION
 # ============================================================
@@ -78,3 +129,28 @@ def compute_urgency(due_date_iso: str | None) -> str:
     if delta <= 7:
         return "medium"
     return "low"
+
+
+# Phrases the analyzer prompt treats as high urgency
+URGENT_PHRASE_RE = re.compile(
+    r"\b(?:asap|urgent(?:ly)?|immediately|today|tomorrow|end of (?:the )?day|eod|before noon)\b",
+    re.IGNORECASE,
+)
+
+
+def estimate_urgency(text: str | None) -> str:
+    """
+    Local (no LLM) urgency estimate of raw email text.
+
+    Urgent phrases → "high"; otherwise the most urgent compute_urgency()
+    over every explicit date mentioned. Conservative: any date in the
+    past or near future counts, so "low" means nothing looks pressing.
+    """
+    if URGENT_PHRASE_RE.search(text or ""):
+        return "high"
+
+    levels = {compute_urgency(iso) for _raw, iso in find_date_mentions(text)}
+    for level in ("high", "medium"):
+        if level in levels:
+            return level
+    return "low"
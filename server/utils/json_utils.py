@@ -0,0 +1,272 @@
+"""
+json_utils.py
+
+Tolerant extraction of a JSON object from LLM output.
+
+Handles, in a single pass over the text:
+    - Markdown code fences (```json ... ```)
+    - Leading / trailing prose around the object
+    - Smart double quotes used as string delimiters (kept as-is inside strings)
+    - Unescaped quotes inside strings (a quote only closes a string when
+      followed by , : } ] or the end of the text)
+    - Trailing commas before } or ]
+    - Python literals (True / False / None)
+    - Raw newlines / tabs inside strings
+    - Truncated output: cut back to the last complete member of each open
+      container (a half-written string, number or key is dropped, never
+      returned as if valid), then closed
+
+Every repair is counted so /metrics can show how many LLM round trips
+were saved.
+
+Used By:
+    - analyzer.py
+    - parser.py
+"""
+
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+_SMART_QUOTES = "“”"
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_CLOSERS = {"{": "}", "[": "]"}
+_FENCE_OPEN_RE = re.compile(r"```[\w-]*[ \t]*\r?\n?")
+
+_stats: Counter = Counter()
+_stats_lock = threading.Lock()
+
+
+# ============================================================
+# PUBLIC API
+# ============================================================
+
+def extract_json_object(raw: str | None) -> Tuple[Dict[str, Any] | None, List[str]]:
+    """
+    Parse the first JSON object in `raw`, repairing common defects.
+
+    Returns:
+        (obj, repairs)
+        obj     → dict, or None if no object could be recovered
+        repairs → names of repairs applied ([] for clean JSON)
+    """
+    text = (raw or "").strip()
+
+    try:
+        obj = json.loads(text)
+        if isinstance(obj, dict):
+            _record("clean", [])
+            return obj, []
+    except ValueError:
+        pass
+
+    repairs: List[str] = []
+    text = _strip_fence(text, repairs)
+
+    start = text.find("{")
+    if start < 0:
+        _record("failed", repairs)
+        return None, repairs
+    if start > 0:
+        repairs.append("surrounding_text")
+
+    obj = _repair_and_load(text[start:], repairs)
+    if obj is None:
+        _record("failed", repairs)
+        return None, repairs
+
+    _record("repaired", repairs)
+    logger.info("Repaired LLM JSON output: %s", ", ".join(sorted(set(repairs))))
+    return obj, repairs
+
+
+def get_repair_stats() -> Dict[str, int]:
+    """
+    Counters since process start:
+        clean / repaired / failed   → outcome per call
+        repair:<name>               → how often each repair was needed
+    `repaired` is the number of LLM round trips saved.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+# ============================================================
+# INTERNALS
+# ============================================================
+
+def _record(outcome: str, repairs: List[str]) -> None:
+    with _stats_lock:
+        _stats[outcome] += 1
+        for name in set(repairs):
+            _stats[f"repair:{name}"] += 1
+
+
+def _strip_fence(text: str, repairs: List[str]) -> str:
+    """
+    Remove a ``` fence wrapping the payload: the opening fence (and any
+    prose before it) when it precedes the first "{", and a closing fence
+    that ends the text. A ``` inside a string value is content.
+    """
+    open_at = text.find("```")
+    brace = text.find("{")
+    if open_at < 0 or 0 <= brace < open_at:
+        return text
+
+    repairs.append("markdown_fence")
+    body = text[_FENCE_OPEN_RE.match(text, open_at).end():].rstrip()
+    if body.endswith("```"):
+        body = body[:-3]
+    return body
+
+
+def _repair_and_load(text: str, repairs: List[str]) -> Dict[str, Any] | None:
+    """
+    Rewrite `text` (starting at "{") into valid JSON and load it.
+
+    The scanner keeps a stack of open containers. For each container it
+    remembers `safe_len`: the output length at which the container last
+    held only complete members (after a closed string value or nested
+    container, or before a ","), so a truncated tail is cut back to it.
+    `out` holds one character per element, so len(out) is the output length.
+    """
+    out: List[str] = []
+    stack: List[Dict[str, Any]] = []
+    in_string = False
+    string_is_value = False
+    string_closers = '"'
+    escape = False
+    i = 0
+    n = len(text)
+
+    while i < n:
+        ch = text[i]
+
+        if in_string:
+            if escape:
+                out.append(ch)
+                escape = False
+            elif ch == "\\":
+                out.append(ch)
+                escape = True
+            elif ch in string_closers and _closes_string(text, i + 1):
+                out.append('"')
+                in_string = False
+                if string_is_value and stack:
+                    stack[-1]["safe_len"] = len(out)
+            elif ch == '"':
+                # Quote that does not end the string (unescaped, or inside a
+                # smart-quoted string) becomes content
+                out.extend('\\"')
+                repairs.append("unescaped_quote")
+            elif ch == "\n":
+                out.extend("\\n")
+                repairs.append("control_char")
+            elif ch == "\t":
+                out.extend("\\t")
+                repairs.append("control_char")
+            else:
+                out.append(ch)
+            i += 1
+            continue
+
+        if ch == '"' or ch in _SMART_QUOTES:
+            string_is_value = _starts_value(out, stack)
+            in_string = True
+            string_closers = '"' if ch == '"' else _SMART_QUOTES + '"'
+            out.append('"')
+            if ch != '"':
+                repairs.append("smart_quotes")
+        elif ch in _CLOSERS:
+            out.append(ch)
+            stack.append({"open": ch, "safe_len": len(out)})
+        elif ch in "}]":
+            _drop_trailing_comma(out, repairs)
+            if not stack:
+                break
+            out.append(_CLOSERS[stack.pop()["open"]])
+            if not stack:
+                if text[i + 1:].strip():
+                    repairs.append("surrounding_text")
+                break
+            stack[-1]["safe_len"] = len(out)
+        elif ch == ",":
+            if stack:
+                stack[-1]["safe_len"] = len(out)
+            out.append(ch)
+        elif ch.isalpha():
+            j = i
+            while j < n and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            word = text[i:j]
+            if word in _PY_LITERALS:
+                word = _PY_LITERALS[word]
+                repairs.append("python_literal")
+            out.extend(word)
+            i = j
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    if not stack and not in_string:
+        return _loads_dict("".join(out))
+
+    # ---- Truncated output ----
+    # Whatever follows the innermost container's last complete member (an
+    # open string, a number or literal that may be cut short, a dangling
+    # key) is dropped; if that still does not load, outer containers are
+    # cut back the same way.
+    repairs.append("truncated")
+    body = "".join(out)
+    for depth in range(len(stack) - 1, -1, -1):
+        body = body[:stack[depth]["safe_len"]].rstrip().rstrip(",")
+        closers = "".join(_CLOSERS[c["open"]] for c in reversed(stack[:depth + 1]))
+        obj = _loads_dict(body + closers)
+        if obj is not None:
+            return obj
+
+    return None
+
+
+def _starts_value(out: List[str], stack: List[Dict[str, Any]]) -> bool:
+    """Whether a string opened now is a value (array item or after ":"), not a key."""
+    if not stack:
+        return False
+    if stack[-1]["open"] == "[":
+        return True
+    k = len(out) - 1
+    while k >= 0 and out[k].isspace():
+        k -= 1
+    return k >= 0 and out[k] == ":"
+
+
+def _closes_string(text: str, pos: int) -> bool:
+    """A quote ends a string only if followed by , : } ] or end of text."""
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos >= len(text) or text[pos] in ",:}]"
+
+
+def _drop_trailing_comma(out: List[str], repairs: List[str]) -> None:
+    """Remove a "," (plus whitespace) emitted right before a closer."""
+    k = len(out) - 1
+    while k >= 0 and out[k].isspace():
+        k -= 1
+    if k >= 0 and out[k] == ",":
+        del out[k]
+        repairs.append("trailing_comma")
+
+
+def _loads_dict(text: str) -> Dict[str, Any] | None:
+    try:
+        obj = json.loads(text)
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
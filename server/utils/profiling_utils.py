@@ -0,0 +1,122 @@
+"""
+profiling_utils.py
+
+Request profile primitives:
+    - RequestProfile → span timeline + sampled stacks (folded format)
+    - span(name)     → time a block for the active profile
+    - activate()     → make a profile active for the current context
+
+The active profile lives in a ContextVar, so it follows the request
+through awaits, asyncio.to_thread() and copied contexts. With no active
+profile span() returns a shared no-op context manager.
+
+Used By:
+    - profiling_service.py (middleware)
+    - analyzer.py, drafter.py, analyzer_service.py, audit_service.py (spans)
+"""
+
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+_NO_SPAN = nullcontext()
+_active: ContextVar["RequestProfile | None"] = ContextVar("active_profile", default=None)
+
+
+# ============================================================
+# PROFILE
+# ============================================================
+
+class RequestProfile:
+    """Span timeline + sampled stacks for one request."""
+
+    def __init__(self, method: str, path: str, interval_ms: float):
+        self.profile_id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.interval = interval_ms / 1000
+
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.thread_ids = {threading.get_ident()}
+        self.stacks: Counter = Counter()
+
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+
+    def start(self):
+        self._sampler.start()
+
+    def stop(self) -> float:
+        self._stop.set()
+        self._sampler.join()
+        return (time.perf_counter() - self.started) * 1000
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for tid in list(self.thread_ids):
+                frame = frames.get(tid)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+# ============================================================
+# SPANS
+# ============================================================
+
+def span(name: str):
+    """
+    Time a block for the active request profile.
+    No-op (shared nullcontext) when no profile is active.
+    """
+    profile = _active.get()
+    if profile is None:
+        return _NO_SPAN
+    return _record_span(profile, name)
+
+
+@contextmanager
+def _record_span(profile: RequestProfile, name: str):
+    tid = threading.get_ident()
+    profile.thread_ids.add(tid)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        profile.spans.append({
+            "name": name,
+            "start_ms": round((start - profile.started) * 1000, 3),
+            "duration_ms": round((end - start) * 1000, 3),
+            "thread": tid,
+        })
+
+
+# ============================================================
+# ACTIVATION
+# ============================================================
+
+def activate(profile: "RequestProfile | None"):
+    """Set the active profile; returns a token for deactivate()."""
+    return _active.set(profile)
+
+
+def deactivate(token) -> None:
+    _active.reset(token)
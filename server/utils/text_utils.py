@@ -6,6 +6,7 @@ Utility functions for:
     - Whitespace normalization
     - Sentence trimming
     - Email-safe normalization
+    - Chunking long inputs on paragraph / sentence boundaries
 
 Used By:
     - parser.py
@@ -14,6 +15,7 @@ Used By:
 """
 
 import re
+from typing import Iterator
 
 
 # ============================================================
@@ -66,15 +68,63 @@ def collapse_spaces(text: str) -> str:
     return re.sub(r"\s+", " ", text or "").strip()
 
 
-def extract_sentences(text: str) -> list[str]:
+def extract_sentences(text: str, keep_punctuation: bool = False) -> list[str]:
     """
     Basic sentence extraction using punctuation.
     This is not NLP-level splitting—suitable only for prototypes.
+
+    Args:
+        keep_punctuation: keep the closing . ! ? on each sentence
+                          (needed when the text is re-assembled)
     """
     if not text:
         return []
 
     # Split at . ! ?
-    chunks = re.split(r"[.!?]\s+", text)
+    pattern = r"(?<=[.!?])\s+" if keep_punctuation else r"[.!?]\s+"
+    chunks = re.split(pattern, text)
     sentences = [c.strip() for c in chunks if c.strip()]
     return sentences
+
+
+# ============================================================
+# CHUNKING (long inputs)
+# ============================================================
+
+def iter_text_chunks(text: str | None, max_chars: int) -> Iterator[str]:
+    """
+    Lazily split text into chunks of at most `max_chars`.
+
+    Boundaries are preferred in this order:
+        1. paragraphs (blank lines)
+        2. sentences (extract_sentences)
+        3. hard cut — only for a single sentence longer than max_chars
+
+    Text is cleaned first, so chunks are deterministic for equal input.
+    """
+    txt = clean_text(text)
+    if not txt:
+        return
+
+    current = ""
+    for paragraph in txt.split("\n\n"):
+        pieces = [paragraph]
+        if len(paragraph) > max_chars:
+            pieces = extract_sentences(paragraph, keep_punctuation=True)
+
+        for i, piece in enumerate(pieces):
+            while len(piece) > max_chars:
+                if current:
+                    yield current
+                    current = ""
+                yield piece[:max_chars]
+                piece = piece[max_chars:]
+
+            sep = "\n\n" if i == 0 else " "
+            if current and len(current) + len(sep) + len(piece) > max_chars:
+                yield current
+                current = ""
+            current = f"{current}{sep}{piece}" if current else piece
+
+    if current:
+        yield current
@@ -0,0 +1,179 @@
+"""
+thread_utils.py
+
+Helpers for recognising replies in an email thread:
+    - Header extraction (Message-ID, In-Reply-To, References)
+    - Splitting a reply into its NEW text and the QUOTED history
+    - Line fingerprints used to match quoted history to a known thread
+
+Used By:
+    - thread_store.py
+    - analyzer_service.py
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Set, Tuple
+
+from utils.text_utils import clean_text, collapse_spaces
+
+
+# Any "Name: value" line of a leading header block (From, Subject, ...)
+_HEADER_LINE_RE = re.compile(r"^[A-Za-z][A-Za-z0-9-]*\s*:")
+
+# Headers we read to link a message to its parent
+_THREAD_HEADER_RE = re.compile(
+    r"^(message-id|in-reply-to|references)\s*:\s*(.*)$",
+    re.IGNORECASE,
+)
+_MESSAGE_ID_RE = re.compile(r"<[^<>\s]+>")
+
+# Lines that open a quoted / forwarded history block
+_QUOTE_OPENERS = [
+    re.compile(r"^on .+ wrote:\s*$", re.IGNORECASE),
+    re.compile(r"^-{2,}\s*original message\s*-{2,}$", re.IGNORECASE),
+    re.compile(r"^-{2,}\s*forwarded message\s*-{2,}$", re.IGNORECASE),
+    re.compile(r"^begin forwarded message:\s*$", re.IGNORECASE),
+]
+
+# Lines shorter than this ("Regards,", "Thanks") are too common to fingerprint
+MIN_FINGERPRINT_LINE_CHARS = 20
+
+
+# ============================================================
+# HEADER EXTRACTION
+# ============================================================
+
+def _split_header_block(text: str) -> Tuple[List[str], str]:
+    """
+    Split off the leading header block (up to the first blank line).
+
+    The block only counts if every line is a "Name: value" header or a
+    folded continuation of one; otherwise the email has no headers and
+    ([], text) is returned. Headers come back unfolded, one per entry.
+    """
+    lines = (text or "").strip("\n").splitlines()
+    headers: List[str] = []
+    for i, line in enumerate(lines):
+        if not line.strip():
+            return headers, "\n".join(lines[i + 1:])
+        if line[:1] in (" ", "\t") and headers:
+            headers[-1] = f"{headers[-1]} {line.strip()}"
+        elif _HEADER_LINE_RE.match(line):
+            headers.append(line.strip())
+        else:
+            return [], text or ""
+    return headers, ""
+
+
+def _thread_header(line: str) -> Tuple[str, List[str]] | None:
+    """(key, message ids) for a threading header carrying <id>s, else None."""
+    match = _THREAD_HEADER_RE.match(line)
+    if not match:
+        return None
+    ids = _MESSAGE_ID_RE.findall(match.group(2))
+    if not ids:
+        return None
+    return match.group(1).lower().replace("-", "_"), ids
+
+
+def extract_thread_headers(text: str) -> Dict[str, List[str]]:
+    """
+    Read threading headers from the leading header block of a raw email.
+
+    Only <id@host> message-ids count; a body line such as
+    "References: Master Services Agreement ..." is content, not a header.
+
+    Returns:
+        {
+            "message_id": ["<id@host>"],
+            "in_reply_to": [...],
+            "references": [...]
+        }
+        Missing headers map to an empty list.
+    """
+    headers: Dict[str, List[str]] = {
+        "message_id": [],
+        "in_reply_to": [],
+        "references": [],
+    }
+    block, _body = _split_header_block(text)
+    for line in block:
+        parsed = _thread_header(line)
+        if parsed is None:
+            continue
+        key, ids = parsed
+        for mid in ids:
+            if mid not in headers[key]:
+                headers[key].append(mid)
+
+    return headers
+
+
+def strip_thread_headers(text: str) -> str:
+    """
+    Remove threading headers from the leading header block so they never
+    reach the LLM prompt. Other headers and the body are left untouched.
+    """
+    block, body = _split_header_block(text)
+    if not block:
+        return clean_text(text)
+    kept = [line for line in block if _thread_header(line) is None]
+    return clean_text("\n".join(kept + [""] + [body]) if kept else body)
+
+
+# ============================================================
+# NEW vs QUOTED CONTENT
+# ============================================================
+
+def split_new_and_quoted(text: str) -> tuple[str, str]:
+    """
+    Split a reply into (new_text, quoted_text).
+
+    Quoted text is:
+        - every line starting with ">"
+        - everything after an "On ... wrote:" / "Original Message" /
+          "Forwarded message" opener
+
+    Returns:
+        (new_text, quoted_text) — both cleaned
+    """
+    new_lines: List[str] = []
+    quoted_lines: List[str] = []
+    in_history = False
+
+    for line in clean_text(text).splitlines():
+        stripped = line.strip()
+        if not in_history and any(p.match(stripped) for p in _QUOTE_OPENERS):
+            in_history = True
+            continue
+
+        if in_history:
+            quoted_lines.append(stripped.lstrip(">").strip())
+        elif stripped.startswith(">"):
+            quoted_lines.append(stripped.lstrip(">").strip())
+        else:
+            new_lines.append(line)
+
+    return clean_text("\n".join(new_lines)), clean_text("\n".join(quoted_lines))
+
+
+# ============================================================
+# FINGERPRINTS
+# ============================================================
+
+def line_fingerprints(text: str) -> Set[str]:
+    """
+    Hash every substantial line of `text` after normalisation
+    (quote markers removed, whitespace collapsed, lower-cased).
+
+    Quoting clients re-wrap and re-indent, but rarely alter the words
+    on a line, so line hashes survive being quoted back.
+    """
+    prints: Set[str] = set()
+    for line in (text or "").splitlines():
+        norm = collapse_spaces(line.lstrip(" >")).lower()
+        if len(norm) < MIN_FINGERPRINT_LINE_CHARS:
+            continue
+        prints.add(hashlib.sha1(norm.encode("utf-8")).hexdigest()[:16])
+    return prints